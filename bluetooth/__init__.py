@@ -1,6 +1,20 @@
 """Bluetooth Controller Package."""
 
 from .controller import BTController
+from .async_controller import AsyncBTController
+from .connection import BluetoothConnection
+from .async_connection import AsyncBluetoothConnection
 from .constants import *
-from .protocol import BudsProtocol
+from .protocol import BudsProtocol, BatteryStatus, ModeAck, UnknownMessage, SequenceCounter, register_codec
+from .framing import FrameDecoder
+from .pending import PendingRequests, CommandResult, AckTimeoutError
 from .discovery import BluetoothDiscovery, BluetoothDevice
+from .bluez import BlueZMonitor
+from .candidates import DiscoveryCache, rank_devices, score_device
+from .prober import CandidateProber, ProbeResult
+from .manager import DeviceManager, ManagedDevice
+from .simulator import EarbudsSimulator, SimulatorConfig, SimulatedConnection
+from .capture import CaptureRing, CaptureRecord, CaptureWriter, read_capture, read_index, DIRECTION_TX, DIRECTION_RX
+from .analyzer import CaptureAnalyzer, CaptureSummary, analyze
+from .battery_poll import BatteryPollScheduler
+from .device_state import DeviceState, DeviceStateTracker
@@ -0,0 +1,93 @@
+"""Bluetooth adapter availability from sysfs."""
+
+import os
+import sys
+import threading
+from enum import Enum
+
+from .constants import ADAPTER_POLL_INTERVAL
+
+
+class AdapterState(Enum):
+    """Whether a Bluetooth adapter can be used."""
+    AVAILABLE = "available"
+    BLOCKED = "blocked"
+    ABSENT = "absent"
+    UNKNOWN = "unknown"
+
+
+class AdapterMonitor:
+    """Reads adapter presence and rfkill state without spawning processes.
+
+    ``sysfs_root`` defaults to ``/sys`` and can point at a fake tree laid out
+    like ``class/bluetooth/hci0`` and ``class/rfkill/rfkill0/{type,soft,hard}``.
+    On platforms without sysfs the state is always UNKNOWN, which callers
+    treat as usable.
+    """
+
+    def __init__(self, sysfs_root: str = "/sys", poll_interval: float = ADAPTER_POLL_INTERVAL):
+        self._sysfs_root = sysfs_root
+        self._poll_interval = poll_interval
+
+    def state(self) -> AdapterState:
+        """Return the current adapter state."""
+        if not sys.platform.startswith("linux") and self._sysfs_root == "/sys":
+            return AdapterState.UNKNOWN
+
+        if not self._adapters():
+            return AdapterState.ABSENT
+        if self._rfkill_blocked():
+            return AdapterState.BLOCKED
+        return AdapterState.AVAILABLE
+
+    def is_usable(self) -> bool:
+        """Return True unless the adapter is known to be absent or blocked."""
+        return self.state() in (AdapterState.AVAILABLE, AdapterState.UNKNOWN)
+
+    def wait_until_usable(self, wake: threading.Event) -> bool:
+        """Block until the adapter is usable or ``wake`` is set.
+
+        Returns:
+            True if the adapter became usable
+        """
+        while not self.is_usable():
+            if wake.wait(self._poll_interval):
+                return self.is_usable()
+        return True
+
+    def _adapters(self) -> list[str]:
+        path = os.path.join(self._sysfs_root, "class", "bluetooth")
+        try:
+            # Connection entries look like "hci0:256"; only count adapters.
+            return [name for name in os.listdir(path) if name.startswith("hci") and ":" not in name]
+        except OSError:
+            return []
+
+    def _rfkill_blocked(self) -> bool:
+        """Return True if every Bluetooth rfkill switch is blocked."""
+        path = os.path.join(self._sysfs_root, "class", "rfkill")
+        try:
+            entries = os.listdir(path)
+        except OSError:
+            return False
+
+        switches = 0
+        blocked = 0
+        for entry in entries:
+            entry_path = os.path.join(path, entry)
+            if _read(os.path.join(entry_path, "type")) != "bluetooth":
+                continue
+            switches += 1
+            soft = _read(os.path.join(entry_path, "soft"))
+            hard = _read(os.path.join(entry_path, "hard"))
+            if soft == "1" or hard == "1":
+                blocked += 1
+        return switches > 0 and blocked == switches
+
+
+def _read(path: str) -> str:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return f.read().strip()
+    except OSError:
+        return ""
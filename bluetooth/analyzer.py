@@ -0,0 +1,289 @@
+"""Offline analysis of RFCOMM capture files.
+
+Reads a capture file record by record, reassembles frames per direction
+with ``FrameDecoder`` and decodes them with ``BudsProtocol``, so memory use
+does not depend on the file size. Usage::
+
+    python -m bluetooth.analyzer capture.bin
+    python -m bluetooth.analyzer capture.bin --start 3600 --end 3660 --timeline
+
+``--start``/``--end`` are seconds from the first record; with a footer
+index the reader seeks close to ``--start`` instead of scanning from the
+beginning.
+"""
+
+import argparse
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Iterable, Optional
+
+from .capture import DIRECTION_RX, DIRECTION_TX, CaptureRecord, capture_clock_offset, read_capture
+from .constants import OPCODE_DEVICE_INFO, OPCODE_MODE
+from .framing import FRAME_OPCODE_OFFSET, FrameDecoder, frame_payload
+from .protocol import BatteryStatus, BudsProtocol, ModeAck, UnknownMessage
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Summary
+# ─────────────────────────────────────────────────────────────────────────────
+@dataclass
+class CaptureSummary:
+    """Aggregates collected from one pass over a capture.
+
+    Timestamps are monotonic nanoseconds as stored in the file.
+    """
+    records: int = 0
+    first_ns: Optional[int] = None
+    last_ns: Optional[int] = None
+    bytes_by_direction: Counter = field(default_factory=Counter)
+    frame_counts: Counter = field(default_factory=Counter)
+    frames_by_bucket: Counter = field(default_factory=Counter)
+    mode_latencies: list[float] = field(default_factory=list)
+    battery_latencies: list[float] = field(default_factory=list)
+    battery_timeline: list[tuple[int, BatteryStatus]] = field(default_factory=list)
+    unknown_opcodes: Counter = field(default_factory=Counter)
+    unanswered_commands: int = 0
+    battery_pushes: int = 0
+    dropped_bytes: int = 0
+
+
+class CaptureAnalyzer:
+    """Decodes capture records and accumulates a ``CaptureSummary``.
+
+    Args:
+        bucket_seconds: Width of the time buckets frames are indexed by
+    """
+
+    def __init__(self, bucket_seconds: float = 60.0):
+        self._bucket_ns = max(1, int(bucket_seconds * 1e9))
+        self._protocol = BudsProtocol()
+        self._decoders = {DIRECTION_TX: FrameDecoder(), DIRECTION_RX: FrameDecoder()}
+        self._pending_modes: dict[int, int] = {}
+        self._pending_battery: deque[int] = deque()
+        self.summary = CaptureSummary()
+
+    def feed(self, record: CaptureRecord) -> None:
+        """Decode one capture record."""
+        summary = self.summary
+        summary.records += 1
+        if summary.first_ns is None:
+            summary.first_ns = record.timestamp_ns
+        summary.last_ns = record.timestamp_ns
+        summary.bytes_by_direction[record.direction] += len(record.data)
+
+        decoder = self._decoders.get(record.direction)
+        if decoder is None:
+            return
+        decoder.feed(record.data)
+        for frame in decoder.frames():
+            if record.direction == DIRECTION_TX:
+                kind = self._on_sent(frame, record.timestamp_ns)
+            else:
+                kind = self._on_received(frame, record.timestamp_ns)
+            summary.frame_counts[kind] += 1
+            bucket = (record.timestamp_ns - summary.first_ns) // self._bucket_ns
+            summary.frames_by_bucket[(kind, bucket)] += 1
+
+    def finish(self) -> CaptureSummary:
+        """Close the pass and return the summary."""
+        summary = self.summary
+        summary.unanswered_commands = len(self._pending_modes) + len(self._pending_battery)
+        summary.dropped_bytes = sum(d.dropped_bytes for d in self._decoders.values())
+        return summary
+
+    def _on_sent(self, frame: memoryview, timestamp: int) -> str:
+        opcode = frame[FRAME_OPCODE_OFFSET]
+        if opcode == OPCODE_MODE:
+            payload = frame_payload(frame)
+            if payload:
+                self._pending_modes[payload[0]] = timestamp
+            return "tx:mode_command"
+        if opcode == OPCODE_DEVICE_INFO:
+            self._pending_battery.append(timestamp)
+            return "tx:battery_request"
+        self.summary.unknown_opcodes[("tx", opcode)] += 1
+        return f"tx:opcode_{opcode:#04x}"
+
+    def _on_received(self, frame: memoryview, timestamp: int) -> str:
+        summary = self.summary
+        message = self._protocol.decode(frame)
+        if isinstance(message, BatteryStatus):
+            summary.battery_timeline.append((timestamp, message))
+            if self._pending_battery:
+                sent_at = self._pending_battery.popleft()
+                summary.battery_latencies.append((timestamp - sent_at) / 1e9)
+            else:
+                summary.battery_pushes += 1
+            return "rx:battery"
+        if isinstance(message, ModeAck):
+            seq = message.seq
+            if seq not in self._pending_modes:
+                # Same fallback as PendingRequests: the oldest command.
+                seq = next(iter(self._pending_modes), None)
+            sent_at = self._pending_modes.pop(seq, None)
+            if sent_at is not None:
+                summary.mode_latencies.append((timestamp - sent_at) / 1e9)
+            return "rx:mode_ack"
+        if isinstance(message, UnknownMessage):
+            summary.unknown_opcodes[("rx", message.opcode)] += 1
+            return f"rx:opcode_{message.opcode:#04x}"
+        return "rx:invalid"
+
+
+def analyze(
+    path: str,
+    start: Optional[float] = None,
+    end: Optional[float] = None,
+    bucket_seconds: float = 60.0
+) -> CaptureSummary:
+    """Analyze a capture file, optionally limited to a time window.
+
+    Args:
+        path: Capture file written by ``CaptureRing.dump``
+        start: Window start in seconds from the first record
+        end: Window end in seconds from the first record
+
+    Raises:
+        ValueError: If the file is not a capture file
+    """
+    analyzer = CaptureAnalyzer(bucket_seconds)
+    with open(path, "rb") as f:
+        first = next(iter(read_capture(f)), None)
+        if first is None:
+            return analyzer.finish()
+
+        start_ns = first.timestamp_ns + int(start * 1e9) if start is not None else None
+        end_ns = first.timestamp_ns + int(end * 1e9) if end is not None else None
+        f.seek(0)
+        for record in _window(read_capture(f, start_ns), start_ns, end_ns):
+            analyzer.feed(record)
+    return analyzer.finish()
+
+
+def _window(
+    records: Iterable[CaptureRecord],
+    start_ns: Optional[int],
+    end_ns: Optional[int]
+) -> Iterable[CaptureRecord]:
+    for record in records:
+        if end_ns is not None and record.timestamp_ns > end_ns:
+            return
+        if start_ns is None or record.timestamp_ns >= start_ns:
+            yield record
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Report
+# ─────────────────────────────────────────────────────────────────────────────
+def _percentile(sorted_values: list[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(fraction * len(sorted_values)))
+    return sorted_values[index]
+
+
+def format_latencies(values: list[float]) -> str:
+    """Format a latency distribution in milliseconds."""
+    if not values:
+        return "no samples"
+    ordered = sorted(values)
+    points = ", ".join(
+        f"p{int(fraction * 100)} {_percentile(ordered, fraction) * 1000:.1f}"
+        for fraction in (0.5, 0.9, 0.99)
+    )
+    return (
+        f"n={len(ordered)} min {ordered[0] * 1000:.1f}, {points}, "
+        f"max {ordered[-1] * 1000:.1f} ms"
+    )
+
+
+def format_report(
+    summary: CaptureSummary,
+    clock_offset: int = 0,
+    timeline: bool = False,
+    bucket_seconds: Optional[float] = None
+) -> str:
+    """Render a summary as plain text.
+
+    Args:
+        summary: Result of ``analyze``
+        clock_offset: Wall clock offset from the capture file header
+        timeline: Include battery level changes
+        bucket_seconds: Include per-bucket frame counts of this width
+    """
+    if summary.first_ns is None:
+        return "Capture is empty."
+
+    def wall(timestamp: int) -> str:
+        return datetime.fromtimestamp((timestamp + clock_offset) / 1e9).strftime("%Y-%m-%d %H:%M:%S.%f")[:-3]
+
+    duration = (summary.last_ns - summary.first_ns) / 1e9
+    lines = [
+        f"Records: {summary.records} over {duration:.1f}s ({wall(summary.first_ns)} - {wall(summary.last_ns)})",
+        f"Bytes: sent {summary.bytes_by_direction[DIRECTION_TX]}, "
+        f"received {summary.bytes_by_direction[DIRECTION_RX]}, "
+        f"undecodable {summary.dropped_bytes}",
+        "",
+        "Frames:",
+    ]
+    for kind, count in sorted(summary.frame_counts.items()):
+        lines.append(f"  {kind:<24} {count}")
+
+    lines += [
+        "",
+        f"Mode command -> ack:     {format_latencies(summary.mode_latencies)}",
+        f"Battery request -> reply: {format_latencies(summary.battery_latencies)}",
+        f"Unanswered commands: {summary.unanswered_commands}, "
+        f"unsolicited battery pushes: {summary.battery_pushes}",
+        "",
+        "Unknown opcodes:",
+    ]
+    if summary.unknown_opcodes:
+        for (direction, opcode), count in summary.unknown_opcodes.most_common():
+            lines.append(f"  {direction} {opcode:#04x}  {count}")
+    else:
+        lines.append("  none")
+
+    if timeline:
+        lines += ["", "Battery timeline (left / right / case, * = charging):"]
+        previous = None
+        for timestamp, status in summary.battery_timeline:
+            levels = (
+                f"{status.left}{'*' if status.left_charging else ''} / "
+                f"{status.right}{'*' if status.right_charging else ''} / "
+                f"{status.case}{'*' if status.case_charging else ''}"
+            )
+            if levels != previous:
+                lines.append(f"  {wall(timestamp)}  {levels}")
+                previous = levels
+
+    if bucket_seconds:
+        lines += ["", f"Frames per {bucket_seconds:g}s bucket:"]
+        for (kind, bucket), count in sorted(summary.frames_by_bucket.items(), key=lambda i: (i[0][1], i[0][0])):
+            lines.append(f"  +{bucket * bucket_seconds:>8g}s  {kind:<24} {count}")
+    return "\n".join(lines)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Entry Point
+# ─────────────────────────────────────────────────────────────────────────────
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Summarize a Mi Buds RFCOMM capture file.")
+    parser.add_argument("capture", help="Capture file written by CaptureRing.dump")
+    parser.add_argument("--start", type=float, help="Window start, seconds from the first record")
+    parser.add_argument("--end", type=float, help="Window end, seconds from the first record")
+    parser.add_argument("--bucket", type=float, default=60.0, help="Time bucket width in seconds")
+    parser.add_argument("--buckets", action="store_true", help="Print frame counts per time bucket")
+    parser.add_argument("--timeline", action="store_true", help="Print battery level changes")
+    args = parser.parse_args(argv)
+
+    summary = analyze(args.capture, args.start, args.end, args.bucket)
+    print(format_report(
+        summary,
+        capture_clock_offset(args.capture),
+        timeline=args.timeline,
+        bucket_seconds=args.bucket if args.buckets else None,
+    ))
+
+
+if __name__ == "__main__":
+    main()
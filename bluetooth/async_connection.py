@@ -0,0 +1,95 @@
+"""Asyncio Bluetooth socket connection handler."""
+
+import asyncio
+import socket
+from typing import Optional
+
+from .constants import RFCOMM_PORT, SOCKET_TIMEOUT
+
+
+class AsyncBluetoothConnection:
+    """Manages a non-blocking Bluetooth socket driven by the event loop.
+
+    Reads and writes go through ``loop.sock_recv_into``/``loop.sock_sendall``,
+    so an idle connection costs no wakeups and a pending receive can be
+    cancelled immediately.
+
+    Args:
+        adapter: Local adapter address to connect from; None lets the
+            kernel pick the default adapter
+    """
+
+    def __init__(self, adapter: Optional[str] = None):
+        self._adapter = adapter
+        self._sock: Optional[socket.socket] = None
+        self._send_lock = asyncio.Lock()
+
+    @property
+    def connected(self) -> bool:
+        """Check if currently connected."""
+        return self._sock is not None
+
+    async def connect(self, address: str, channel: int = RFCOMM_PORT) -> None:
+        """Establish connection to device.
+
+        Args:
+            address: Bluetooth MAC address
+            channel: RFCOMM channel
+
+        Raises:
+            Exception: If connection fails or times out
+        """
+        sock = socket.socket(
+            socket.AF_BLUETOOTH,
+            socket.SOCK_STREAM,
+            socket.BTPROTO_RFCOMM
+        )
+        sock.setblocking(False)
+        loop = asyncio.get_running_loop()
+        try:
+            if self._adapter:
+                sock.bind((self._adapter, 0))
+            await asyncio.wait_for(
+                loop.sock_connect(sock, (address, channel)),
+                timeout=SOCKET_TIMEOUT
+            )
+        except BaseException:
+            sock.close()
+            raise
+        self._sock = sock
+
+    def attach(self, sock: socket.socket) -> None:
+        """Use an already connected socket (e.g. one end of a socketpair)."""
+        sock.setblocking(False)
+        self._sock = sock
+
+    def disconnect(self) -> None:
+        """Close the connection."""
+        sock, self._sock = self._sock, None
+        if sock:
+            try:
+                sock.close()
+            except Exception:
+                pass
+
+    async def send(self, data: bytes) -> None:
+        """Send data to device.
+
+        Raises:
+            ConnectionError: If not connected
+            Exception: If send fails
+        """
+        async with self._send_lock:
+            if not self._sock:
+                raise ConnectionError("Not connected")
+            await asyncio.get_running_loop().sock_sendall(self._sock, data)
+
+    async def receive_into(self, buffer: memoryview) -> int:
+        """Receive data from device directly into ``buffer``.
+
+        Returns:
+            Number of bytes written (0 means the peer closed the link)
+        """
+        if not self._sock:
+            return 0
+        return await asyncio.get_running_loop().sock_recv_into(self._sock, buffer)
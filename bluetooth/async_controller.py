@@ -0,0 +1,244 @@
+"""Asyncio controller for Mi Buds."""
+
+import asyncio
+from collections import deque
+from typing import AsyncIterator, Optional
+
+from .async_connection import AsyncBluetoothConnection
+from .constants import ACK_MAX_RETRIES, ACK_TIMEOUT, MODE_ACK_OK
+from .discovery import BluetoothDiscovery
+from .framing import FrameDecoder
+from .pending import RECENT_ACKS, AckTimeoutError, CommandResult, match_ack
+from .protocol import BudsProtocol, Message, ModeAck, SequenceCounter
+
+
+class AsyncBTController:
+    """Event-loop based counterpart of ``BTController``.
+
+    Usage::
+
+        controller = AsyncBTController()
+        if await controller.connect():
+            await controller.send_command("low")
+            async for message in controller:
+                ...
+
+    Iteration ends when the link closes or ``stop()`` is called. Mode
+    commands carry their own sequence numbers and are retransmitted until
+    acked; acks are only seen while the messages are being iterated.
+    """
+
+    def __init__(
+        self,
+        bd_addr: Optional[str] = None,
+        connection: Optional[AsyncBluetoothConnection] = None,
+        ack_timeout: float = ACK_TIMEOUT,
+        ack_max_retries: int = ACK_MAX_RETRIES
+    ):
+        self._connection = connection or AsyncBluetoothConnection()
+        self._protocol = BudsProtocol()
+        self._decoder = FrameDecoder()
+        self._sequence = SequenceCounter()
+        self._pending: dict[int, asyncio.Future] = {}
+        self._acked: deque[int] = deque(maxlen=RECENT_ACKS)
+        self.ack_timeout = ack_timeout
+        self.max_retries = ack_max_retries
+        self._bd_addr = bd_addr
+        self._recv_task: Optional[asyncio.Future] = None
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Properties
+    # ─────────────────────────────────────────────────────────────────────────
+    @property
+    def connected(self) -> bool:
+        """Check if connected to device."""
+        return self._connection.connected
+
+    @property
+    def address(self) -> Optional[str]:
+        """Bluetooth address of the device, once known."""
+        return self._bd_addr
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Connection
+    # ─────────────────────────────────────────────────────────────────────────
+    async def connect(self) -> bool:
+        """Connect to the Mi Buds device, discovering it if needed."""
+        if self._connection.connected:
+            return True
+
+        if not self._bd_addr:
+            loop = asyncio.get_running_loop()
+            device = await loop.run_in_executor(None, BluetoothDiscovery.get_connected_device)
+            if not device or not device.address:
+                return False
+            self._bd_addr = device.address
+
+        try:
+            self._decoder.reset()
+            await self._connection.connect(self._bd_addr)
+            return True
+        except (OSError, asyncio.TimeoutError):
+            self._connection.disconnect()
+            return False
+
+    def stop(self) -> None:
+        """Close the link and end any running iteration immediately."""
+        if self._recv_task and not self._recv_task.done():
+            self._recv_task.cancel()
+        self._connection.disconnect()
+        self._fail_pending(ConnectionError("Controller stopped"))
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Commands
+    # ─────────────────────────────────────────────────────────────────────────
+    async def send_command(self, mode: str = "low") -> tuple[bool, str]:
+        """Send latency mode command and wait for its acknowledgment.
+
+        Args:
+            mode: "low" for low latency, "std" for standard
+
+        Returns:
+            (success, message) tuple
+        """
+        try:
+            ack = await self.send_command_tracked(mode)
+        except ConnectionError as e:
+            return False, str(e)
+        except OSError as e:
+            return False, f"Send error: {e}"
+
+        mode_name = self._protocol.get_mode_name(mode)
+        try:
+            result = await ack
+        except AckTimeoutError as e:
+            return False, str(e)
+        except ConnectionError as e:
+            return False, f"{mode_name} mode not acknowledged: {e}"
+        return True, f"{mode_name} mode acknowledged in {result.rtt * 1000:.0f} ms."
+
+    async def send_command_tracked(self, mode: str = "low") -> asyncio.Future:
+        """Send latency mode command and track its acknowledgment.
+
+        Commands can be pipelined; each one carries its own sequence number.
+
+        Args:
+            mode: "low" for low latency, "std" for standard
+
+        Returns:
+            Future resolving to a CommandResult with the round-trip time, or
+            failing with AckTimeoutError after the configured retries
+
+        Raises:
+            ConnectionError: If the device could not be reached
+            OSError: If the initial send fails
+        """
+        if not await self.connect():
+            raise ConnectionError("Could not connect to device.")
+
+        seq = self._sequence.next()
+        payload = self._protocol.build_mode_command(mode, seq)
+        ack = asyncio.get_running_loop().create_future()
+        previous = self._pending.pop(seq, None)
+        self._pending[seq] = ack
+        if previous and not previous.done():
+            previous.set_exception(AckTimeoutError(f"Sequence {seq:#04x} reused before ack"))
+
+        try:
+            await self._connection.send(payload)
+        except OSError:
+            self._pending.pop(seq, None)
+            self._connection.disconnect()
+            raise
+        return asyncio.ensure_future(self._await_ack(seq, payload, ack))
+
+    async def _await_ack(self, seq: int, payload: bytes, ack: asyncio.Future) -> CommandResult:
+        """Retransmit ``payload`` until ``ack`` completes or retries run out."""
+        loop = asyncio.get_running_loop()
+        attempts = 1
+        sent_at = loop.time()
+        try:
+            while True:
+                try:
+                    await asyncio.wait_for(asyncio.shield(ack), self.ack_timeout)
+                    return CommandResult(seq, loop.time() - sent_at, attempts)
+                except asyncio.TimeoutError:
+                    if attempts > self.max_retries:
+                        raise AckTimeoutError(
+                            f"No ack for sequence {seq:#04x} after {attempts} attempts"
+                        ) from None
+                attempts += 1
+                sent_at = loop.time()
+                await self._connection.send(payload)
+        finally:
+            if self._pending.get(seq) is ack:
+                del self._pending[seq]
+
+    async def request_battery(self) -> tuple[bool, str]:
+        """Request battery status from device."""
+        if not await self.connect():
+            return False, "Could not connect to device."
+
+        try:
+            await self._connection.send(self._protocol.build_battery_request())
+            return True, "Battery request sent."
+        except OSError as e:
+            self._connection.disconnect()
+            return False, f"Request error: {e}"
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Receiving
+    # ─────────────────────────────────────────────────────────────────────────
+    def __aiter__(self) -> AsyncIterator[Message]:
+        return self.messages()
+
+    async def messages(self) -> AsyncIterator[Message]:
+        """Yield decoded messages until the link closes or ``stop()``."""
+        while self._connection.connected:
+            self._recv_task = asyncio.ensure_future(
+                self._connection.receive_into(self._decoder.recv_buffer())
+            )
+            try:
+                received = await self._recv_task
+            except asyncio.CancelledError:
+                if self._recv_task.cancelled() and not self._connection.connected:
+                    return
+                raise
+            except OSError:
+                received = 0
+            finally:
+                self._recv_task = None
+
+            if not received:
+                self._connection.disconnect()
+                break
+
+            self._decoder.commit(received)
+            for frame in self._decoder.frames():
+                message = self._protocol.decode(frame)
+                if isinstance(message, ModeAck):
+                    message = self._on_mode_ack(message)
+                if message is not None:
+                    yield message
+        self._fail_pending(ConnectionError("Connection lost"))
+
+    def _on_mode_ack(self, ack: ModeAck) -> ModeAck:
+        """Complete the matching command; see ``PendingRequests.resolve``."""
+        seq = match_ack(self._pending, self._acked, ack.seq)
+        if seq is None:
+            return ack
+        future = self._pending.pop(seq)
+        if not future.done():
+            future.set_result(None)
+        if seq != ack.seq:
+            # Matched by order, not by its bytes: the ack itself is the OK.
+            return ModeAck(seq=seq, status=MODE_ACK_OK)
+        return ack
+
+    def _fail_pending(self, exc: BaseException) -> None:
+        """Fail every command still waiting for an ack."""
+        pending = list(self._pending.values())
+        self._pending.clear()
+        for future in pending:
+            if not future.done():
+                future.set_exception(exc)
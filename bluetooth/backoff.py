@@ -0,0 +1,50 @@
+"""Exponential reconnect backoff with jitter."""
+
+import random
+from typing import Callable
+
+from .constants import RECONNECT_BACKOFF_BASE, RECONNECT_BACKOFF_CAP
+
+
+class Backoff:
+    """Delay schedule that doubles per failure up to a cap.
+
+    Each delay is drawn uniformly from ``[(1 - jitter) * d, d]`` where ``d``
+    is the capped exponential step, so clients retrying after a shared
+    outage do not stay in lockstep.
+    """
+
+    def __init__(
+        self,
+        base: float = RECONNECT_BACKOFF_BASE,
+        cap: float = RECONNECT_BACKOFF_CAP,
+        factor: float = 2.0,
+        jitter: float = 0.5,
+        rng: Callable[[], float] = random.random
+    ):
+        self.base = base
+        self.cap = cap
+        self.factor = factor
+        self.jitter = min(max(jitter, 0.0), 1.0)
+        self._rng = rng
+        self._failures = 0
+        self._step = min(cap, base)
+
+    @property
+    def failures(self) -> int:
+        """Number of delays handed out since the last reset."""
+        return self._failures
+
+    def next_delay(self) -> float:
+        """Return the delay before the next attempt and advance the schedule."""
+        # Grow the step itself rather than raising factor to the failure
+        # count, which overflows a float after ~1000 failures in a row.
+        step = self._step
+        self._step = min(self.cap, step * self.factor)
+        self._failures += 1
+        return step * (1.0 - self.jitter * self._rng())
+
+    def reset(self) -> None:
+        """Start over from the base delay."""
+        self._failures = 0
+        self._step = min(self.cap, self.base)
@@ -0,0 +1,135 @@
+"""Coalescing scheduler for battery status requests."""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+from .constants import BATTERY_POLL_WINDOW, BATTERY_RESPONSE_TIMEOUT
+
+
+logger = logging.getLogger(__name__)
+
+
+class BatteryPollScheduler:
+    """Turns bursts of battery-check triggers into single requests.
+
+    A trigger schedules one request ``window`` seconds out; further
+    triggers before it goes out are folded into it. Once sent, the request
+    stays outstanding until a battery response arrives or
+    ``response_timeout`` passes, and triggers in that time are folded into
+    it too. All requests go out from one scheduler thread.
+
+    Args:
+        send: Queues one battery request; returns False if it could not
+        window: Delay used to gather triggers into one request
+        response_timeout: How long a sent request counts as outstanding
+    """
+
+    def __init__(
+        self,
+        send: Callable[[], bool],
+        window: float = BATTERY_POLL_WINDOW,
+        response_timeout: float = BATTERY_RESPONSE_TIMEOUT
+    ):
+        self._send = send
+        self._window = window
+        self._response_timeout = response_timeout
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stopped = False
+        self._due_at: Optional[float] = None
+        self._outstanding_until: Optional[float] = None
+        self.triggers = 0
+        self.sent = 0
+        self.suppressed = 0
+
+    @property
+    def outstanding(self) -> bool:
+        """Whether a sent request is still waiting for its response."""
+        with self._cond:
+            return self._is_outstanding(time.monotonic())
+
+    def trigger(self, immediate: bool = False) -> None:
+        """Ask for a battery update.
+
+        Args:
+            immediate: Send as soon as possible instead of after the window,
+                e.g. for a user refresh
+        """
+        now = time.monotonic()
+        due_at = now if immediate else now + self._window
+        with self._cond:
+            if self._stopped:
+                return
+            self._start_locked()
+            self.triggers += 1
+            if self._is_outstanding(now):
+                self.suppressed += 1
+                return
+            if self._due_at is not None:
+                self.suppressed += 1
+                if due_at >= self._due_at:
+                    return
+            self._due_at = due_at
+            self._cond.notify()
+
+    def on_response(self) -> None:
+        """Record that a battery response arrived."""
+        with self._cond:
+            self._outstanding_until = None
+
+    def on_send_failed(self) -> None:
+        """Record that the last request never reached the device."""
+        self.on_response()
+
+    def reset(self) -> None:
+        """Forget scheduled and outstanding requests, e.g. after a disconnect."""
+        with self._cond:
+            self._due_at = None
+            self._outstanding_until = None
+            self._cond.notify()
+
+    def stop(self) -> None:
+        """Stop the scheduler thread; later triggers are ignored."""
+        with self._cond:
+            self._stopped = True
+            self._running = False
+            self._due_at = None
+            self._cond.notify()
+
+    def _start_locked(self) -> None:
+        if self._running:
+            return
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="battery-poll", daemon=True)
+        self._thread.start()
+
+    def _is_outstanding(self, now: float) -> bool:
+        return self._outstanding_until is not None and now < self._outstanding_until
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running:
+                    now = time.monotonic()
+                    if self._due_at is None:
+                        self._cond.wait()
+                    elif now < self._due_at:
+                        self._cond.wait(self._due_at - now)
+                    else:
+                        break
+                if not self._running:
+                    return
+                self._due_at = None
+                self._outstanding_until = time.monotonic() + self._response_timeout
+                self.sent += 1
+
+            try:
+                queued = self._send()
+            except Exception as e:
+                logger.warning("Battery poll failed: %s", e)
+                queued = False
+            if not queued:
+                self.on_send_failed()
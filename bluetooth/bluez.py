@@ -0,0 +1,221 @@
+"""BlueZ D-Bus device monitor (optional, Linux only).
+
+Requires the ``jeepney`` package. Takes one ``GetManagedObjects`` snapshot of
+the BlueZ object tree and then follows ``InterfacesAdded``,
+``InterfacesRemoved`` and ``PropertiesChanged`` signals on
+``org.bluez.Device1``, so connection changes are pushed instead of polled.
+"""
+
+import logging
+import threading
+from collections import deque
+from contextlib import ExitStack
+from typing import Any, Callable, Optional
+
+try:
+    from jeepney import DBusAddress, HeaderFields, MatchRule, message_bus, new_method_call
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:
+    MatchRule = None
+
+from .discovery import BluetoothDiscovery, BluetoothDevice
+
+
+logger = logging.getLogger(__name__)
+
+
+BLUEZ_BUS_NAME = "org.bluez"
+DEVICE_INTERFACE = "org.bluez.Device1"
+OBJECT_MANAGER_INTERFACE = "org.freedesktop.DBus.ObjectManager"
+PROPERTIES_INTERFACE = "org.freedesktop.DBus.Properties"
+
+DeviceCallback = Callable[[BluetoothDevice], None]
+
+
+class BlueZMonitor:
+    """Reports Bluetooth devices connecting and disconnecting via BlueZ.
+
+    Args:
+        on_connected: Called with the device when its link comes up
+        on_disconnected: Called with the device when its link goes down
+        bus: "SYSTEM", "SESSION" or a D-Bus address such as
+            ``unix:path=/tmp/test-bus`` (for a private test daemon)
+        bus_name: Well-known name of the BlueZ service
+    """
+
+    def __init__(
+        self,
+        on_connected: Optional[DeviceCallback] = None,
+        on_disconnected: Optional[DeviceCallback] = None,
+        bus: str = "SYSTEM",
+        bus_name: str = BLUEZ_BUS_NAME
+    ):
+        self._on_connected = on_connected
+        self._on_disconnected = on_disconnected
+        self._bus = bus
+        self._bus_name = bus_name
+        self._lock = threading.Lock()
+        self._devices: dict[str, dict[str, Any]] = {}
+        self._conn = None
+        self._running = False
+        self._ready = threading.Event()
+
+    @staticmethod
+    def is_available() -> bool:
+        """Check if the optional D-Bus dependency is installed."""
+        return MatchRule is not None
+
+    def connected_devices(self) -> list[BluetoothDevice]:
+        """Return the devices currently known to be connected."""
+        with self._lock:
+            return [
+                _to_device(props)
+                for props in self._devices.values()
+                if props.get("Connected") and props.get("Address")
+            ]
+
+    def device_name(self, address: str) -> str:
+        """Return the name BlueZ reports for ``address``, or "" if unknown."""
+        address = BluetoothDiscovery._format_mac(address)
+        with self._lock:
+            for props in self._devices.values():
+                device = _to_device(props) if props.get("Address") else None
+                if device and device.address == address:
+                    return device.name
+        return ""
+
+    def start(self) -> bool:
+        """Connect to the bus and start following device signals.
+
+        Returns:
+            True if monitoring started
+        """
+        if not self.is_available() or self._running:
+            return self._running
+
+        try:
+            self._conn = open_dbus_connection(bus=self._bus)
+        except Exception as e:
+            logger.warning("BlueZ monitor unavailable: %s", e)
+            return False
+
+        self._running = True
+        threading.Thread(target=self._run, name="bluez-monitor", daemon=True).start()
+        return True
+
+    def wait_ready(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the initial snapshot has been processed."""
+        return self._ready.wait(timeout)
+
+    def stop(self) -> None:
+        """Stop monitoring and close the bus connection."""
+        self._running = False
+        conn, self._conn = self._conn, None
+        if conn:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Signal Loop
+    # ─────────────────────────────────────────────────────────────────────────
+    def _rules(self, sender: Optional[str]) -> list:
+        added = MatchRule(
+            type="signal", sender=sender,
+            interface=OBJECT_MANAGER_INTERFACE, member="InterfacesAdded",
+        )
+        removed = MatchRule(
+            type="signal", sender=sender,
+            interface=OBJECT_MANAGER_INTERFACE, member="InterfacesRemoved",
+        )
+        changed = MatchRule(
+            type="signal", sender=sender,
+            interface=PROPERTIES_INTERFACE, member="PropertiesChanged",
+        )
+        changed.add_arg_condition(0, DEVICE_INTERFACE)
+        return [added, removed, changed]
+
+    def _run(self) -> None:
+        conn = self._conn
+        signals: deque = deque()
+        try:
+            # Subscribe before the snapshot so no change falls in between.
+            # The bus resolves the well-known sender name; local filters
+            # see unique names, so they match on interface/member only.
+            for rule in self._rules(self._bus_name):
+                conn.send_and_get_reply(message_bus.AddMatch(rule))
+            with ExitStack() as stack:
+                for rule in self._rules(None):
+                    stack.enter_context(conn.filter(rule, queue=signals))
+                self._load_snapshot(conn)
+                self._ready.set()
+                while self._running:
+                    self._handle_signal(conn.recv_until_filtered(signals))
+        except Exception as e:
+            if self._running:
+                logger.warning("BlueZ monitor stopped: %s", e)
+        finally:
+            self._ready.set()
+            self._running = False
+
+    def _load_snapshot(self, conn) -> None:
+        root = DBusAddress("/", bus_name=self._bus_name, interface=OBJECT_MANAGER_INTERFACE)
+        reply = conn.send_and_get_reply(new_method_call(root, "GetManagedObjects"))
+        (objects,) = reply.body
+        for path, interfaces in objects.items():
+            props = interfaces.get(DEVICE_INTERFACE)
+            if props is not None:
+                self._update(path, _unwrap(props))
+
+    def _handle_signal(self, msg) -> None:
+        member = msg.header.fields.get(HeaderFields.member)
+        path = msg.header.fields.get(HeaderFields.path)
+
+        if member == "InterfacesAdded":
+            path, interfaces = msg.body
+            props = interfaces.get(DEVICE_INTERFACE)
+            if props is not None:
+                self._update(path, _unwrap(props))
+
+        elif member == "InterfacesRemoved":
+            path, interfaces = msg.body
+            if DEVICE_INTERFACE in interfaces:
+                self._update(path, {"Connected": False})
+                with self._lock:
+                    self._devices.pop(path, None)
+
+        elif member == "PropertiesChanged" and path:
+            _, changed, _ = msg.body
+            self._update(path, _unwrap(changed))
+
+    def _update(self, path: str, changes: dict[str, Any]) -> None:
+        """Merge property changes and fire callbacks on connection edges."""
+        with self._lock:
+            props = self._devices.setdefault(path, {})
+            was_connected = bool(props.get("Connected"))
+            props.update(changes)
+            is_connected = bool(props.get("Connected"))
+            device = _to_device(props) if props.get("Address") else None
+
+        if device is None or was_connected == is_connected:
+            return
+        if is_connected and self._on_connected:
+            self._on_connected(device)
+        elif not is_connected and self._on_disconnected:
+            self._on_disconnected(device)
+
+
+def _unwrap(props: dict[str, Any]) -> dict[str, Any]:
+    """Strip the (signature, value) variant wrappers jeepney returns."""
+    return {
+        key: value[1] if isinstance(value, tuple) and len(value) == 2 else value
+        for key, value in props.items()
+    }
+
+
+def _to_device(props: dict[str, Any]) -> BluetoothDevice:
+    return BluetoothDevice(
+        name=str(props.get("Alias") or props.get("Name") or ""),
+        address=BluetoothDiscovery._format_mac(str(props.get("Address", ""))),
+    )
@@ -0,0 +1,88 @@
+"""Ranked, cached discovery of candidate earbud devices."""
+
+import re
+import threading
+import time
+from typing import Callable, Optional
+
+from .constants import DISCOVERY_CACHE_TTL, KNOWN_DEVICE_NAME_PATTERN, XIAOMI_OUI_PREFIXES
+from .discovery import BluetoothDiscovery, BluetoothDevice
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Scoring
+# ─────────────────────────────────────────────────────────────────────────────
+SCORE_LAST_CONNECTED = 200
+SCORE_NAME_MATCH = 100
+SCORE_VENDOR_MATCH = 50
+
+_NAME_RE = re.compile(KNOWN_DEVICE_NAME_PATTERN, re.IGNORECASE)
+
+
+def score_device(device: BluetoothDevice, last_address: Optional[str] = None) -> int:
+    """Return how likely ``device`` is to be the earbuds (higher is better)."""
+    score = 0
+    address = (device.address or "").upper()
+    if last_address and address == last_address.upper():
+        score += SCORE_LAST_CONNECTED
+    if device.name and _NAME_RE.search(device.name):
+        score += SCORE_NAME_MATCH
+    if address[:8] in XIAOMI_OUI_PREFIXES:
+        score += SCORE_VENDOR_MATCH
+    return score
+
+
+def rank_devices(
+    devices: list[BluetoothDevice],
+    last_address: Optional[str] = None
+) -> list[BluetoothDevice]:
+    """Sort devices best candidate first, keeping discovery order on ties."""
+    return sorted(devices, key=lambda device: -score_device(device, last_address))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Cache
+# ─────────────────────────────────────────────────────────────────────────────
+class DiscoveryCache:
+    """Caches the connected-device list for ``ttl`` seconds.
+
+    Discovery spawns processes on some platforms, so repeated reconnect
+    attempts reuse the last result until it expires or ``invalidate()`` is
+    called on a connection event. An empty result is never cached: without
+    a connection-event source the earbuds would otherwise stay unseen for a
+    whole ``ttl`` after they connect.
+    """
+
+    def __init__(
+        self,
+        discover: Callable[[], list[BluetoothDevice]] = BluetoothDiscovery.get_connected_devices,
+        ttl: float = DISCOVERY_CACHE_TTL,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self._discover = discover
+        self._ttl = ttl
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._devices: Optional[list[BluetoothDevice]] = None
+        self._fetched_at = 0.0
+
+    def invalidate(self) -> None:
+        """Drop the cached list so the next lookup rediscovers."""
+        with self._lock:
+            self._devices = None
+
+    def devices(self) -> list[BluetoothDevice]:
+        """Return connected devices, rediscovering if the cache is stale."""
+        with self._lock:
+            if self._devices is not None and self._clock() - self._fetched_at < self._ttl:
+                return list(self._devices)
+
+        devices = self._discover()
+        with self._lock:
+            self._devices = list(devices) if devices else None
+            self._fetched_at = self._clock()
+        return list(devices)
+
+    def candidates(self, last_address: Optional[str] = None) -> list[BluetoothDevice]:
+        """Return connected devices ranked best candidate first."""
+        return rank_devices(self.devices(), last_address)
@@ -0,0 +1,378 @@
+"""Fixed-size capture ring for RFCOMM traffic.
+
+``CaptureRing`` keeps the most recent sent and received buffers in one
+preallocated byte region (optionally an mmap of a file, so the data
+survives a hard crash). Recording packs a small header and copies the
+payload into that region; nothing is allocated per packet beyond the
+timestamp. The ring can be dumped to a compact capture file at any time.
+
+Capture file layout (little endian)::
+
+    file header | record* | [end marker | index entry* | trailer]
+    file header = magic (8) | version (2) | reserved (2) | wall clock offset ns (8)
+    record      = monotonic ns (8) | direction (1) | length (2) | data (length)
+    end marker  = a record with direction 0xFE and length 0
+    index entry = monotonic ns (8) | file offset (8), one per N records
+    trailer     = index offset (8) | entry count (4) | magic (8)
+
+Adding the wall clock offset to a record's monotonic timestamp gives its
+``time.time_ns()`` value. A ring stores the offset of the boot it recorded
+in, so a ring recovered after a reboot dumps with its own offset. The
+footer index is optional: readers that hit the end marker stop there, and
+files without it are read linearly.
+"""
+
+import bisect
+import logging
+import mmap
+import os
+import struct
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from typing import BinaryIO, Iterator, Optional
+
+from .constants import CAPTURE_INDEX_INTERVAL, CAPTURE_MAX_RECORD, CAPTURE_RING_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Layout
+# ─────────────────────────────────────────────────────────────────────────────
+DIRECTION_TX = 0  # host to device
+DIRECTION_RX = 1  # device to host
+_DIRECTION_INDEX = 0xFE
+_DIRECTION_PAD = 0xFF
+
+CAPTURE_MAGIC = b"MBCAPTR\0"
+CAPTURE_VERSION = 1
+_FILE_HEADER = struct.Struct("<8sHHq")
+_FILE_RECORD = struct.Struct("<QBH")
+_INDEX_MAGIC = b"MBCAPIDX"
+_INDEX_ENTRY = struct.Struct("<QQ")
+_INDEX_TRAILER = struct.Struct("<QI8s")
+
+_RING_MAGIC = b"MBRING\0\0"
+# magic | capacity | head | tail | live records | total records | clock offset ns
+_RING_HEADER = struct.Struct("<8sIIIIQq")
+_RING_POSITIONS = struct.Struct("<IIIQ")
+_RING_POSITIONS_OFFSET = 12
+_RING_DATA_OFFSET = 64
+_RING_RECORD = struct.Struct("<QBxH")
+
+
+@dataclass(slots=True)
+class CaptureRecord:
+    """One captured buffer."""
+    timestamp_ns: int
+    direction: int
+    data: bytes
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Ring
+# ─────────────────────────────────────────────────────────────────────────────
+class CaptureRing:
+    """Overwrite-oldest ring of timestamped traffic records.
+
+    Args:
+        size: Bytes reserved for records
+        path: Back the ring with an mmap of this file instead of memory;
+            after a crash, ``CaptureRing.load(path)`` recovers it. A ring
+            left there by a previous run is moved to ``<path>.prev`` first
+            so its records survive the restart.
+    """
+
+    def __init__(self, size: int = CAPTURE_RING_SIZE, path: Optional[str] = None):
+        total = _RING_DATA_OFFSET + size
+        self._file = None
+        if path:
+            if os.path.exists(path) and os.path.getsize(path) > 0:
+                os.replace(path, f"{path}.prev")
+            self._file = open(path, "w+b")
+            self._file.truncate(total)
+            self._buf = mmap.mmap(self._file.fileno(), total)
+        else:
+            self._buf = bytearray(total)
+        self._view = memoryview(self._buf)
+        self._capacity = size
+        self._max_data = min(CAPTURE_MAX_RECORD, size // 2 - _RING_RECORD.size)
+        self._lock = threading.Lock()
+        self._head = 0
+        self._tail = 0
+        self._live = 0
+        self.total_records = 0
+        self.clock_offset = time.time_ns() - time.monotonic_ns()
+        self._sync_header()
+
+    @classmethod
+    def load(cls, path: str) -> "CaptureRing":
+        """Recover a ring from a file written by an mmap-backed ring.
+
+        Raises:
+            ValueError: If the file is not a capture ring
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+        if len(data) < _RING_DATA_OFFSET:
+            raise ValueError(f"{path} is not a capture ring")
+        magic, capacity, head, tail, live, total, clock_offset = _RING_HEADER.unpack_from(data, 0)
+        if magic != _RING_MAGIC or len(data) < _RING_DATA_OFFSET + capacity:
+            raise ValueError(f"{path} is not a capture ring")
+
+        ring = cls(capacity)
+        ring._buf[:] = data[:_RING_DATA_OFFSET + capacity]
+        ring._head, ring._tail, ring._live, ring.total_records = head, tail, live, total
+        ring.clock_offset = clock_offset
+        return ring
+
+    def __len__(self) -> int:
+        return self._live
+
+    def record(self, direction: int, data) -> None:
+        """Append one buffer, dropping the oldest records if needed.
+
+        Args:
+            direction: ``DIRECTION_TX`` or ``DIRECTION_RX``
+            data: Bytes-like object; longer buffers are truncated
+        """
+        length = min(len(data), self._max_data)
+        needed = _RING_RECORD.size + length
+        timestamp = time.monotonic_ns()
+        view = self._view
+        with self._lock:
+            pos = self._head
+            if self._capacity - pos < needed:
+                self._reclaim(pos, self._capacity)
+                if self._capacity - pos >= _RING_RECORD.size:
+                    _RING_RECORD.pack_into(view, _RING_DATA_OFFSET + pos, 0, _DIRECTION_PAD, 0)
+                pos = 0
+            if pos <= self._tail < pos + needed:
+                self._reclaim(pos, pos + needed)
+
+            start = _RING_DATA_OFFSET + pos
+            _RING_RECORD.pack_into(view, start, timestamp, direction, length)
+            start += _RING_RECORD.size
+            view[start:start + length] = data[:length] if length < len(data) else data
+            if not self._live:
+                self._tail = pos
+            self._head = pos + needed
+            self._live += 1
+            self.total_records += 1
+            _RING_POSITIONS.pack_into(
+                view, _RING_POSITIONS_OFFSET,
+                self._head, self._tail, self._live, self.total_records
+            )
+
+    def records(self) -> Iterator[CaptureRecord]:
+        """Yield a snapshot of the buffered records, oldest first."""
+        with self._lock:
+            snapshot = bytes(self._view[_RING_DATA_OFFSET:])
+            pos, live = self._tail, self._live
+
+        while live:
+            if self._capacity - pos < _RING_RECORD.size:
+                pos = 0
+                continue
+            timestamp, direction, length = _RING_RECORD.unpack_from(snapshot, pos)
+            if direction == _DIRECTION_PAD:
+                pos = 0
+                continue
+            start = pos + _RING_RECORD.size
+            yield CaptureRecord(timestamp, direction, snapshot[start:start + length])
+            pos = start + length
+            live -= 1
+
+    def clear(self) -> None:
+        """Drop every buffered record."""
+        with self._lock:
+            self._head = self._tail = self._live = 0
+            self._sync_header()
+
+    def dump(self, path: str) -> int:
+        """Write the buffered records to a capture file.
+
+        Returns:
+            Number of records written
+        """
+        with open(path, "wb") as f:
+            writer = CaptureWriter(f, clock_offset=self.clock_offset)
+            for record in self.records():
+                writer.write(record)
+            writer.close()
+            return writer.count
+
+    def dump_on_crash(self, path: str) -> None:
+        """Dump to ``path`` when an exception goes unhandled in any thread."""
+        previous_hook = sys.excepthook
+        previous_thread_hook = threading.excepthook
+
+        def dump() -> None:
+            try:
+                count = self.dump(path)
+                logger.info("Capture dumped to %s (%d records)", path, count)
+            except Exception as e:
+                logger.warning("Capture dump failed: %s", e)
+
+        def excepthook(exc_type, exc_value, exc_traceback) -> None:
+            dump()
+            previous_hook(exc_type, exc_value, exc_traceback)
+
+        def thread_excepthook(args) -> None:
+            dump()
+            previous_thread_hook(args)
+
+        sys.excepthook = excepthook
+        threading.excepthook = thread_excepthook
+
+    def close(self) -> None:
+        """Release the mmap backing, if any."""
+        if self._file:
+            self._view.release()
+            self._buf.close()
+            self._file.close()
+            self._file = None
+
+    def _reclaim(self, start: int, end: int) -> None:
+        """Drop the oldest records starting inside ``[start, end)`` (lock held)."""
+        view = self._view
+        while self._live and start <= self._tail < end:
+            tail = self._tail
+            if self._capacity - tail < _RING_RECORD.size:
+                self._tail = 0
+                continue
+            _, direction, length = _RING_RECORD.unpack_from(view, _RING_DATA_OFFSET + tail)
+            if direction == _DIRECTION_PAD:
+                self._tail = 0
+                continue
+            tail += _RING_RECORD.size + length
+            # Too little room left for a record header means an implicit wrap.
+            self._tail = 0 if self._capacity - tail < _RING_RECORD.size else tail
+            self._live -= 1
+
+    def _sync_header(self) -> None:
+        _RING_HEADER.pack_into(
+            self._view, 0, _RING_MAGIC, self._capacity,
+            self._head, self._tail, self._live, self.total_records, self.clock_offset
+        )
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Capture Files
+# ─────────────────────────────────────────────────────────────────────────────
+class CaptureWriter:
+    """Streams records into a capture file.
+
+    Every ``index_interval`` records, the timestamp and offset of the
+    record are noted; ``close()`` appends them as a footer index so
+    readers can seek straight to a time window. ``clock_offset`` defaults
+    to the current boot's wall clock offset.
+    """
+
+    def __init__(
+        self,
+        f: BinaryIO,
+        index_interval: int = CAPTURE_INDEX_INTERVAL,
+        clock_offset: Optional[int] = None
+    ):
+        self._f = f
+        self._index_interval = max(1, index_interval)
+        self._index: list[tuple[int, int]] = []
+        self.count = 0
+        if clock_offset is None:
+            clock_offset = time.time_ns() - time.monotonic_ns()
+        f.write(_FILE_HEADER.pack(CAPTURE_MAGIC, CAPTURE_VERSION, 0, clock_offset))
+        self._offset = _FILE_HEADER.size
+
+    def write(self, record: CaptureRecord) -> None:
+        """Append one record."""
+        if self.count % self._index_interval == 0:
+            self._index.append((record.timestamp_ns, self._offset))
+        self._f.write(_FILE_RECORD.pack(record.timestamp_ns, record.direction, len(record.data)))
+        self._f.write(record.data)
+        self._offset += _FILE_RECORD.size + len(record.data)
+        self.count += 1
+
+    def close(self) -> None:
+        """Write the end marker and footer index."""
+        f = self._f
+        f.write(_FILE_RECORD.pack(0, _DIRECTION_INDEX, 0))
+        index_offset = self._offset + _FILE_RECORD.size
+        for entry in self._index:
+            f.write(_INDEX_ENTRY.pack(*entry))
+        f.write(_INDEX_TRAILER.pack(index_offset, len(self._index), _INDEX_MAGIC))
+
+
+def read_index(f: BinaryIO) -> Optional[list[tuple[int, int]]]:
+    """Return the footer index of a seekable capture file, if it has one.
+
+    Entries are (monotonic ns, file offset) pairs in file order.
+    """
+    try:
+        size = f.seek(0, 2)
+    except (OSError, ValueError):
+        return None
+    if size < _FILE_HEADER.size + _INDEX_TRAILER.size:
+        return None
+
+    f.seek(size - _INDEX_TRAILER.size)
+    index_offset, count, magic = _INDEX_TRAILER.unpack(f.read(_INDEX_TRAILER.size))
+    if magic != _INDEX_MAGIC or index_offset + count * _INDEX_ENTRY.size > size:
+        return None
+    f.seek(index_offset)
+    raw = f.read(count * _INDEX_ENTRY.size)
+    return list(_INDEX_ENTRY.iter_unpack(raw))
+
+
+def read_capture(f: BinaryIO, start_ns: Optional[int] = None) -> Iterator[CaptureRecord]:
+    """Yield records from a capture file without loading it whole.
+
+    Args:
+        f: Capture file opened in binary mode
+        start_ns: Skip ahead using the footer index, if present, so that
+            reading starts at or shortly before this timestamp; records are
+            not filtered exactly
+
+    Raises:
+        ValueError: If the file is not a capture file
+    """
+    header = f.read(_FILE_HEADER.size)
+    if len(header) < _FILE_HEADER.size or header[:len(CAPTURE_MAGIC)] != CAPTURE_MAGIC:
+        raise ValueError("Not a capture file")
+
+    if start_ns is not None:
+        index = read_index(f)
+        offset = _FILE_HEADER.size
+        if index:
+            position = bisect.bisect_right(index, (start_ns, float("inf"))) - 1
+            if position >= 0:
+                offset = index[position][1]
+        f.seek(offset)
+
+    while True:
+        head = f.read(_FILE_RECORD.size)
+        if len(head) < _FILE_RECORD.size:
+            return
+        timestamp, direction, length = _FILE_RECORD.unpack(head)
+        if direction == _DIRECTION_INDEX:
+            return
+        data = f.read(length)
+        if len(data) < length:
+            return
+        yield CaptureRecord(timestamp, direction, data)
+
+
+def capture_clock_offset(path: str) -> int:
+    """Return the wall clock offset stored in a capture file header."""
+    with open(path, "rb") as f:
+        header = f.read(_FILE_HEADER.size)
+    if len(header) < _FILE_HEADER.size:
+        raise ValueError(f"{path} is not a capture file")
+    magic, _, _, clock_offset = _FILE_HEADER.unpack(header)
+    if magic != CAPTURE_MAGIC:
+        raise ValueError(f"{path} is not a capture file")
+    return clock_offset
+
@@ -4,16 +4,22 @@ import socket
 import threading
 from typing import Optional
 
+from .capture import CaptureRing, DIRECTION_RX, DIRECTION_TX
 from .constants import RFCOMM_PORT, SOCKET_TIMEOUT, RECV_BUFFER_SIZE
 
 
 class BluetoothConnection:
-    """Manages Bluetooth socket connection."""
+    """Manages Bluetooth socket connection.
     
-    def __init__(self):
+    Args:
+        capture: Optional ring that records every sent and received buffer
+    """
+    
+    def __init__(self, capture: Optional[CaptureRing] = None):
         self._sock: Optional[socket.socket] = None
         self._lock = threading.Lock()
         self._connected = False
+        self.capture = capture
     
     @property
     def connected(self) -> bool:
@@ -25,11 +31,12 @@ class BluetoothConnection:
         """Set connection status."""
         self._connected = value
     
-    def connect(self, address: str) -> None:
+    def connect(self, address: str, channel: int = RFCOMM_PORT) -> None:
         """Establish connection to device.
         
         Args:
             address: Bluetooth MAC address
+            channel: RFCOMM channel
             
         Raises:
             Exception: If connection fails
@@ -40,13 +47,30 @@ class BluetoothConnection:
             socket.BTPROTO_RFCOMM
         )
         self._sock.settimeout(SOCKET_TIMEOUT)
-        self._sock.connect((address, RFCOMM_PORT))
+        self._sock.connect((address, channel))
         self._connected = True
     
+    def adopt(self, other: "BluetoothConnection") -> None:
+        """Take over the open socket of another connection.
+        
+        Args:
+            other: Connected instance; it is left disconnected
+        """
+        with self._lock:
+            self._sock = other._sock
+            self._connected = other._connected
+            other._sock = None
+            other._connected = False
+    
     def disconnect(self) -> None:
         """Close the connection."""
         self._connected = False
         if self._sock:
+            try:
+                # Wakes a recv() blocked in the listener thread.
+                self._sock.shutdown(socket.SHUT_RDWR)
+            except Exception:
+                pass
             try:
                 self._sock.close()
             except Exception:
@@ -65,6 +89,8 @@ class BluetoothConnection:
         with self._lock:
             if self._sock:
                 self._sock.send(data)
+                if self.capture is not None:
+                    self.capture.record(DIRECTION_TX, data)
     
     def receive(self) -> bytes:
         """Receive data from device.
@@ -77,5 +103,25 @@ class BluetoothConnection:
             Exception: If receive fails
         """
         if self._sock:
-            return self._sock.recv(RECV_BUFFER_SIZE)
+            data = self._sock.recv(RECV_BUFFER_SIZE)
+            if self.capture is not None and data:
+                self.capture.record(DIRECTION_RX, data)
+            return data
         return b""
+    
+    def receive_into(self, buffer: memoryview) -> int:
+        """Receive data from device directly into ``buffer``.
+        
+        Returns:
+            Number of bytes written (0 means the peer closed the link)
+            
+        Raises:
+            socket.timeout: If no data available
+            Exception: If receive fails
+        """
+        if self._sock:
+            received = self._sock.recv_into(buffer)
+            if self.capture is not None and received:
+                self.capture.record(DIRECTION_RX, buffer[:received])
+            return received
+        return 0
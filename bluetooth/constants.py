@@ -5,13 +5,76 @@
 # ─────────────────────────────────────────────────────────────────────────────
 RFCOMM_PORT = 6
 SOCKET_TIMEOUT = 2
-RECONNECT_DELAY = 5
+RECONNECT_BACKOFF_BASE = 1.0
+RECONNECT_BACKOFF_CAP = 60.0
+ADAPTER_POLL_INTERVAL = 1.0
+RESUME_CHECK_INTERVAL = 1.0
+RESUME_DRIFT_THRESHOLD = 2.0
 RECV_BUFFER_SIZE = 1024
+ACK_TIMEOUT = 1.0
+ACK_MAX_RETRIES = 2
+SEND_QUEUE_SIZE = 32
+BATTERY_POLL_WINDOW = 1.0
+BATTERY_RESPONSE_TIMEOUT = 2.0
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Data Packet Sizes
+# Discovery
 # ─────────────────────────────────────────────────────────────────────────────
-PACKET_SIZE_MODE_ACK = 14
+DISCOVERY_CACHE_TTL = 30.0
+MAX_CONNECT_CANDIDATES = 3
+PROBE_MAX_WORKERS = 3
+PROBE_TIMEOUT = 3.0
+BLUEZ_STORAGE_DIR = "/var/lib/bluetooth"
+KNOWN_DEVICE_NAME_PATTERN = r"(redmi|xiaomi|mi)\s*(buds|airdots)"
+XIAOMI_OUI_PREFIXES = frozenset({
+    "00:9E:C8", "0C:1D:AF", "10:2A:B3", "14:F6:5A", "18:59:36", "20:82:C0",
+    "28:6C:07", "28:E3:1F", "34:80:B3", "34:CE:00", "38:A4:ED", "3C:BD:3E",
+    "4C:49:E3", "50:64:2B", "58:44:98", "64:09:80", "64:B4:73", "68:DF:DD",
+    "74:23:44", "74:51:BA", "78:02:F8", "7C:1D:D9", "8C:BE:BE", "98:FA:E3",
+    "9C:99:A0", "A0:86:C6", "AC:C1:EE", "AC:F7:F3", "B0:E2:35", "C4:0B:CB",
+    "C4:6A:B7", "D4:97:0B", "E4:46:DA", "EC:D0:9F", "F0:B4:29", "F4:8B:32",
+    "F8:A4:5F", "FC:64:BA",
+})
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Traffic Capture
+# ─────────────────────────────────────────────────────────────────────────────
+CAPTURE_RING_SIZE = 1 << 20
+CAPTURE_MAX_RECORD = 0xFFFF
+CAPTURE_INDEX_INTERVAL = 1024
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Framing
+# ─────────────────────────────────────────────────────────────────────────────
+FRAME_HEADER = bytes.fromhex("fedcba")
+FRAME_TRAILER = 0xEF
+FRAME_LENGTH_OFFSET = 5
+FRAME_OVERHEAD = 8  # header + flags + opcode + length + trailer
+FRAME_BUFFER_SIZE = 4096
+FLAG_EXPECTS_REPLY = 0x40
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Handshake
+# ─────────────────────────────────────────────────────────────────────────────
+HANDSHAKE_INIT_PACKETS = (
+    "fedcba04510003000301ef",
+)
+HANDSHAKE_STEP_TIMEOUT = 1.0
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Opcodes
+# ─────────────────────────────────────────────────────────────────────────────
+OPCODE_DEVICE_INFO = 0x02
+OPCODE_MODE = 0xF2
+MODE_ACK_OK = 0x00
+# The original client recognised mode acks only by their 14-byte frame size.
+MODE_ACK_PAYLOAD_SIZE = 6
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Battery Values
+# ─────────────────────────────────────────────────────────────────────────────
+BATTERY_UNKNOWN = 0xFF
+BATTERY_CHARGING_BIT = 0x80
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Protocol Patterns
@@ -1,23 +1,42 @@
 """Main Bluetooth Controller for Mi Buds."""
 
+import logging
 import socket
 import threading
 import time
+from concurrent.futures import Future
 from typing import Callable, Optional
 
+from .adapter import AdapterMonitor
+from .backoff import Backoff
+from .battery_poll import BatteryPollScheduler
 from .connection import BluetoothConnection
-from .discovery import BluetoothDiscovery
-from .protocol import BudsProtocol
-from .constants import RECONNECT_DELAY
+from .candidates import DiscoveryCache
+from .device_state import DeviceState, DeviceStateTracker, StateCallback
+from .discovery import BluetoothDevice
+from .framing import FrameDecoder
+from .handshake import ConnectionHandshake, HandshakeState
+from .metrics import ConnectionMetrics
+from .pending import PendingRequests
+from .reconnect import ReconnectCoordinator
+from .resume import ResumeDetector
+from .prober import CandidateProber
+from .protocol import BudsProtocol, BatteryStatus, ModeAck, SequenceCounter, UnknownMessage
+from .writer import CommandWriter, CompletionCallback, PRIORITY_MODE, PRIORITY_BATTERY
+from .constants import ACK_TIMEOUT, ACK_MAX_RETRIES, MAX_CONNECT_CANDIDATES, MODE_ACK_OK
+
+
+logger = logging.getLogger(__name__)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
 # Type Aliases
 # ─────────────────────────────────────────────────────────────────────────────
 StatusCallback = Callable[[str, str], None]
-BatteryCallback = Callable[[int, int, int], None]
+BatteryCallback = Callable[[BatteryStatus], None]
 CheckBatteryCallback = Callable[[], None]
 ConnectionEventCallback = Callable[[str], None]
+DeviceCallback = Callable[[BluetoothDevice], None]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -34,17 +53,52 @@ class BTController:
         battery_callback: Optional[BatteryCallback] = None,
         check_battery_callback: Optional[CheckBatteryCallback] = None,
         connection_event_callback: Optional[ConnectionEventCallback] = None,
-        bd_addr: Optional[str] = None
+        bd_addr: Optional[str] = None,
+        known_device: Optional[BluetoothDevice] = None,
+        device_callback: Optional[DeviceCallback] = None,
+        state_callback: Optional[StateCallback] = None,
+        ack_timeout: float = ACK_TIMEOUT,
+        ack_max_retries: int = ACK_MAX_RETRIES,
+        sysfs_root: str = "/sys",
+        connection_factory: Callable[[], BluetoothConnection] = BluetoothConnection
     ):
-        self._connection = BluetoothConnection()
+        self._connection = connection_factory()
         self._protocol = BudsProtocol()
+        self._decoder = FrameDecoder()
+        self._sequence = SequenceCounter()
+        self._pending = PendingRequests(self._connection.send, ack_timeout, ack_max_retries)
+        self._writer = CommandWriter()
+        self._battery_poll = BatteryPollScheduler(self._queue_battery_poll)
+        self._device_state = DeviceStateTracker(state_callback)
+        self._intended_low_latency: Optional[bool] = None
+        self._metrics = ConnectionMetrics()
+        self._handshake = ConnectionHandshake(
+            send=self._connection.send,
+            build_battery_request=self._protocol.build_battery_request,
+            on_first_battery=self._on_handshake_battery,
+            on_step_timeout=self._on_handshake_timeout,
+            on_send_error=self._on_handshake_send_error
+        )
+        self._reconnector = ReconnectCoordinator(
+            self._reconnect_once,
+            on_join=self._on_reconnect_joined
+        )
         self._bd_addr = bd_addr
+        self._known_device = known_device
+        self._discovery = DiscoveryCache()
+        self._prober = CandidateProber(connection_factory=connection_factory)
+        self._device: Optional[BluetoothDevice] = None
+        self._created_at = time.monotonic()
         self._running = True
         self._connect_lock = threading.Lock()
         self._state_lock = threading.Lock()
         self._max_reconnect_attempts = 5
         self._reconnect_attempts = 0
-        self._reconnect_paused = False
+        self._backoff = Backoff()
+        self._adapter = AdapterMonitor(sysfs_root)
+        self._wake = threading.Event()
+        self._resume_pending = False
+        self._resume_detector = ResumeDetector(self.handle_resume)
         self._last_connection_event: Optional[str] = None
         
         # Callbacks
@@ -52,6 +106,14 @@ class BTController:
         self._battery_callback = battery_callback
         self._check_battery_callback = check_battery_callback
         self._connection_event_callback = connection_event_callback
+        self._device_callback = device_callback
+
+        # Incoming message handlers, keyed by decoded message type
+        self._message_handlers: dict[type, Callable[[object], None]] = {
+            BatteryStatus: self._notify_battery,
+            ModeAck: self._on_mode_ack,
+            UnknownMessage: self._device_state.on_reported,
+        }
     
     # ─────────────────────────────────────────────────────────────────────────
     # Properties
@@ -60,6 +122,21 @@ class BTController:
     def connected(self) -> bool:
         """Check if connected to device."""
         return self._connection.connected
+
+    @property
+    def device_state(self) -> DeviceState:
+        """State confirmed by the device through acks and responses."""
+        return self._device_state.state
+
+    @property
+    def intended_low_latency(self) -> Optional[bool]:
+        """Latency mode last asked for via ``set_low_latency``, if any."""
+        return self._intended_low_latency
+
+    @property
+    def metrics(self) -> ConnectionMetrics:
+        """Connection timings and counters."""
+        return self._metrics
     
     # ─────────────────────────────────────────────────────────────────────────
     # Status Updates
@@ -70,14 +147,17 @@ class BTController:
             self._status_callback(text, color)
     
     def _trigger_battery_check(self) -> None:
-        """Trigger battery check callback."""
+        """Schedule a coalesced battery refresh and notify the callback."""
+        self._battery_poll.trigger()
         if self._check_battery_callback:
             self._check_battery_callback()
     
-    def _notify_battery(self, left: int, right: int, case: int) -> None:
+    def _notify_battery(self, status: BatteryStatus) -> None:
         """Notify UI of battery status."""
+        self._battery_poll.on_response()
+        self._device_state.on_battery(status)
         if self._battery_callback:
-            self._battery_callback(left, right, case)
+            self._battery_callback(status)
 
     def _notify_connection_event(self, event: str) -> None:
         """Notify UI about connection event transitions."""
@@ -91,52 +171,159 @@ class BTController:
     def _reset_reconnect_state(self) -> None:
         with self._state_lock:
             self._reconnect_attempts = 0
-            self._reconnect_paused = False
+            self._backoff.reset()
 
-    def _record_reconnect_failure(self) -> tuple[int, bool]:
+    def _record_reconnect_failure(self) -> tuple[int, float]:
+        """Count a failed attempt and return (attempts, delay before retry)."""
         with self._state_lock:
             self._reconnect_attempts += 1
-            if self._reconnect_attempts >= self._max_reconnect_attempts:
-                self._reconnect_paused = True
-            return self._reconnect_attempts, self._reconnect_paused
+            return self._reconnect_attempts, self._backoff.next_delay()
 
     def resume_reconnect_attempts(self) -> None:
-        """Allow reconnect attempts again after user interaction."""
+        """Retry immediately with a fresh backoff after user interaction."""
+        self._reset_reconnect_state()
+        self._wake.set()
+
+    def handle_resume(self, slept: float = 0.0) -> None:
+        """Drop the link killed by suspend and reconnect at once.
+        
+        The listener reconnects to the cached address on its next pass,
+        skipping the stale-connection wait and any pending backoff.
+        """
+        logger.info("System resumed after %.0fs asleep. Reconnecting...", slept)
+        self._resume_pending = True
         self._reset_reconnect_state()
+        self._handshake.cancel()
+        self._battery_poll.reset()
+        self._device_state.on_disconnect()
+        self._pending.fail_all(ConnectionError("System resumed from sleep"))
+        self._connection.disconnect()
+        self._notify_connection_event("reconnecting")
+        self._wake.set()
+
+    def notify_device_connected(self, device: BluetoothDevice) -> None:
+        """Connect right away when a device's link comes up.
+        
+        Called by push-based discovery backends such as ``BlueZMonitor``.
+        Devices other than the current or last known one are ignored once an
+        address is known.
+        """
+        self._discovery.invalidate()
+        if self._connection.connected or not device.address:
+            return
+        known = self._known_device.address if self._known_device else None
+        if self._bd_addr and device.address not in (self._bd_addr, known):
+            return
+        if not self._bd_addr:
+            self._bd_addr = device.address
+        self.resume_reconnect_attempts()
+
+    def notify_device_disconnected(self, device: BluetoothDevice) -> None:
+        """Drop the link as soon as the device is reported gone."""
+        self._discovery.invalidate()
+        if self._connection.connected and device.address == self._bd_addr:
+            self._connection.disconnect()
+
+    def _sleep(self, delay: float) -> None:
+        """Sleep for ``delay`` unless woken early by resume or stop."""
+        self._wake.wait(delay)
+        self._wake.clear()
     
     # ─────────────────────────────────────────────────────────────────────────
     # Connection
     # ─────────────────────────────────────────────────────────────────────────
-    def connect(self) -> bool:
-        """Connect to the Mi Buds device."""
+    def connect(self, allow_cached: bool = True) -> bool:
+        """Connect to the Mi Buds device.
+        
+        Args:
+            allow_cached: Try the last known device before running discovery
+        """
         with self._connect_lock:
             if self._connection.connected:
                 return True
 
-            # Discover device if address not set
+            # Try the last known device directly, skipping discovery
+            known = self._known_device
+            if not self._bd_addr and allow_cached and known and known.address:
+                if self._open_link(known):
+                    return True
+
+            # Discover device if address not set, best candidates first
             if not self._bd_addr:
-                device = BluetoothDiscovery.get_connected_device()
-                if not device or not device.address:
-                    self._update_status(
-                        f"No connected Bluetooth device found. Retrying in {RECONNECT_DELAY}s...",
-                        "red"
-                    )
+                candidates = self._discovery.candidates(self._last_address())
+                if not candidates:
+                    self._update_status("No connected Bluetooth device found.", "red")
                     return False
-                self._bd_addr = device.address
-                self._update_status(f"MAC found: {self._bd_addr}", "blue")
+                candidates = candidates[:MAX_CONNECT_CANDIDATES]
+                if len(candidates) == 1:
+                    self._update_status(f"MAC found: {candidates[0].address}", "blue")
+                    return self._open_link(candidates[0])
+                return self._probe_candidates(candidates)
 
-            # Establish connection
-            try:
-                self._connection.connect(self._bd_addr)
-                self._update_status("Connected", "blue")
-                self._reset_reconnect_state()
-                self._notify_connection_event("connected")
-                self.on_connect_setup()
-                return True
-            except Exception as e:
-                self._connection.connected = False
-                self._update_status(f"Connection failed: {e}", "red")
-                return False
+            name = ""
+            if self._device and self._device.address == self._bd_addr:
+                name = self._device.name
+            return self._open_link(BluetoothDevice(name=name, address=self._bd_addr))
+
+    def _last_address(self) -> Optional[str]:
+        """Address that connected successfully most recently, if any."""
+        if self._device:
+            return self._device.address
+        if self._known_device:
+            return self._known_device.address
+        return None
+
+    def _open_link(self, device: BluetoothDevice) -> bool:
+        """Open the RFCOMM link to ``device`` and start the handshake."""
+        try:
+            self._metrics.connect_started_at = time.monotonic()
+            self._decoder.reset()
+            self._connection.connect(device.address, device.channel)
+        except Exception as e:
+            self._connection.connected = False
+            self._update_status(f"Connection failed: {e}", "red")
+            return False
+
+        self._on_link_up(device)
+        self.on_connect_setup()
+        return True
+
+    def _probe_candidates(self, candidates: list[BluetoothDevice]) -> bool:
+        """Probe several candidates at once and keep the one that answers."""
+        self._update_status(f"Probing {len(candidates)} devices...", "blue")
+        self._metrics.connect_started_at = time.monotonic()
+        result = self._prober.probe(candidates)
+        if result is None:
+            self._update_status("No candidate device answered.", "red")
+            return False
+
+        self._decoder.reset()
+        self._decoder.feed(result.leftover)
+        self._connection.adopt(result.connection)
+        self._update_status(f"MAC found: {result.device.address}", "blue")
+        self._on_link_up(result.device)
+        # The probe already ran the init sequence and got a battery reply.
+        self._on_handshake_battery()
+        self._notify_battery(result.battery)
+        self._dispatch_frames()
+        return True
+
+    def _on_link_up(self, device: BluetoothDevice) -> None:
+        """Record a newly opened link and notify listeners."""
+        # Nothing is confirmed on a fresh link until the device answers.
+        self._device_state.on_disconnect()
+        self._bd_addr = device.address
+        self._device = device
+        if self._metrics.cold_start_to_connected is None:
+            elapsed = time.monotonic() - self._created_at
+            self._metrics.cold_start_to_connected = elapsed
+            logger.info("Cold start to connected: %.0f ms", elapsed * 1000)
+
+        self._update_status("Connected", "blue")
+        self._reset_reconnect_state()
+        self._notify_connection_event("connected")
+        if self._device_callback:
+            self._device_callback(device)
     
     # ─────────────────────────────────────────────────────────────────────────
     # Commands
@@ -150,17 +337,42 @@ class BTController:
         Returns:
             (success, message) tuple
         """
+        try:
+            self.send_command_tracked(mode)
+        except ConnectionError as e:
+            return False, str(e)
+        except Exception as e:
+            return False, f"Send error: {e}"
+        mode_name = self._protocol.get_mode_name(mode)
+        return True, f"{mode_name} mode sent."
+
+    def send_command_tracked(self, mode: str = "low") -> Future:
+        """Send latency mode command and track its acknowledgment.
+        
+        Commands can be pipelined; each one carries its own sequence number.
+        
+        Args:
+            mode: "low" for low latency, "std" for standard
+            
+        Returns:
+            Future resolving to a CommandResult with the round-trip time, or
+            failing with AckTimeoutError after the configured retries
+            
+        Raises:
+            ConnectionError: If the device could not be reached
+            Exception: If the initial send fails
+        """
         if not self._ensure_connected():
-            return False, "Could not connect to device."
+            raise ConnectionError("Could not connect to device.")
         
+        seq = self._sequence.next()
+        payload = self._protocol.build_mode_command(mode, seq)
+        self._device_state.on_command_sent(seq, mode == "low")
         try:
-            payload = self._protocol.build_mode_command(mode)
-            self._connection.send(payload)
-            mode_name = self._protocol.get_mode_name(mode)
-            return True, f"{mode_name} mode sent."
-        except Exception as e:
+            return self._pending.submit(seq, payload)
+        except Exception:
             self._connection.connected = False
-            return False, f"Send error: {e}"
+            raise
     
     def request_battery(self, user_initiated: bool = True) -> tuple[bool, str]:
         """Request battery status from device."""
@@ -198,47 +410,164 @@ class BTController:
             self._connection.connected = False
             return False, f"Send error: {e}"
     
+    # ─────────────────────────────────────────────────────────────────────────
+    # Queued Commands
+    # ─────────────────────────────────────────────────────────────────────────
+    def submit_command(self, mode: str = "low", on_done: Optional[CompletionCallback] = None) -> bool:
+        """Queue a latency mode command without blocking the caller.
+        
+        A queued, not yet sent mode command is replaced by a newer one.
+        
+        Returns:
+            True if queued
+        """
+        self._writer.start()
+        return self._writer.submit(
+            lambda: self.send_command(mode),
+            priority=PRIORITY_MODE,
+            key="latency",
+            on_done=on_done
+        )
+
+    def set_low_latency(self, enabled: bool, on_done: Optional[CompletionCallback] = None) -> bool:
+        """Ask for a latency mode and keep it across reconnects.
+        
+        Nothing is sent if the device already confirmed that mode, or while
+        disconnected: this never starts a reconnect. After a reconnect the
+        mode is reapplied once the handshake finishes.
+        
+        Returns:
+            True if a command was queued, False if skipped or not queued
+        """
+        self._intended_low_latency = bool(enabled)
+        mode_name = self._protocol.get_mode_name(self._mode(enabled))
+        if self._device_state.low_latency == enabled:
+            if on_done:
+                on_done(True, f"{mode_name} mode already active.")
+            return False
+        if not self.connected:
+            if on_done:
+                on_done(True, f"{mode_name} mode will be applied once connected.")
+            return False
+        return self.submit_command(self._mode(enabled), on_done=on_done)
+
+    def _reapply_intended_state(self) -> None:
+        """Restore the requested latency mode on a fresh link."""
+        intended = self._intended_low_latency
+        if intended is None or self._device_state.low_latency == intended:
+            return
+        logger.info("Reapplying %s mode", self._protocol.get_mode_name(self._mode(intended)))
+        self.submit_command(self._mode(intended), on_done=self._on_reapply_done)
+
+    @staticmethod
+    def _on_reapply_done(success: bool, message: str) -> None:
+        if not success:
+            logger.warning("Reapplying latency mode failed: %s", message)
+
+    @staticmethod
+    def _mode(low_latency: bool) -> str:
+        return "low" if low_latency else "std"
+
+    def submit_battery_request(self, user_initiated: bool = True) -> None:
+        """Ask for a battery refresh without blocking the caller.
+        
+        Goes through the battery poll scheduler, so a request already
+        scheduled or awaiting its response is not duplicated.
+        """
+        if user_initiated:
+            self.resume_reconnect_attempts()
+        self._battery_poll.trigger(immediate=True)
+
+    @property
+    def battery_poll(self) -> BatteryPollScheduler:
+        """Battery request scheduler, with sent/suppressed counters."""
+        return self._battery_poll
+
+    def _queue_battery_poll(self) -> bool:
+        self._writer.start()
+        return self._writer.submit(
+            lambda: self.request_battery(user_initiated=False),
+            priority=PRIORITY_BATTERY,
+            key="battery",
+            on_done=self._on_battery_poll_sent
+        )
+
+    def _on_battery_poll_sent(self, success: bool, message: str) -> None:
+        if not success:
+            self._battery_poll.on_send_failed()
+            logger.warning("Battery request not sent: %s", message)
+
     def _ensure_connected(self) -> bool:
         """Ensure connected, attempting to connect if not."""
-        return self._connection.connected or self.connect()
+        return self._connection.connected or self._reconnector.run()
 
     def reconnect(self, force_rediscovery: bool = False) -> bool:
-        """Reconnect to the device, optionally forcing MAC rediscovery."""
+        """Reconnect to the device, optionally forcing MAC rediscovery.
+        
+        Concurrent callers share a single attempt.
+        """
+        return self._reconnector.run(force_rediscovery)
+
+    def _reconnect_once(self, force_rediscovery: bool) -> bool:
+        if self._connection.connected:
+            return True
         self._connection.disconnect()
         if force_rediscovery:
             self._bd_addr = None
+            self._discovery.invalidate()
         self._notify_connection_event("reconnecting")
-        return self.connect()
+        return self.connect(allow_cached=not force_rediscovery)
+
+    def _on_reconnect_joined(self) -> None:
+        self._metrics.reconnects_joined += 1
     
-    def on_connect_setup(self):
-            """Send a sequence of packets on connection."""
-            packets = [
-                "fedcba04510003000301ef"
-            ]
-            for packet_hex in packets:
-                test_bytes = bytes.fromhex(packet_hex)
-                print(self.send_raw(test_bytes))
-                time.sleep(0.1)
-            # Also request battery after sending packets
-            time.sleep(1)
-            self.request_battery(user_initiated=False)
+    def on_connect_setup(self) -> None:
+        """Start the handshake; it advances as the device replies."""
+        self._handshake.start()
+
+    def _on_handshake_battery(self) -> None:
+        started_at = self._metrics.connect_started_at
+        if started_at is not None:
+            elapsed = time.monotonic() - started_at
+            self._metrics.connect_to_first_battery = elapsed
+            logger.info("Connect to first battery: %.0f ms", elapsed * 1000)
+        self._reapply_intended_state()
+
+    def _on_handshake_timeout(self, state: HandshakeState) -> None:
+        self._metrics.handshake_step_timeouts += 1
+        logger.warning("Handshake step timed out: %s", state.value)
+        if self._handshake.state is HandshakeState.DONE:
+            self._reapply_intended_state()
+
+    def _on_handshake_send_error(self, error: Exception) -> None:
+        self._connection.connected = False
+        logger.warning("Handshake send error: %s", error)
     
     # ─────────────────────────────────────────────────────────────────────────
     # Listener
     # ─────────────────────────────────────────────────────────────────────────
     def listen(self) -> None:
         """Main listener loop for incoming data."""
-        last_packet_size = 0
         last_data_received_at = time.monotonic()
         disconnected_since: Optional[float] = None
+        self._resume_detector.start()
         
         while self._running:
             if not self._connection.connected:
-                with self._state_lock:
-                    reconnect_paused = self._reconnect_paused
+                if self._resume_pending:
+                    self._resume_pending = False
+                    self._wake.clear()
+                    disconnected_since = None
 
-                if reconnect_paused:
-                    time.sleep(RECONNECT_DELAY)
+                if not self._adapter.is_usable():
+                    # Attempts cannot succeed; wait for the adapter instead of
+                    # burning them, then retry right away.
+                    self._update_status("Bluetooth is off. Waiting for adapter...", "orange")
+                    self._notify_connection_event("adapter_unavailable")
+                    self._reset_reconnect_state()
+                    self._adapter.wait_until_usable(self._wake)
+                    self._wake.clear()
+                    disconnected_since = None
                     continue
 
                 if disconnected_since is None:
@@ -251,23 +580,27 @@ class BTController:
                     self._update_status("Connection stale. Full reconnect...", "orange")
 
                 if not self.reconnect(force_rediscovery=force_rediscovery):
-                    attempts, reached_limit = self._record_reconnect_failure()
-                    if reached_limit:
-                        self._update_status("Could not connect. Press Refresh Battery.", "red")
+                    attempts, delay = self._record_reconnect_failure()
+                    if attempts == self._max_reconnect_attempts:
                         self._notify_connection_event("reconnect_failed_limit")
+                    if attempts >= self._max_reconnect_attempts:
+                        self._update_status(
+                            f"Could not connect. Retrying in {delay:.0f}s or press Refresh Battery.",
+                            "red"
+                        )
                     else:
                         self._update_status(
-                            f"Reconnect failed ({attempts}/{self._max_reconnect_attempts}). Retrying in {RECONNECT_DELAY}s...",
+                            f"Reconnect failed ({attempts}/{self._max_reconnect_attempts}). Retrying in {delay:.0f}s...",
                             "orange"
                         )
-                    time.sleep(RECONNECT_DELAY)
+                    self._sleep(delay)
                 else:
                     disconnected_since = None
                     last_data_received_at = time.monotonic()
                 continue
             
             try:
-                last_packet_size = self._process_data(last_packet_size)
+                self._process_data()
                 last_data_received_at = time.monotonic()
                 disconnected_since = None
             except socket.timeout:
@@ -277,34 +610,50 @@ class BTController:
             except Exception:
                 self._handle_disconnect()
     
-    def _process_data(self, last_packet_size: int) -> int:
-        """Process incoming data packet."""
-        data = self._connection.receive()
-        if not data:
+    def _process_data(self) -> None:
+        """Receive from the socket and dispatch every complete frame."""
+        received = self._connection.receive_into(self._decoder.recv_buffer())
+        if not received:
             raise ConnectionError("Received zero bytes from RFCOMM socket")
+        self._decoder.commit(received)
+        self._dispatch_frames()
 
-        packet_size = len(data)
-        print(f"Received data size: {packet_size}")
+    def _dispatch_frames(self) -> None:
+        """Decode and handle every complete frame already buffered."""
+        for frame in self._decoder.frames():
+            message = self._protocol.decode(frame)
+            self._handshake.on_message(message)
+            handler = self._message_handlers.get(type(message))
+            if handler:
+                handler(message)
 
-        # Check for battery data
-        if self._protocol.is_battery_packet(data):
-            status = self._protocol.parse_battery(data)
-            if status:
-                self._notify_battery(status.left, status.right, status.case)
-        
-        # Check for mode acknowledgment
-        elif self._protocol.is_mode_ack_packet(packet_size):
-            if last_packet_size != packet_size:
-                self._trigger_battery_check()
-        
-        return packet_size
+    def add_message_handler(self, message_type: type, handler: Callable[[object], None]) -> None:
+        """Register a handler for a decoded message type."""
+        self._message_handlers[message_type] = handler
+
+    def _on_mode_ack(self, ack: ModeAck) -> None:
+        """Complete the matching command and refresh battery."""
+        seq = self._pending.resolve(ack.seq)
+        if seq is not None and seq != ack.seq:
+            # Matched by order, not by its bytes: the ack itself is the OK.
+            ack = ModeAck(seq=seq, status=MODE_ACK_OK)
+        self._device_state.on_ack(ack)
+        self._trigger_battery_check()
     
     def _handle_disconnect(self) -> None:
         """Handle connection loss."""
+        if self._resume_pending:
+            # handle_resume() closed the socket on purpose.
+            return
         self._connection.connected = False
+        self._discovery.invalidate()
+        self._handshake.cancel()
+        self._battery_poll.reset()
+        self._device_state.on_disconnect()
+        self._pending.fail_all(ConnectionError("Connection lost"))
         self._update_status("Connection lost", "red")
         self._notify_connection_event("disconnected")
-        time.sleep(2)
+        self._sleep(2)
     
     # ─────────────────────────────────────────────────────────────────────────
     # Cleanup
@@ -312,4 +661,9 @@ class BTController:
     def stop(self) -> None:
         """Stop the controller."""
         self._running = False
+        self._resume_detector.stop()
+        self._wake.set()
+        self._battery_poll.stop()
+        self._writer.stop()
         self._connection.disconnect()
+        self._pending.fail_all(ConnectionError("Controller stopped"))
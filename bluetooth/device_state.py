@@ -0,0 +1,111 @@
+"""Device state as confirmed by the earbuds themselves."""
+
+import copy
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .constants import MODE_ACK_OK
+from .protocol import BatteryStatus, ModeAck, UnknownMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class DeviceState:
+    """Last values the device reported or acknowledged.
+
+    ``None`` means the device has not confirmed a value on this link yet.
+    """
+    low_latency: Optional[bool] = None
+    battery: Optional[BatteryStatus] = None
+    battery_at: Optional[float] = None
+    reported: dict[int, bytes] = field(default_factory=dict)
+
+
+StateCallback = Callable[[DeviceState], None]
+
+
+class DeviceStateTracker:
+    """Keeps ``DeviceState`` in sync with acks and responses only.
+
+    Sending a mode command records which mode its sequence number asked
+    for; the mode becomes the confirmed state once the matching ack
+    arrives with an OK status. Unknown opcodes (firmware info and similar)
+    keep their latest raw payload in ``reported``.
+
+    Args:
+        on_change: Called with a snapshot whenever the state changes
+    """
+
+    def __init__(self, on_change: Optional[StateCallback] = None):
+        self._on_change = on_change
+        self._lock = threading.Lock()
+        self._state = DeviceState()
+        self._sent_modes: dict[int, bool] = {}
+
+    @property
+    def state(self) -> DeviceState:
+        """Snapshot of the confirmed state."""
+        with self._lock:
+            return copy.deepcopy(self._state)
+
+    @property
+    def low_latency(self) -> Optional[bool]:
+        """Confirmed latency mode, or None if unknown."""
+        return self._state.low_latency
+
+    def on_command_sent(self, seq: int, low_latency: bool) -> None:
+        """Remember what the mode command with ``seq`` asked for."""
+        with self._lock:
+            self._sent_modes[seq] = low_latency
+
+    def on_ack(self, ack: ModeAck) -> None:
+        """Apply a mode ack."""
+        with self._lock:
+            requested = self._sent_modes.pop(ack.seq, None)
+            if requested is None or ack.status != MODE_ACK_OK:
+                return
+            changed = self._state.low_latency != requested
+            self._state.low_latency = requested
+        if changed:
+            self._notify()
+
+    def on_battery(self, status: BatteryStatus) -> None:
+        """Apply a battery response or push."""
+        with self._lock:
+            changed = self._state.battery != status
+            self._state.battery = status
+            self._state.battery_at = time.monotonic()
+        if changed:
+            self._notify()
+
+    def on_reported(self, message: UnknownMessage) -> None:
+        """Keep the latest payload of an opcode without a codec."""
+        with self._lock:
+            changed = self._state.reported.get(message.opcode) != message.payload
+            self._state.reported[message.opcode] = message.payload
+        if changed:
+            self._notify()
+
+    def on_disconnect(self) -> None:
+        """Forget link-scoped state; the device may reset while away.
+
+        The last battery reading is kept for display.
+        """
+        with self._lock:
+            self._sent_modes.clear()
+            changed = self._state.low_latency is not None
+            self._state.low_latency = None
+        if changed:
+            self._notify()
+
+    def _notify(self) -> None:
+        if self._on_change:
+            try:
+                self._on_change(self.state)
+            except Exception:
+                logger.exception("Device state callback failed")
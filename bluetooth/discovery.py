@@ -1,10 +1,15 @@
 """Bluetooth device discovery (Windows only)."""
 
+import glob
+import os
 import subprocess
 import json
 import sys
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Optional
+
+from . import hci
+from .constants import BLUEZ_STORAGE_DIR, RFCOMM_PORT
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -15,6 +20,7 @@ class BluetoothDevice:
     """Represents a connected Bluetooth device."""
     name: str
     address: str
+    channel: int = RFCOMM_PORT
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -43,6 +49,22 @@ if ($results) { $results | ConvertTo-Json -Compress }
 # ─────────────────────────────────────────────────────────────────────────────
 class BluetoothDiscovery:
     """Handles Bluetooth device discovery."""
+
+    # Linux name sources that need no process: a live lookup (the BlueZ
+    # monitor's object cache) and names remembered from earlier connects.
+    _name_lookup: Optional[Callable[[str], str]] = None
+    _known_names: dict[str, str] = {}
+
+    @classmethod
+    def set_name_lookup(cls, lookup: Optional[Callable[[str], str]]) -> None:
+        """Use ``lookup(address) -> name`` before other Linux name sources."""
+        cls._name_lookup = lookup
+
+    @classmethod
+    def remember_name(cls, address: str, name: str) -> None:
+        """Remember a device name, e.g. of the last-used device."""
+        if address and name:
+            cls._known_names[cls._format_mac(address)] = name
     
     @staticmethod
     def is_supported() -> bool:
@@ -56,18 +78,24 @@ class BluetoothDiscovery:
         Returns:
             BluetoothDevice if found, None otherwise
         """
+        devices = cls.get_connected_devices()
+        return devices[0] if devices else None
+
+    @classmethod
+    def get_connected_devices(cls) -> list[BluetoothDevice]:
+        """Get every connected Bluetooth device, in discovery order."""
         if not cls.is_supported():
-            return None
+            return []
         
         try:
             if sys.platform == "win32":
                 output = cls._run_discovery_script_win()
                 return cls._parse_output_win(output)
             elif sys.platform == "linux":
-                return cls._get_connected_device_linux()
+                return cls._get_connected_devices_linux()
         except Exception:
-            return None
-        return None
+            return []
+        return []
     
     @staticmethod
     def _run_discovery_script_win() -> str:
@@ -85,31 +113,69 @@ class BluetoothDiscovery:
         ).strip()
     
     @classmethod
-    def _parse_output_win(cls, output: str) -> Optional[BluetoothDevice]:
-        """Parse PowerShell JSON output to BluetoothDevice."""
+    def _parse_output_win(cls, output: str) -> list[BluetoothDevice]:
+        """Parse PowerShell JSON output to BluetoothDevice list."""
         if not output:
-            return None
+            return []
         
         data = json.loads(output)
-        
-        if isinstance(data, list):
-            for item in data:
-                address = item.get("Address")
-                if address:
-                    return BluetoothDevice(
-                        name=item.get("Name", ""),
-                        address=cls._format_mac(address)
-                    )
-            return None
-        
-        return BluetoothDevice(
-            name=data.get("Name", ""),
-            address=cls._format_mac(data.get("Address", ""))
-        )
+        items = data if isinstance(data, list) else [data]
+        return [
+            BluetoothDevice(
+                name=item.get("Name", "") or "",
+                address=cls._format_mac(item.get("Address"))
+            )
+            for item in items
+            if item.get("Address")
+        ]
+
+    @classmethod
+    def _get_connected_devices_linux(cls) -> list[BluetoothDevice]:
+        """Get connected Bluetooth devices, preferring the kernel's HCI list."""
+        try:
+            connections = hci.get_connections()
+        except OSError:
+            return cls._get_connected_devices_bluetoothctl()
+
+        return [
+            BluetoothDevice(name=cls._lookup_name_linux(conn.address), address=conn.address)
+            for conn in connections
+        ]
+
+    @classmethod
+    def _lookup_name_linux(cls, address: str, storage_dir: str = BLUEZ_STORAGE_DIR) -> str:
+        """Resolve a device name for an address from the HCI list.
+
+        Tries the registered lookup, remembered names and BlueZ's pairing
+        storage (usually root-only), without starting a process. An unnamed
+        device is still ranked by its vendor prefix and last-used address.
+        """
+        if cls._name_lookup:
+            name = cls._name_lookup(address)
+            if name:
+                return name
+        name = cls._known_names.get(cls._format_mac(address))
+        if name:
+            return name
+        return cls._read_stored_name(address, storage_dir)
+
+    @staticmethod
+    def _read_stored_name(address: str, storage_dir: str = BLUEZ_STORAGE_DIR) -> str:
+        """Read ``Name=`` from ``<storage_dir>/<adapter>/<address>/info``."""
+        for path in glob.glob(os.path.join(storage_dir, "*", address.upper(), "info")):
+            try:
+                with open(path, encoding="utf-8", errors="replace") as f:
+                    for line in f:
+                        if line.startswith("Name="):
+                            return line[len("Name="):].strip()
+            except OSError:
+                continue
+        return ""
 
     @classmethod
-    def _get_connected_device_linux(cls) -> Optional[BluetoothDevice]:
-        """Get connected Bluetooth device using bluetoothctl on Linux."""
+    def _get_connected_devices_bluetoothctl(cls) -> list[BluetoothDevice]:
+        """Get connected Bluetooth devices using bluetoothctl on Linux."""
+        devices = []
         try:
             # Get list of devices
             devices_output = subprocess.check_output(["bluetoothctl", "devices"], text=True)
@@ -123,10 +189,10 @@ class BluetoothDiscovery:
                     # Verify if connected
                     info_output = subprocess.check_output(["bluetoothctl", "info", mac], text=True)
                     if "Connected: yes" in info_output:
-                        return BluetoothDevice(name=name, address=cls._format_mac(mac))
+                        devices.append(BluetoothDevice(name=name, address=cls._format_mac(mac)))
         except (subprocess.SubprocessError, FileNotFoundError):
             pass
-        return None
+        return devices
     
     @staticmethod
     def _format_mac(addr: str) -> str:
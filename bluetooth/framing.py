@@ -0,0 +1,166 @@
+"""Streaming frame decoder for the Mi Buds RFCOMM framing.
+
+Every packet on the wire looks like::
+
+    fe dc ba | flags | opcode | length (2, big endian) | payload (length) | ef
+
+RFCOMM is a byte stream, so a single ``recv`` may return half a frame or
+several frames glued together. ``FrameDecoder`` owns one preallocated
+buffer that the socket writes into directly (``recv_into``) and hands out
+complete frames as ``memoryview`` slices of that buffer, without copying.
+"""
+
+from typing import Iterator
+
+from .constants import (
+    FRAME_HEADER,
+    FRAME_TRAILER,
+    FRAME_OVERHEAD,
+    FRAME_LENGTH_OFFSET,
+    FRAME_BUFFER_SIZE,
+)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Frame Layout
+# ─────────────────────────────────────────────────────────────────────────────
+FRAME_FLAGS_OFFSET = 3
+FRAME_OPCODE_OFFSET = 4
+FRAME_PAYLOAD_OFFSET = FRAME_LENGTH_OFFSET + 2
+
+_HEADER_0, _HEADER_1, _HEADER_2 = FRAME_HEADER
+
+
+def frame_payload(frame: memoryview) -> memoryview:
+    """Return the payload slice of a complete frame."""
+    return frame[FRAME_PAYLOAD_OFFSET:-1]
+
+
+def build_frame(flags: int, opcode: int, payload: bytes = b"") -> bytes:
+    """Encode one frame around ``payload``."""
+    return b"".join((
+        FRAME_HEADER,
+        bytes((flags & 0xFF, opcode & 0xFF)),
+        len(payload).to_bytes(2, "big"),
+        payload,
+        bytes((FRAME_TRAILER,)),
+    ))
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Decoder
+# ─────────────────────────────────────────────────────────────────────────────
+class FrameDecoder:
+    """Incremental decoder over a fixed-size receive buffer.
+
+    The buffer is used as a sliding window: bytes are appended at the write
+    position and consumed from the read position. Once the unread region
+    reaches the end of the buffer it is moved back to the start, so a frame
+    is always contiguous and can be returned as a single ``memoryview``.
+
+    Frames yielded by ``frames()`` point into the shared buffer and are only
+    valid until the next call to ``recv_buffer()``/``feed()``. Call
+    ``bytes(frame)`` to keep one around.
+    """
+
+    def __init__(self, size: int = FRAME_BUFFER_SIZE):
+        self._buf = bytearray(size)
+        self._view = memoryview(self._buf)
+        self._start = 0
+        self._end = 0
+        self.dropped_bytes = 0
+
+    @property
+    def buffered(self) -> int:
+        """Number of bytes received but not yet consumed."""
+        return self._end - self._start
+
+    def pending(self) -> bytes:
+        """Return a copy of the bytes received but not yet consumed."""
+        return bytes(self._view[self._start:self._end])
+
+    def reset(self) -> None:
+        """Discard any partially received data."""
+        self._start = 0
+        self._end = 0
+
+    def recv_buffer(self) -> memoryview:
+        """Return the writable tail of the buffer for ``recv_into``.
+
+        Compacts pending bytes to the front first, so the returned view is as
+        large as possible. If the buffer is full of undecodable data, it is
+        dropped rather than growing the buffer.
+        """
+        if self._start:
+            pending = self._end - self._start
+            if pending:
+                self._buf[:pending] = self._view[self._start:self._end]
+            self._start = 0
+            self._end = pending
+
+        if self._end == len(self._buf):
+            self.dropped_bytes += self._end
+            self._end = 0
+
+        return self._view[self._end:]
+
+    def commit(self, count: int) -> None:
+        """Mark ``count`` bytes written into ``recv_buffer()`` as received."""
+        self._end += count
+
+    def feed(self, data: bytes) -> None:
+        """Copy ``data`` into the buffer (for sources without ``recv_into``)."""
+        offset = 0
+        remaining = len(data)
+        while remaining:
+            target = self.recv_buffer()
+            chunk = min(remaining, len(target))
+            target[:chunk] = data[offset:offset + chunk]
+            self.commit(chunk)
+            offset += chunk
+            remaining -= chunk
+
+    def frames(self) -> Iterator[memoryview]:
+        """Yield every complete frame currently buffered."""
+        buf = self._buf
+        while True:
+            start = self._start
+            end = self._end
+            if end - start < FRAME_OVERHEAD:
+                return
+
+            if (
+                buf[start] != _HEADER_0
+                or buf[start + 1] != _HEADER_1
+                or buf[start + 2] != _HEADER_2
+            ):
+                self._resync()
+                continue
+
+            length_at = start + FRAME_LENGTH_OFFSET
+            frame_size = FRAME_OVERHEAD + ((buf[length_at] << 8) | buf[length_at + 1])
+            if frame_size > len(buf):
+                # Impossible length, the header was a false match.
+                self._skip(1)
+                continue
+            if end - start < frame_size:
+                return
+
+            if buf[start + frame_size - 1] != FRAME_TRAILER:
+                self._skip(1)
+                continue
+
+            self._start = start + frame_size
+            yield self._view[start:start + frame_size]
+
+    def _resync(self) -> None:
+        """Skip ahead to the next possible frame header."""
+        idx = self._buf.find(FRAME_HEADER, self._start + 1, self._end)
+        if idx == -1:
+            # Keep a possible partial header at the tail.
+            idx = max(self._start + 1, self._end - (len(FRAME_HEADER) - 1))
+        self._skip(idx - self._start)
+
+    def _skip(self, count: int) -> None:
+        self.dropped_bytes += count
+        self._start += count
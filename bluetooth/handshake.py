@@ -0,0 +1,150 @@
+"""Event-driven connection handshake."""
+
+import threading
+from enum import Enum
+from typing import Callable, Optional
+
+from .constants import HANDSHAKE_INIT_PACKETS, HANDSHAKE_STEP_TIMEOUT, FLAG_EXPECTS_REPLY
+from .framing import FRAME_FLAGS_OFFSET, FRAME_OPCODE_OFFSET
+from .protocol import BatteryStatus, Message, UnknownMessage
+
+
+class HandshakeState(Enum):
+    """Steps of the post-connect handshake."""
+    IDLE = "idle"
+    AWAIT_INIT_REPLY = "await_init_reply"
+    AWAIT_BATTERY = "await_battery"
+    DONE = "done"
+
+
+class ConnectionHandshake:
+    """Drives the init sequence forward as device replies arrive.
+
+    All init packets go out in a single write. If any of them expects a
+    reply, the handshake waits for replies to those opcodes before asking
+    for battery; otherwise it asks right away. Every wait is capped by
+    ``step_timeout``, after which the handshake moves on regardless; an
+    unanswered battery request is repeated once before giving up.
+
+    ``on_message`` is fed from the listener thread, so ``start`` never
+    blocks waiting for the device.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], None],
+        build_battery_request: Callable[[], bytes],
+        on_first_battery: Optional[Callable[[], None]] = None,
+        on_step_timeout: Optional[Callable[[HandshakeState], None]] = None,
+        on_send_error: Optional[Callable[[Exception], None]] = None,
+        init_packets: tuple[str, ...] = HANDSHAKE_INIT_PACKETS,
+        step_timeout: float = HANDSHAKE_STEP_TIMEOUT
+    ):
+        self._send = send
+        self._build_battery_request = build_battery_request
+        self._on_first_battery = on_first_battery
+        self._on_step_timeout = on_step_timeout
+        self._on_send_error = on_send_error
+        self._init_batch = b"".join(bytes.fromhex(packet) for packet in init_packets)
+        self._reply_opcodes = frozenset(
+            packet[FRAME_OPCODE_OFFSET]
+            for packet in map(bytes.fromhex, init_packets)
+            if packet[FRAME_FLAGS_OFFSET] & FLAG_EXPECTS_REPLY
+        )
+        self._step_timeout = step_timeout
+        self._lock = threading.Lock()
+        self._state = HandshakeState.IDLE
+        self._awaiting: set[int] = set()
+        self._battery_retried = False
+        self._timer: Optional[threading.Timer] = None
+        self._generation = 0
+
+    @property
+    def state(self) -> HandshakeState:
+        """Current handshake step."""
+        return self._state
+
+    def start(self) -> None:
+        """Begin the handshake on a freshly connected link."""
+        with self._lock:
+            self._generation += 1
+            self._awaiting = set(self._reply_opcodes)
+            self._battery_retried = False
+            if self._awaiting:
+                self._enter(HandshakeState.AWAIT_INIT_REPLY)
+            else:
+                self._enter(HandshakeState.AWAIT_BATTERY)
+            state = self._state
+
+        batch = self._init_batch
+        if state is HandshakeState.AWAIT_BATTERY:
+            batch += self._build_battery_request()
+        self._write(batch)
+
+    def cancel(self) -> None:
+        """Abandon the handshake, e.g. after the link dropped."""
+        with self._lock:
+            self._generation += 1
+            self._enter(HandshakeState.IDLE)
+
+    def on_message(self, message: Message) -> None:
+        """Advance the handshake with a decoded incoming message."""
+        state = self._state
+        if state is HandshakeState.AWAIT_INIT_REPLY and isinstance(message, UnknownMessage):
+            with self._lock:
+                if self._state is not HandshakeState.AWAIT_INIT_REPLY:
+                    return
+                self._awaiting.discard(message.opcode)
+                if self._awaiting:
+                    return
+                self._enter(HandshakeState.AWAIT_BATTERY)
+            self._write(self._build_battery_request())
+
+        elif state is HandshakeState.AWAIT_BATTERY and isinstance(message, BatteryStatus):
+            with self._lock:
+                if self._state is not HandshakeState.AWAIT_BATTERY:
+                    return
+                self._enter(HandshakeState.DONE)
+            if self._on_first_battery:
+                self._on_first_battery()
+
+    def _enter(self, state: HandshakeState) -> None:
+        """Switch state and re-arm the step timer (lock held)."""
+        self._state = state
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        if state in (HandshakeState.AWAIT_INIT_REPLY, HandshakeState.AWAIT_BATTERY):
+            self._timer = threading.Timer(
+                self._step_timeout, self._on_timeout, args=(self._generation, state)
+            )
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _on_timeout(self, generation: int, state: HandshakeState) -> None:
+        with self._lock:
+            if generation != self._generation or self._state is not state:
+                return
+            if state is HandshakeState.AWAIT_INIT_REPLY:
+                self._enter(HandshakeState.AWAIT_BATTERY)
+                resend = True
+            elif not self._battery_retried:
+                self._battery_retried = True
+                self._enter(HandshakeState.AWAIT_BATTERY)
+                resend = True
+            else:
+                self._enter(HandshakeState.DONE)
+                resend = False
+
+        if self._on_step_timeout:
+            self._on_step_timeout(state)
+        if resend:
+            self._write(self._build_battery_request())
+
+    def _write(self, data: bytes) -> None:
+        try:
+            self._send(data)
+        except Exception as e:
+            self.cancel()
+            if self._on_send_error:
+                self._on_send_error(e)
@@ -0,0 +1,144 @@
+"""Native Linux HCI queries for active Bluetooth connections.
+
+Reads the kernel's connection list through ``HCIGETDEVLIST`` and
+``HCIGETCONNLIST`` ioctls on a raw HCI socket, which is what ``hcitool con``
+does, without spawning any process.
+"""
+
+import socket
+import struct
+from dataclasses import dataclass
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Kernel Constants (include/net/bluetooth/hci.h, hci_sock.h)
+# ─────────────────────────────────────────────────────────────────────────────
+BTPROTO_HCI = 1
+HCIGETDEVLIST = 0x800448D2  # _IOR('H', 210, int)
+HCIGETCONNLIST = 0x800448D4  # _IOR('H', 212, int)
+HCI_MAX_DEV = 16
+HCI_MAX_CONN = 16
+
+SCO_LINK = 0x00
+ACL_LINK = 0x01
+ESCO_LINK = 0x02
+LE_LINK = 0x80
+
+# struct hci_dev_list_req { __u16 dev_num; struct hci_dev_req dev_req[]; }
+# struct hci_dev_req { __u16 dev_id; __u32 dev_opt; }
+_DEV_LIST_HEADER = struct.Struct("=H2x")
+_DEV_REQ = struct.Struct("=H2xI")
+
+# struct hci_conn_list_req { __u16 dev_id; __u16 conn_num; struct hci_conn_info conn_info[]; }
+# struct hci_conn_info { __u16 handle; bdaddr_t bdaddr; __u8 type; __u8 out; __u16 state; __u32 link_mode; }
+_CONN_LIST_HEADER = struct.Struct("=HH")
+_CONN_INFO = struct.Struct("=H6sBBHI")
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Data Classes
+# ─────────────────────────────────────────────────────────────────────────────
+@dataclass(slots=True)
+class HciConnection:
+    """One active baseband connection."""
+    dev_id: int
+    address: str
+    handle: int
+    link_type: int
+    outgoing: bool
+    state: int
+    link_mode: int
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Encoding / Decoding
+# ─────────────────────────────────────────────────────────────────────────────
+def format_bdaddr(raw: bytes) -> str:
+    """Format a little-endian ``bdaddr_t`` as XX:XX:XX:XX:XX:XX."""
+    return ":".join(f"{b:02X}" for b in reversed(raw))
+
+
+def build_dev_list_request(max_dev: int = HCI_MAX_DEV) -> bytearray:
+    """Build the buffer passed to ``HCIGETDEVLIST``."""
+    buf = bytearray(_DEV_LIST_HEADER.size + max_dev * _DEV_REQ.size)
+    _DEV_LIST_HEADER.pack_into(buf, 0, max_dev)
+    return buf
+
+
+def parse_dev_list(buf: bytes) -> list[int]:
+    """Return adapter ids from a filled ``HCIGETDEVLIST`` buffer."""
+    (count,) = _DEV_LIST_HEADER.unpack_from(buf, 0)
+    capacity = (len(buf) - _DEV_LIST_HEADER.size) // _DEV_REQ.size
+    return [
+        _DEV_REQ.unpack_from(buf, _DEV_LIST_HEADER.size + i * _DEV_REQ.size)[0]
+        for i in range(min(count, capacity))
+    ]
+
+
+def build_conn_list_request(dev_id: int, max_conn: int = HCI_MAX_CONN) -> bytearray:
+    """Build the buffer passed to ``HCIGETCONNLIST``."""
+    buf = bytearray(_CONN_LIST_HEADER.size + max_conn * _CONN_INFO.size)
+    _CONN_LIST_HEADER.pack_into(buf, 0, dev_id, max_conn)
+    return buf
+
+
+def parse_conn_list(buf: bytes) -> list[HciConnection]:
+    """Return connections from a filled ``HCIGETCONNLIST`` buffer."""
+    dev_id, count = _CONN_LIST_HEADER.unpack_from(buf, 0)
+    capacity = (len(buf) - _CONN_LIST_HEADER.size) // _CONN_INFO.size
+    connections = []
+    for i in range(min(count, capacity)):
+        handle, bdaddr, link_type, out, state, link_mode = _CONN_INFO.unpack_from(
+            buf, _CONN_LIST_HEADER.size + i * _CONN_INFO.size
+        )
+        connections.append(HciConnection(
+            dev_id=dev_id,
+            address=format_bdaddr(bdaddr),
+            handle=handle,
+            link_type=link_type,
+            outgoing=bool(out),
+            state=state,
+            link_mode=link_mode,
+        ))
+    return connections
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Queries
+# ─────────────────────────────────────────────────────────────────────────────
+def is_supported() -> bool:
+    """Check if HCI ioctls can be attempted on this platform."""
+    return fcntl is not None and hasattr(socket, "AF_BLUETOOTH")
+
+
+def get_connections(link_type: int = ACL_LINK) -> list[HciConnection]:
+    """Return active connections of ``link_type`` on every adapter.
+
+    Raises:
+        OSError: If the HCI socket or ioctls are unavailable
+    """
+    if not is_supported():
+        raise OSError("HCI sockets are not supported on this platform")
+
+    with socket.socket(socket.AF_BLUETOOTH, socket.SOCK_RAW, BTPROTO_HCI) as sock:
+        fd = sock.fileno()
+        dev_list = build_dev_list_request()
+        fcntl.ioctl(fd, HCIGETDEVLIST, dev_list, True)
+
+        connections = []
+        for dev_id in parse_dev_list(dev_list):
+            conn_list = build_conn_list_request(dev_id)
+            try:
+                fcntl.ioctl(fd, HCIGETCONNLIST, conn_list, True)
+            except OSError:
+                # Adapter is down or went away between the two calls.
+                continue
+            connections.extend(
+                conn for conn in parse_conn_list(conn_list) if conn.link_type == link_type
+            )
+        return connections
@@ -0,0 +1,299 @@
+"""Multi-device manager driving many links on one event loop."""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .async_connection import AsyncBluetoothConnection
+from .async_controller import AsyncBTController
+from .backoff import Backoff
+from .metrics import DeviceMetrics
+from .protocol import BatteryStatus, Message, UnknownMessage
+
+
+logger = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Type Aliases
+# ─────────────────────────────────────────────────────────────────────────────
+MessageCallback = Callable[[str, Message], None]
+BatteryCallback = Callable[[str, BatteryStatus], None]
+DeviceEventCallback = Callable[[str, str], None]
+
+
+@dataclass
+class ManagedDevice:
+    """One device owned by the manager, with its own state and callbacks."""
+    address: str
+    adapter: Optional[str]
+    controller: AsyncBTController
+    on_message: Optional[MessageCallback] = None
+    on_battery: Optional[BatteryCallback] = None
+    on_event: Optional[DeviceEventCallback] = None
+    auto_reconnect: bool = True
+    metrics: DeviceMetrics = field(default_factory=DeviceMetrics)
+    backoff: Backoff = field(default_factory=Backoff)
+    last_battery: Optional[BatteryStatus] = None
+    task: Optional[asyncio.Task] = field(default=None, repr=False)
+
+    @property
+    def connected(self) -> bool:
+        """Check if the device link is up."""
+        return self.controller.connected
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Manager
+# ─────────────────────────────────────────────────────────────────────────────
+class DeviceManager:
+    """Owns any number of device connections on a single event loop.
+
+    Every device gets its own ``AsyncBTController`` (protocol state and frame
+    decoder), callbacks, backoff and metrics, but all sockets are multiplexed
+    on one loop, so the thread count does not grow with the device count.
+    Devices on different HCI adapters are told apart by the local
+    ``adapter`` address their socket binds to.
+
+    Public methods are thread-safe; callbacks run on the loop thread.
+
+    Usage::
+
+        manager = DeviceManager()
+        manager.start()
+        manager.add_device("AA:BB:CC:DD:EE:FF", on_battery=print)
+        manager.send_command("AA:BB:CC:DD:EE:FF", "low").result()
+    """
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop] = None):
+        self._loop = loop
+        self._owns_loop = loop is None
+        self._thread: Optional[threading.Thread] = None
+        self._devices: dict[str, ManagedDevice] = {}
+        self._lock = threading.Lock()
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Lifecycle
+    # ─────────────────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        """Start the loop thread, unless an external loop was given."""
+        if not self._owns_loop or self._thread:
+            return
+        self._loop = asyncio.new_event_loop()
+        ready = threading.Event()
+
+        def run() -> None:
+            asyncio.set_event_loop(self._loop)
+            self._loop.call_soon(ready.set)
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="bt-manager", daemon=True)
+        self._thread.start()
+        ready.wait()
+
+    def stop(self) -> None:
+        """Disconnect every device and stop the loop thread."""
+        if not self._loop:
+            return
+        with self._lock:
+            devices = list(self._devices.values())
+            self._devices.clear()
+
+        future = asyncio.run_coroutine_threadsafe(self._shutdown(devices), self._loop)
+        if not self._owns_loop:
+            return
+        future.result()
+        if self._thread:
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+            self._thread = None
+            self._loop.close()
+            self._loop = None
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Devices
+    # ─────────────────────────────────────────────────────────────────────────
+    def add_device(
+        self,
+        address: str,
+        adapter: Optional[str] = None,
+        on_message: Optional[MessageCallback] = None,
+        on_battery: Optional[BatteryCallback] = None,
+        on_event: Optional[DeviceEventCallback] = None,
+        connection: Optional[AsyncBluetoothConnection] = None,
+        auto_reconnect: bool = True
+    ) -> ManagedDevice:
+        """Start managing a device.
+
+        Args:
+            address: Bluetooth MAC address of the device
+            adapter: Local adapter address to connect from
+            on_message: Called with (address, message) for every message
+            on_battery: Called with (address, status) for battery updates
+            on_event: Called with (address, event) for "connected",
+                "disconnected" and "connect_failed"
+            connection: Pre-built connection, e.g. one attached to a
+                simulator socket
+            auto_reconnect: Reconnect with backoff after the link drops
+
+        Raises:
+            RuntimeError: If the manager is not running
+            ValueError: If the device is already managed
+        """
+        if not self._loop:
+            raise RuntimeError("DeviceManager is not running")
+
+        controller = AsyncBTController(
+            bd_addr=address,
+            connection=connection or AsyncBluetoothConnection(adapter)
+        )
+        device = ManagedDevice(
+            address=address,
+            adapter=adapter,
+            controller=controller,
+            on_message=on_message,
+            on_battery=on_battery,
+            on_event=on_event,
+            auto_reconnect=auto_reconnect,
+        )
+        with self._lock:
+            if address in self._devices:
+                raise ValueError(f"Device {address} is already managed")
+            self._devices[address] = device
+
+        self._call_soon(self._start_device, device)
+        return device
+
+    def remove_device(self, address: str) -> bool:
+        """Stop managing a device and close its link.
+
+        Returns:
+            True if the device was managed
+        """
+        with self._lock:
+            device = self._devices.pop(address, None)
+        if not device:
+            return False
+        self._call_soon(self._stop_device, device)
+        return True
+
+    def devices(self) -> list[ManagedDevice]:
+        """Return the managed devices."""
+        with self._lock:
+            return list(self._devices.values())
+
+    def get_device(self, address: str) -> Optional[ManagedDevice]:
+        """Return the managed device for ``address``, if any."""
+        with self._lock:
+            return self._devices.get(address)
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Commands
+    # ─────────────────────────────────────────────────────────────────────────
+    def send_command(self, address: str, mode: str = "low") -> Future:
+        """Send a latency mode command to one device and wait for its ack.
+
+        Returns:
+            Future resolving to a (success, message) tuple; success means
+            the device acknowledged the command
+        """
+        return self._submit(address, lambda controller: controller.send_command(mode))
+
+    def request_battery(self, address: str) -> Future:
+        """Request battery status from one device.
+
+        Returns:
+            Future resolving to a (success, message) tuple
+        """
+        return self._submit(address, lambda controller: controller.request_battery())
+
+    def broadcast_command(self, mode: str = "low") -> dict[str, Future]:
+        """Send a latency mode command to every managed device."""
+        return {
+            device.address: self.send_command(device.address, mode)
+            for device in self.devices()
+        }
+
+    def _submit(self, address: str, send) -> Future:
+        device = self.get_device(address)
+        if not device or not self._loop:
+            future: Future = Future()
+            future.set_result((False, f"Device {address} is not managed."))
+            return future
+        return asyncio.run_coroutine_threadsafe(self._send(device, send), self._loop)
+
+    async def _send(self, device: ManagedDevice, send) -> tuple[bool, str]:
+        # Reconnecting is the device task's job; never connect inline here.
+        if not device.controller.connected:
+            return False, "Device not connected."
+        success, message = await send(device.controller)
+        if success:
+            device.metrics.commands_sent += 1
+        else:
+            device.metrics.send_errors += 1
+        return success, message
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Device Tasks (loop thread)
+    # ─────────────────────────────────────────────────────────────────────────
+    def _call_soon(self, callback, *args) -> None:
+        self._loop.call_soon_threadsafe(callback, *args)
+
+    def _start_device(self, device: ManagedDevice) -> None:
+        device.task = self._loop.create_task(self._run_device(device))
+
+    def _stop_device(self, device: ManagedDevice) -> None:
+        device.controller.stop()
+        if device.task:
+            device.task.cancel()
+
+    async def _shutdown(self, devices: list[ManagedDevice]) -> None:
+        for device in devices:
+            self._stop_device(device)
+        tasks = [device.task for device in devices if device.task]
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run_device(self, device: ManagedDevice) -> None:
+        controller = device.controller
+        while True:
+            if await controller.connect():
+                device.metrics.connects += 1
+                device.backoff.reset()
+                self._emit_event(device, "connected")
+                await self._read_messages(device)
+                device.metrics.disconnects += 1
+                self._emit_event(device, "disconnected")
+            else:
+                device.metrics.connect_failures += 1
+                self._emit_event(device, "connect_failed")
+
+            if not device.auto_reconnect:
+                return
+            await asyncio.sleep(device.backoff.next_delay())
+
+    async def _read_messages(self, device: ManagedDevice) -> None:
+        async for message in device.controller:
+            device.metrics.messages += 1
+            device.metrics.last_message_at = time.monotonic()
+            if isinstance(message, UnknownMessage):
+                device.metrics.unknown_messages += 1
+            elif isinstance(message, BatteryStatus):
+                device.last_battery = message
+                self._invoke(device.on_battery, device.address, message)
+            self._invoke(device.on_message, device.address, message)
+
+    def _emit_event(self, device: ManagedDevice, event: str) -> None:
+        self._invoke(device.on_event, device.address, event)
+
+    @staticmethod
+    def _invoke(callback, *args) -> None:
+        if not callback:
+            return
+        try:
+            callback(*args)
+        except Exception:
+            logger.exception("Device callback failed")
@@ -0,0 +1,30 @@
+"""Connection metrics collected by the controller."""
+
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(slots=True)
+class ConnectionMetrics:
+    """Timings and counters for the current controller session.
+
+    Durations are in seconds; ``None`` means not measured yet.
+    """
+    connect_started_at: Optional[float] = None
+    cold_start_to_connected: Optional[float] = None
+    connect_to_first_battery: Optional[float] = None
+    handshake_step_timeouts: int = 0
+    reconnects_joined: int = 0
+
+
+@dataclass(slots=True)
+class DeviceMetrics:
+    """Counters for one device driven by the ``DeviceManager``."""
+    connects: int = 0
+    connect_failures: int = 0
+    disconnects: int = 0
+    messages: int = 0
+    unknown_messages: int = 0
+    commands_sent: int = 0
+    send_errors: int = 0
+    last_message_at: Optional[float] = None
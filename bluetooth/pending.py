@@ -0,0 +1,188 @@
+"""Request/acknowledgment correlation for outgoing commands."""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from typing import Callable, Dict, Mapping, Optional
+
+from .constants import ACK_TIMEOUT, ACK_MAX_RETRIES
+
+
+# Sequence numbers remembered to recognise acks of retransmissions.
+RECENT_ACKS = 16
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Results
+# ─────────────────────────────────────────────────────────────────────────────
+@dataclass(slots=True)
+class CommandResult:
+    """Outcome of an acknowledged command."""
+    seq: int
+    rtt: float
+    attempts: int
+
+
+class AckTimeoutError(TimeoutError):
+    """Raised when a command is not acknowledged after all retries."""
+
+
+@dataclass(slots=True)
+class _PendingRequest:
+    payload: bytes
+    future: Future
+    sent_at: float
+    attempts: int
+    timer: Optional[threading.Timer] = None
+
+
+def match_ack(pending: Mapping[int, object], acked: deque, seq: Optional[int]) -> Optional[int]:
+    """Pick the pending sequence number an ack carrying ``seq`` completes.
+
+    An ack whose ``seq`` matches nothing pending completes the oldest
+    request instead, since the device answers commands in order and the
+    ack layout is unconfirmed (see ``ModeAck``). A repeated ack for a
+    request that already matched exactly, e.g. of a retransmission, matches
+    nothing. Exact matches are recorded in ``acked``.
+
+    Args:
+        pending: Outstanding requests by sequence number, oldest first
+        acked: Recently matched sequence numbers, bounded by the caller
+        seq: Sequence number read from the ack
+
+    Returns:
+        Sequence number of the request to complete, or None
+    """
+    if seq in pending:
+        acked.append(seq)
+        return seq
+    if pending and seq not in acked:
+        return next(iter(pending))
+    return None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Pending Table
+# ─────────────────────────────────────────────────────────────────────────────
+class PendingRequests:
+    """Tracks commands awaiting an ack, keyed by sequence number.
+
+    Several commands can be in flight at once. Each gets a Future that
+    resolves with a ``CommandResult`` when the matching ack arrives, or fails
+    with ``AckTimeoutError`` once ``max_retries`` retransmissions have gone
+    unanswered.
+    """
+
+    def __init__(
+        self,
+        send: Callable[[bytes], None],
+        ack_timeout: float = ACK_TIMEOUT,
+        max_retries: int = ACK_MAX_RETRIES
+    ):
+        self._send = send
+        self._lock = threading.Lock()
+        self._pending: Dict[int, _PendingRequest] = {}
+        self._acked: deque[int] = deque(maxlen=RECENT_ACKS)
+        self.ack_timeout = ack_timeout
+        self.max_retries = max_retries
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def submit(self, seq: int, payload: bytes) -> Future:
+        """Send ``payload`` and return a Future for its ack.
+
+        Raises:
+            Exception: If the initial send fails (nothing is left pending)
+        """
+        future: Future = Future()
+        request = _PendingRequest(payload, future, time.monotonic(), 1)
+        with self._lock:
+            previous = self._pending.pop(seq, None)
+            self._pending[seq] = request
+        if previous:
+            self._cancel_timer(previous)
+            previous.future.set_exception(
+                AckTimeoutError(f"Sequence {seq:#04x} reused before ack")
+            )
+
+        try:
+            self._send(payload)
+        except Exception:
+            with self._lock:
+                self._pending.pop(seq, None)
+            raise
+
+        self._arm_timer(seq, request)
+        return future
+
+    def resolve(self, seq: Optional[int]) -> Optional[int]:
+        """Complete the request acknowledged by ``seq`` (see ``match_ack``).
+
+        Returns:
+            Sequence number of the completed request, or None
+        """
+        with self._lock:
+            seq = match_ack(self._pending, self._acked, seq)
+            if seq is None:
+                return None
+            request = self._pending.pop(seq)
+
+        self._cancel_timer(request)
+        rtt = time.monotonic() - request.sent_at
+        request.future.set_result(CommandResult(seq, rtt, request.attempts))
+        return seq
+
+    def fail_all(self, exc: BaseException) -> None:
+        """Fail every pending request, e.g. after the link dropped."""
+        with self._lock:
+            requests = list(self._pending.values())
+            self._pending.clear()
+        for request in requests:
+            self._cancel_timer(request)
+            if not request.future.done():
+                request.future.set_exception(exc)
+
+    def _arm_timer(self, seq: int, request: _PendingRequest) -> None:
+        timer = threading.Timer(self.ack_timeout, self._on_timeout, args=(seq, request))
+        timer.daemon = True
+        request.timer = timer
+        timer.start()
+
+    @staticmethod
+    def _cancel_timer(request: _PendingRequest) -> None:
+        if request.timer:
+            request.timer.cancel()
+
+    def _on_timeout(self, seq: int, request: _PendingRequest) -> None:
+        with self._lock:
+            if self._pending.get(seq) is not request:
+                return
+            if request.attempts > self.max_retries:
+                del self._pending[seq]
+                give_up = True
+            else:
+                request.attempts += 1
+                request.sent_at = time.monotonic()
+                give_up = False
+
+        if give_up:
+            request.future.set_exception(AckTimeoutError(
+                f"No ack for sequence {seq:#04x} after {request.attempts} attempts"
+            ))
+            return
+
+        try:
+            self._send(request.payload)
+        except Exception as e:
+            with self._lock:
+                owned = self._pending.get(seq) is request
+                if owned:
+                    del self._pending[seq]
+            if owned:
+                request.future.set_exception(e)
+            return
+        self._arm_timer(seq, request)
@@ -0,0 +1,145 @@
+"""Concurrent RFCOMM probing of candidate devices."""
+
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from .connection import BluetoothConnection
+from .constants import HANDSHAKE_INIT_PACKETS, PROBE_MAX_WORKERS, PROBE_TIMEOUT
+from .discovery import BluetoothDevice
+from .framing import FrameDecoder
+from .protocol import BudsProtocol, BatteryStatus
+
+
+@dataclass(slots=True)
+class ProbeResult:
+    """A candidate that answered the protocol handshake."""
+    device: BluetoothDevice
+    connection: BluetoothConnection
+    battery: BatteryStatus
+    elapsed: float
+    leftover: bytes = b""
+
+
+class CandidateProber:
+    """Tries several candidate addresses at once and keeps the first that
+    answers a battery request.
+
+    Each probe opens its own RFCOMM socket, sends the init packets plus a
+    battery request and waits for a battery response. As soon as one probe
+    succeeds the others are cancelled by closing their sockets.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = PROBE_MAX_WORKERS,
+        timeout: float = PROBE_TIMEOUT,
+        connection_factory: Callable[[], BluetoothConnection] = BluetoothConnection
+    ):
+        self._max_workers = max(1, max_workers)
+        self._timeout = timeout
+        self._connection_factory = connection_factory
+        self._protocol = BudsProtocol()
+        self._hello = b"".join(bytes.fromhex(packet) for packet in HANDSHAKE_INIT_PACKETS)
+        self._hello += self._protocol.build_battery_request()
+
+    def probe(self, candidates: list[BluetoothDevice]) -> Optional[ProbeResult]:
+        """Probe ``candidates`` concurrently.
+
+        Returns:
+            The first successful probe, with its connection left open, or
+            None if no candidate answered within the timeout
+        """
+        if not candidates:
+            return None
+
+        cancel = threading.Event()
+        lock = threading.Lock()
+        open_connections: set[BluetoothConnection] = set()
+        winner: Optional[ProbeResult] = None
+
+        def run(device: BluetoothDevice) -> Optional[ProbeResult]:
+            connection = self._connection_factory()
+            with lock:
+                if cancel.is_set():
+                    return None
+                open_connections.add(connection)
+            try:
+                result = self._probe_one(device, connection, cancel)
+            finally:
+                with lock:
+                    open_connections.discard(connection)
+            if result is None:
+                connection.disconnect()
+            return result
+
+        executor = ThreadPoolExecutor(
+            max_workers=min(self._max_workers, len(candidates)),
+            thread_name_prefix="bt-probe"
+        )
+        try:
+            futures = [executor.submit(run, device) for device in candidates]
+            for future in as_completed(futures):
+                result = future.result()
+                if result is not None:
+                    winner = result
+                    break
+        finally:
+            with lock:
+                cancel.set()
+                losers = list(open_connections)
+            for connection in losers:
+                connection.disconnect()
+            executor.shutdown(wait=False, cancel_futures=True)
+
+        # Probes that finished successfully after the winner keep nothing open.
+        for future in futures:
+            future.add_done_callback(lambda f: _close_loser(f, winner))
+        return winner
+
+    def _probe_one(
+        self,
+        device: BluetoothDevice,
+        connection: BluetoothConnection,
+        cancel: threading.Event
+    ) -> Optional[ProbeResult]:
+        started_at = time.monotonic()
+        deadline = started_at + self._timeout
+        decoder = FrameDecoder()
+        try:
+            connection.connect(device.address, device.channel)
+            if cancel.is_set():
+                return None
+            connection.send(self._hello)
+
+            while not cancel.is_set() and time.monotonic() < deadline:
+                try:
+                    received = connection.receive_into(decoder.recv_buffer())
+                except socket.timeout:
+                    continue
+                if not received:
+                    return None
+                decoder.commit(received)
+                for frame in decoder.frames():
+                    message = self._protocol.decode(frame)
+                    if isinstance(message, BatteryStatus):
+                        # Whatever arrived behind the battery reply belongs
+                        # to the adopted connection's decoder.
+                        return ProbeResult(
+                            device, connection, message, time.monotonic() - started_at,
+                            decoder.pending()
+                        )
+        except Exception:
+            return None
+        return None
+
+
+def _close_loser(future, winner: Optional[ProbeResult]) -> None:
+    if future.cancelled():
+        return
+    result = future.result()
+    if result is not None and result is not winner:
+        result.connection.disconnect()
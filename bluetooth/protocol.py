@@ -1,26 +1,159 @@
 """Protocol handling for Mi Buds communication."""
 
+import struct
+import threading
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Dict, Optional, Union
 
 from .constants import (
     BATTERY_PATTERN,
     BATTERY_REQUEST_PAYLOAD,
+    BATTERY_UNKNOWN,
+    BATTERY_CHARGING_BIT,
     MODE_COMMAND_TEMPLATE,
     COUNTER_VALUE,
-    PACKET_SIZE_MODE_ACK
+    MODE_ACK_OK,
+    OPCODE_DEVICE_INFO,
+    OPCODE_MODE,
 )
+from .framing import FRAME_FLAGS_OFFSET, FRAME_OPCODE_OFFSET, frame_payload
+
+
+Frame = Union[bytes, memoryview]
 
 
 # ─────────────────────────────────────────────────────────────────────────────
-# Data Classes
+# Messages
 # ─────────────────────────────────────────────────────────────────────────────
-@dataclass
+@dataclass(slots=True)
 class BatteryStatus:
-    """Battery levels for all components."""
+    """Battery levels for all components, with the charging bit split off."""
     left: int
     right: int
     case: int
+    left_charging: bool = False
+    right_charging: bool = False
+    case_charging: bool = False
+
+    @classmethod
+    def from_raw(cls, left: int, right: int, case: int) -> "BatteryStatus":
+        """Build from raw device bytes (bit 7 = charging, 0xFF = unknown)."""
+        left_level, left_charging = _split_battery(left)
+        right_level, right_charging = _split_battery(right)
+        case_level, case_charging = _split_battery(case)
+        return cls(
+            left=left_level,
+            right=right_level,
+            case=case_level,
+            left_charging=left_charging,
+            right_charging=right_charging,
+            case_charging=case_charging,
+        )
+
+
+@dataclass(slots=True)
+class ModeAck:
+    """Acknowledgment of a latency mode command.
+
+    Only the ack's size is known for certain. Reading ``seq`` and ``status``
+    from the first two payload bytes is an assumption, so receivers fall
+    back to the oldest outstanding command when ``seq`` does not correlate.
+    ``seq`` is None if the payload is too short to carry one.
+    """
+    seq: Optional[int]
+    status: int
+
+
+@dataclass(slots=True)
+class UnknownMessage:
+    """Frame whose opcode has no registered codec."""
+    flags: int
+    opcode: int
+    payload: bytes
+
+
+Message = Union[BatteryStatus, ModeAck, UnknownMessage]
+
+
+def _split_battery(raw: int) -> tuple[int, bool]:
+    if raw == BATTERY_UNKNOWN:
+        return BATTERY_UNKNOWN, False
+    return raw & ~BATTERY_CHARGING_BIT, bool(raw & BATTERY_CHARGING_BIT)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Codecs
+# ─────────────────────────────────────────────────────────────────────────────
+Decoder = Callable[[memoryview], Optional[Message]]
+
+_CODECS: Dict[int, Decoder] = {}
+
+
+def register_codec(opcode: int) -> Callable[[Decoder], Decoder]:
+    """Register a payload decoder for frames carrying ``opcode``.
+
+    The decoder receives the frame payload and returns a message, or None if
+    the payload is not one it understands.
+    """
+    def decorator(decoder: Decoder) -> Decoder:
+        _CODECS[opcode] = decoder
+        return decoder
+    return decorator
+
+
+_BATTERY_LAYOUT = struct.Struct(f">{len(BATTERY_PATTERN)}sBBB")
+_MODE_ACK_LAYOUT = struct.Struct(">BB")
+
+
+@register_codec(OPCODE_DEVICE_INFO)
+def _decode_device_info(payload: memoryview) -> Optional[BatteryStatus]:
+    idx = _find_battery_record(payload)
+    if idx == -1:
+        return None
+    _, left, right, case = _BATTERY_LAYOUT.unpack_from(payload, idx)
+    return BatteryStatus.from_raw(left, right, case)
+
+
+def _find_battery_record(payload: memoryview) -> int:
+    """Locate the battery record in a device info payload.
+
+    The record normally leads the payload and is read in place; otherwise
+    it sits among other device info records and the payload is searched
+    for its tag once.
+    """
+    if len(payload) < _BATTERY_LAYOUT.size:
+        return -1
+    if _BATTERY_LAYOUT.unpack_from(payload)[0] == BATTERY_PATTERN:
+        return 0
+    # The tag must leave room for the three battery bytes after it.
+    end = len(payload) - _BATTERY_LAYOUT.size + len(BATTERY_PATTERN)
+    return bytes(payload).find(BATTERY_PATTERN, 1, end)
+
+
+@register_codec(OPCODE_MODE)
+def _decode_mode_ack(payload: memoryview) -> Optional[ModeAck]:
+    if len(payload) < _MODE_ACK_LAYOUT.size:
+        return ModeAck(seq=None, status=MODE_ACK_OK)
+    seq, status = _MODE_ACK_LAYOUT.unpack_from(payload)
+    return ModeAck(seq=seq, status=status)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Sequence Counter
+# ─────────────────────────────────────────────────────────────────────────────
+class SequenceCounter:
+    """Thread-safe one-byte rolling sequence number."""
+
+    def __init__(self, start: int = COUNTER_VALUE):
+        self._lock = threading.Lock()
+        self._value = start & 0xFF
+
+    def next(self) -> int:
+        """Return the next sequence number, wrapping after 0xFF."""
+        with self._lock:
+            value = self._value
+            self._value = (value + 1) & 0xFF
+            return value
 
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -28,60 +161,51 @@ class BatteryStatus:
 # ─────────────────────────────────────────────────────────────────────────────
 class BudsProtocol:
     """Handles protocol encoding/decoding for Mi Buds."""
-    
+
     @staticmethod
-    def build_mode_command(mode: str) -> bytes:
+    def build_mode_command(mode: str, seq: int = COUNTER_VALUE) -> bytes:
         """Build latency mode command payload.
-        
+
         Args:
             mode: "low" for low latency, anything else for standard
-            
+            seq: Sequence number echoed back in the device's ack
+
         Returns:
             Bytes payload to send
         """
         param = "01" if mode == "low" else "00"
-        counter = hex(COUNTER_VALUE)[2:].zfill(2)
+        counter = f"{seq & 0xFF:02x}"
         payload = MODE_COMMAND_TEMPLATE.format(counter=counter, param=param)
         return bytes.fromhex(payload)
-    
+
     @staticmethod
     def build_battery_request() -> bytes:
         """Build battery status request payload."""
         return bytes.fromhex(BATTERY_REQUEST_PAYLOAD)
-    
+
     @staticmethod
-    def parse_battery(data: bytes) -> Optional[BatteryStatus]:
-        """Parse battery information from data packet.
-        
+    def decode(frame: Frame) -> Optional[Message]:
+        """Decode a complete frame into a typed message.
+
         Args:
-            data: Raw data received from device
-            
+            frame: One frame as produced by ``FrameDecoder``
+
         Returns:
-            BatteryStatus if found, None otherwise
+            Decoded message, UnknownMessage for unregistered opcodes, or
+            None if a registered codec rejected the payload
         """
-        try:
-            idx = data.find(BATTERY_PATTERN)
-            if idx == -1 or len(data) < idx + 7:
-                return None
-            
-            return BatteryStatus(
-                left=data[idx + 4],
-                right=data[idx + 5],
-                case=data[idx + 6]
+        if not isinstance(frame, memoryview):
+            frame = memoryview(frame)
+        opcode = frame[FRAME_OPCODE_OFFSET]
+        codec = _CODECS.get(opcode)
+        if codec is None:
+            return UnknownMessage(
+                flags=frame[FRAME_FLAGS_OFFSET],
+                opcode=opcode,
+                payload=frame_payload(frame).tobytes(),
             )
-        except Exception:
-            return None
-    
-    @staticmethod
-    def is_battery_packet(data: bytes) -> bool:
-        """Check if packet contains battery status pattern."""
-        return BATTERY_PATTERN in data
-    
-    @staticmethod
-    def is_mode_ack_packet(packet_size: int) -> bool:
-        """Check if packet size indicates a mode acknowledgment packet."""
-        return packet_size == PACKET_SIZE_MODE_ACK
-    
+        return codec(frame_payload(frame))
+
     @staticmethod
     def get_mode_name(mode: str) -> str:
         """Get human-readable mode name."""
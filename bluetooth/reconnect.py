@@ -0,0 +1,77 @@
+"""Single-flight coordination of reconnect attempts."""
+
+import threading
+from typing import Callable, Optional
+
+
+class _Flight:
+    """One in-progress reconnect shared by every caller that joins it."""
+
+    __slots__ = ("force_rediscovery", "result", "done")
+
+    def __init__(self, force_rediscovery: bool):
+        self.force_rediscovery = force_rediscovery
+        self.result = False
+        self.done = threading.Event()
+
+
+class ReconnectCoordinator:
+    """Ensures at most one reconnect attempt runs at a time.
+
+    A caller arriving while an attempt is running waits for it and gets its
+    result instead of tearing down the socket and starting over. A caller
+    asking for rediscovery upgrades the running attempt: if that attempt
+    fails without rediscovery, it is retried once with it.
+    """
+
+    def __init__(
+        self,
+        attempt: Callable[[bool], bool],
+        on_join: Optional[Callable[[], None]] = None
+    ):
+        self._attempt = attempt
+        self._on_join = on_join
+        self._lock = threading.Lock()
+        self._flight: Optional[_Flight] = None
+
+    @property
+    def in_progress(self) -> bool:
+        """Whether a reconnect attempt is currently running."""
+        return self._flight is not None
+
+    def run(self, force_rediscovery: bool = False) -> bool:
+        """Reconnect, or join the attempt already in progress.
+
+        Returns:
+            True if the shared attempt connected
+        """
+        with self._lock:
+            flight = self._flight
+            if flight:
+                if force_rediscovery:
+                    flight.force_rediscovery = True
+                leader = False
+            else:
+                flight = self._flight = _Flight(force_rediscovery)
+                leader = True
+
+        if not leader:
+            if self._on_join:
+                self._on_join()
+            flight.done.wait()
+            return flight.result
+
+        try:
+            while True:
+                with self._lock:
+                    force = flight.force_rediscovery
+                flight.result = self._attempt(force)
+                with self._lock:
+                    upgraded = flight.force_rediscovery and not force
+                if flight.result or not upgraded:
+                    break
+        finally:
+            with self._lock:
+                self._flight = None
+            flight.done.set()
+        return flight.result
@@ -0,0 +1,116 @@
+"""System suspend/resume detection."""
+
+import logging
+import threading
+import time
+from typing import Callable, Optional
+
+try:
+    from jeepney import MatchRule, message_bus
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:
+    MatchRule = None
+
+from .constants import RESUME_CHECK_INTERVAL, RESUME_DRIFT_THRESHOLD
+
+
+logger = logging.getLogger(__name__)
+
+
+ResumeCallback = Callable[[float], None]
+
+
+class ResumeDetector:
+    """Calls ``on_resume(slept_seconds)`` after the machine wakes from sleep.
+
+    ``CLOCK_MONOTONIC`` stops while suspended and ``CLOCK_BOOTTIME`` does
+    not, so a jump in their difference means the system slept. When the
+    optional ``jeepney`` package is installed, logind's ``PrepareForSleep``
+    signal is also watched, which reports resume without waiting for the
+    next clock check.
+    """
+
+    def __init__(
+        self,
+        on_resume: ResumeCallback,
+        check_interval: float = RESUME_CHECK_INTERVAL,
+        drift_threshold: float = RESUME_DRIFT_THRESHOLD,
+        use_logind: bool = True
+    ):
+        self._on_resume = on_resume
+        self._check_interval = check_interval
+        self._drift_threshold = drift_threshold
+        self._use_logind = use_logind
+        self._stop = threading.Event()
+        self._lock = threading.Lock()
+        self._drift = 0.0
+        self._started = False
+
+    @staticmethod
+    def is_supported() -> bool:
+        """Check if the boot-time clock is available on this platform."""
+        return hasattr(time, "CLOCK_BOOTTIME")
+
+    def start(self) -> None:
+        """Start watching; a no-op where unsupported or already started."""
+        if self._started or not self.is_supported():
+            return
+        self._started = True
+        self._stop.clear()
+        self._drift = self._read_drift()
+        threading.Thread(target=self._clock_loop, name="resume-clock", daemon=True).start()
+        if self._use_logind and MatchRule is not None:
+            threading.Thread(target=self._logind_loop, name="resume-logind", daemon=True).start()
+
+    def stop(self) -> None:
+        """Stop watching."""
+        self._started = False
+        self._stop.set()
+
+    @staticmethod
+    def _read_drift() -> float:
+        return time.clock_gettime(time.CLOCK_BOOTTIME) - time.clock_gettime(time.CLOCK_MONOTONIC)
+
+    def _check(self) -> None:
+        """Fire the callback if the clocks drifted since the last check."""
+        drift = self._read_drift()
+        with self._lock:
+            slept = drift - self._drift
+            self._drift = drift
+        if slept >= self._drift_threshold:
+            self._on_resume(slept)
+
+    def _clock_loop(self) -> None:
+        while not self._stop.wait(self._check_interval):
+            self._check()
+
+    def _logind_loop(self) -> None:
+        rule = MatchRule(
+            type="signal",
+            interface="org.freedesktop.login1.Manager",
+            member="PrepareForSleep",
+            path="/org/freedesktop/login1",
+        )
+        try:
+            conn = open_dbus_connection(bus="SYSTEM")
+        except Exception:
+            return
+
+        try:
+            conn.send_and_get_reply(message_bus.AddMatch(rule))
+            with conn.filter(rule) as queue:
+                while not self._stop.is_set():
+                    try:
+                        msg = conn.recv_until_filtered(queue, timeout=self._check_interval)
+                    except TimeoutError:
+                        continue
+                    going_to_sleep = bool(msg.body[0])
+                    if not going_to_sleep:
+                        # The clock check also sees this resume; _check
+                        # consumes the drift so it is reported once.
+                        self._check()
+        except Exception as e:
+            logger.warning("logind resume watch stopped: %s", e)
+        finally:
+            conn.close()
+
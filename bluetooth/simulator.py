@@ -0,0 +1,427 @@
+"""Local Mi Buds simulator for running the stack without hardware.
+
+``EarbudsSimulator`` speaks the RFCOMM protocol on ordinary stream sockets:
+one end of a ``socketpair`` or a Unix socket. ``SimulatedConnection`` is a
+drop-in ``BluetoothConnection`` that connects to it instead of a real
+device::
+
+    simulator = EarbudsSimulator(SimulatorConfig(latency=0.05))
+    controller = BTController(
+        bd_addr="00:00:00:00:00:01",
+        connection_factory=lambda: SimulatedConnection(simulator),
+    )
+
+Run ``python -m bluetooth.simulator --unix /tmp/buds.sock`` to serve other
+processes.
+"""
+
+import argparse
+import heapq
+import itertools
+import os
+import random
+import select
+import socket
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from .capture import CaptureRing, DIRECTION_RX, read_capture
+from .connection import BluetoothConnection
+from .constants import (
+    BATTERY_PATTERN,
+    FLAG_EXPECTS_REPLY,
+    MODE_ACK_OK,
+    MODE_ACK_PAYLOAD_SIZE,
+    OPCODE_DEVICE_INFO,
+    OPCODE_MODE,
+    RFCOMM_PORT,
+    SOCKET_TIMEOUT,
+)
+from .framing import FRAME_FLAGS_OFFSET, FRAME_OPCODE_OFFSET, FrameDecoder, build_frame, frame_payload
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Configuration
+# ─────────────────────────────────────────────────────────────────────────────
+RESPONSE_FLAGS = 0x04
+# (seconds since session start, device-to-host bytes)
+ReplayRecord = tuple[float, bytes]
+
+
+@dataclass(slots=True)
+class SimulatorConfig:
+    """Behaviour of a simulated device.
+
+    Battery values are raw device bytes: bit 7 means charging and 0xFF
+    means unknown. Mode acks echo the command's sequence number unless
+    ``ack_echoes_seq`` is False, which sends an all-zero ack of the same
+    size.
+    """
+    battery: tuple[int, int, int] = (80, 75, 0x80 | 50)
+    latency: float = 0.0
+    jitter: float = 0.0
+    split_size: int = 0
+    split_gap: float = 0.001
+    coalesce_window: float = 0.0
+    drop_rate: float = 0.0
+    disconnect_after: Optional[int] = None
+    push_interval: Optional[float] = None
+    respond: bool = True
+    ack_echoes_seq: bool = True
+    seed: Optional[int] = None
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Simulator
+# ─────────────────────────────────────────────────────────────────────────────
+class EarbudsSimulator:
+    """Simulated earbuds serving any number of client sockets.
+
+    Each client gets its own session thread. Responses go through a
+    per-session outbox so latency, splitting and coalescing apply to them,
+    and to unsolicited battery pushes, in the same way.
+
+    Args:
+        config: Device behaviour; defaults answer immediately
+        replay: Optional recorded device-to-host traffic, sent to every new
+            session at its original offsets
+    """
+
+    def __init__(
+        self,
+        config: Optional[SimulatorConfig] = None,
+        replay: Optional[Iterable[ReplayRecord]] = None
+    ):
+        self.config = config or SimulatorConfig()
+        self._replay = list(replay or ())
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._sessions: set[_Session] = set()
+        self._listener: Optional[socket.socket] = None
+        self._battery = self.config.battery
+        self.low_latency = False
+        self.requests = 0
+        self.dropped = 0
+        self.acks_sent = 0
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Serving
+    # ─────────────────────────────────────────────────────────────────────────
+    def socketpair(self) -> socket.socket:
+        """Serve one end of a new socketpair and return the other end."""
+        client, device = socket.socketpair()
+        self.serve(device)
+        return client
+
+    def serve(self, sock: socket.socket) -> None:
+        """Serve an already connected socket on a new session thread."""
+        session = _Session(self, sock)
+        with self._lock:
+            self._sessions.add(session)
+        session.start()
+
+    def serve_unix(self, path: str) -> None:
+        """Accept clients on a Unix socket at ``path`` in the background."""
+        if os.path.exists(path):
+            os.unlink(path)
+        listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        listener.bind(path)
+        listener.listen()
+        self._listener = listener
+        threading.Thread(target=self._accept_loop, args=(listener,), name="sim-accept", daemon=True).start()
+
+    def _accept_loop(self, listener: socket.socket) -> None:
+        while True:
+            try:
+                sock, _ = listener.accept()
+            except OSError:
+                return
+            self.serve(sock)
+
+    def stop(self) -> None:
+        """Close the listener and every session."""
+        listener, self._listener = self._listener, None
+        if listener:
+            listener.close()
+        self.disconnect()
+
+    # ─────────────────────────────────────────────────────────────────────────
+    # Fault Injection / State
+    # ─────────────────────────────────────────────────────────────────────────
+    def disconnect(self) -> None:
+        """Drop every connected client now."""
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.close()
+
+    def set_battery(self, left: int, right: int, case: int) -> None:
+        """Change the raw battery bytes reported from now on."""
+        self._battery = (left, right, case)
+
+    def push_battery(self) -> None:
+        """Send an unsolicited battery update to every client."""
+        with self._lock:
+            sessions = list(self._sessions)
+        for session in sessions:
+            session.queue(self.battery_frame())
+
+    def battery_frame(self) -> bytes:
+        """Encode the current battery levels as a device info frame."""
+        return build_frame(RESPONSE_FLAGS, OPCODE_DEVICE_INFO, BATTERY_PATTERN + bytes(self._battery))
+
+    def _delay(self) -> float:
+        config = self.config
+        if not config.jitter:
+            return config.latency
+        return max(0.0, config.latency + self._rng.uniform(-config.jitter, config.jitter))
+
+    def _should_drop(self) -> bool:
+        return bool(self.config.drop_rate) and self._rng.random() < self.config.drop_rate
+
+    def _respond(self, frame: memoryview) -> Optional[bytes]:
+        """Build the reply to one request frame, or None to stay silent."""
+        opcode = frame[FRAME_OPCODE_OFFSET]
+        if opcode == OPCODE_DEVICE_INFO:
+            return self.battery_frame()
+        if opcode == OPCODE_MODE:
+            payload = frame_payload(frame)
+            if not payload:
+                return None
+            self.low_latency = payload[-1] == 0x01
+            self.acks_sent += 1
+            ack = bytearray(MODE_ACK_PAYLOAD_SIZE)
+            if self.config.ack_echoes_seq:
+                ack[0], ack[1] = payload[0], MODE_ACK_OK
+            return build_frame(RESPONSE_FLAGS, OPCODE_MODE, bytes(ack))
+        if frame[FRAME_FLAGS_OFFSET] & FLAG_EXPECTS_REPLY:
+            return build_frame(RESPONSE_FLAGS, opcode)
+        return None
+
+    def _forget(self, session: "_Session") -> None:
+        with self._lock:
+            self._sessions.discard(session)
+
+
+class _Session:
+    """One simulated RFCOMM link."""
+
+    def __init__(self, simulator: EarbudsSimulator, sock: socket.socket):
+        self._sim = simulator
+        self._sock = sock
+        self._decoder = FrameDecoder()
+        self._lock = threading.Lock()
+        self._outbox: list[tuple[float, int, bytes]] = []
+        self._order = itertools.count()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._closed = False
+        self._requests = 0
+
+    def start(self) -> None:
+        threading.Thread(target=self._run, name="sim-session", daemon=True).start()
+
+    def queue(self, data: bytes, delay: Optional[float] = None) -> None:
+        """Schedule ``data`` for the client after the configured latency."""
+        due = time.monotonic() + (self._sim._delay() if delay is None else delay)
+        with self._lock:
+            heapq.heappush(self._outbox, (due, next(self._order), data))
+        self._wake()
+
+    def close(self) -> None:
+        self._closed = True
+        self._wake()
+
+    def _wake(self) -> None:
+        try:
+            self._wake_w.send(b"\0")
+        except OSError:
+            pass
+
+    def _run(self) -> None:
+        config = self._sim.config
+        started_at = time.monotonic()
+        for offset, data in self._sim._replay:
+            self.queue(data, delay=offset)
+        next_push = started_at + config.push_interval if config.push_interval else None
+
+        try:
+            while not self._closed:
+                now = time.monotonic()
+                if next_push is not None and now >= next_push:
+                    self.queue(self._sim.battery_frame())
+                    next_push = now + config.push_interval
+
+                readable, _, _ = select.select(
+                    [self._sock, self._wake_r], [], [], self._timeout(now, next_push)
+                )
+                if self._wake_r in readable:
+                    self._wake_r.recv(1024)
+                if self._sock in readable and not self._receive():
+                    return
+                self._flush()
+        except OSError:
+            pass
+        finally:
+            self._shutdown()
+
+    def _timeout(self, now: float, next_push: Optional[float]) -> Optional[float]:
+        deadlines = [next_push] if next_push is not None else []
+        with self._lock:
+            if self._outbox:
+                deadlines.append(self._outbox[0][0])
+        if not deadlines:
+            return None
+        return max(0.0, min(deadlines) - now)
+
+    def _receive(self) -> bool:
+        received = self._sock.recv_into(self._decoder.recv_buffer())
+        if not received:
+            return False
+        self._decoder.commit(received)
+
+        sim = self._sim
+        limit = sim.config.disconnect_after
+        for frame in self._decoder.frames():
+            if sim._should_drop():
+                sim.dropped += 1
+                continue
+            sim.requests += 1
+            self._requests += 1
+            if limit is not None and self._requests >= limit:
+                return False
+            if sim.config.respond:
+                reply = sim._respond(frame)
+                if reply:
+                    self.queue(reply)
+        return True
+
+    def _flush(self) -> None:
+        """Write every due message, merged per coalescing window."""
+        config = self._sim.config
+        now = time.monotonic()
+        with self._lock:
+            if not self._outbox or self._outbox[0][0] > now:
+                return
+            horizon = now + config.coalesce_window
+            due = []
+            while self._outbox and self._outbox[0][0] <= horizon:
+                due.append(heapq.heappop(self._outbox)[2])
+
+        if config.coalesce_window:
+            self._write(b"".join(due))
+        else:
+            for data in due:
+                self._write(data)
+
+    def _write(self, data: bytes) -> None:
+        size = self._sim.config.split_size
+        if not size or len(data) <= size:
+            self._sock.sendall(data)
+            return
+        for offset in range(0, len(data), size):
+            self._sock.sendall(data[offset:offset + size])
+            time.sleep(self._sim.config.split_gap)
+
+    def _shutdown(self) -> None:
+        self._closed = True
+        self._sim._forget(self)
+        for sock in (self._sock, self._wake_r, self._wake_w):
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+
+def load_replay(path: str) -> list[ReplayRecord]:
+    """Read the device-to-host side of a capture file as replay records."""
+    records = []
+    with open(path, "rb") as f:
+        start = None
+        for record in read_capture(f):
+            if record.direction != DIRECTION_RX:
+                continue
+            if start is None:
+                start = record.timestamp_ns
+            records.append(((record.timestamp_ns - start) / 1e9, record.data))
+    return records
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Connection Substitute
+# ─────────────────────────────────────────────────────────────────────────────
+class SimulatedConnection(BluetoothConnection):
+    """``BluetoothConnection`` that talks to a simulator instead of RFCOMM.
+
+    Args:
+        simulator: In-process simulator, served over a fresh socketpair on
+            every ``connect``
+        path: Unix socket of a simulator in another process
+        capture: Optional ring recording the simulated traffic
+    """
+
+    def __init__(
+        self,
+        simulator: Optional[EarbudsSimulator] = None,
+        path: Optional[str] = None,
+        capture: Optional[CaptureRing] = None
+    ):
+        super().__init__(capture)
+        if (simulator is None) == (path is None):
+            raise ValueError("Pass exactly one of simulator or path")
+        self._simulator = simulator
+        self._path = path
+
+    def connect(self, address: str, channel: int = RFCOMM_PORT) -> None:
+        """Open a link to the simulator; address and channel are ignored."""
+        if self._simulator:
+            sock = self._simulator.socketpair()
+        else:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(SOCKET_TIMEOUT)
+            sock.connect(self._path)
+        sock.settimeout(SOCKET_TIMEOUT)
+        self._sock = sock
+        self._connected = True
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Entry Point
+# ─────────────────────────────────────────────────────────────────────────────
+def main(argv: Optional[list[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve simulated Mi Buds on a Unix socket.")
+    parser.add_argument("--unix", required=True, help="Socket path to listen on")
+    parser.add_argument("--latency", type=float, default=0.0, help="Reply latency in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Random latency spread in seconds")
+    parser.add_argument("--split", type=int, default=0, help="Write replies in chunks of this many bytes")
+    parser.add_argument("--coalesce", type=float, default=0.0, help="Merge replies due within this window")
+    parser.add_argument("--drop-rate", type=float, default=0.0, help="Fraction of requests to ignore")
+    parser.add_argument("--disconnect-after", type=int, help="Drop the link after this many requests")
+    parser.add_argument("--push-interval", type=float, help="Seconds between unsolicited battery pushes")
+    parser.add_argument("--seed", type=int, help="Random seed for jitter and drops")
+    parser.add_argument("--replay", help="Capture file whose received traffic is replayed")
+    args = parser.parse_args(argv)
+
+    simulator = EarbudsSimulator(SimulatorConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        split_size=args.split,
+        coalesce_window=args.coalesce,
+        drop_rate=args.drop_rate,
+        disconnect_after=args.disconnect_after,
+        push_interval=args.push_interval,
+        seed=args.seed,
+    ), replay=load_replay(args.replay) if args.replay else None)
+    simulator.serve_unix(args.unix)
+    print(f"Simulator listening on {args.unix}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        simulator.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,164 @@
+"""Outbound command queue drained by a single writer thread."""
+
+import heapq
+import itertools
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Optional
+
+from .constants import SEND_QUEUE_SIZE
+
+
+logger = logging.getLogger(__name__)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Priorities (lower runs first)
+# ─────────────────────────────────────────────────────────────────────────────
+PRIORITY_MODE = 0
+PRIORITY_RAW = 5
+PRIORITY_BATTERY = 10
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Type Aliases
+# ─────────────────────────────────────────────────────────────────────────────
+SendAction = Callable[[], tuple[bool, str]]
+CompletionCallback = Callable[[bool, str], None]
+
+
+@dataclass(order=True)
+class _QueuedCommand:
+    priority: int
+    order: int
+    action: SendAction = field(compare=False)
+    key: Optional[str] = field(default=None, compare=False)
+    on_done: Optional[CompletionCallback] = field(default=None, compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+# ─────────────────────────────────────────────────────────────────────────────
+# Writer
+# ─────────────────────────────────────────────────────────────────────────────
+class CommandWriter:
+    """Runs send actions one at a time on a dedicated thread.
+
+    Callers never block on the socket: ``submit`` only enqueues and the
+    result is reported through the completion callback, from the writer
+    thread. Commands submitted with the same ``key`` supersede each other,
+    so only the newest queued one is sent.
+    """
+
+    def __init__(self, max_size: int = SEND_QUEUE_SIZE):
+        self._max_size = max_size
+        self._heap: list[_QueuedCommand] = []
+        self._by_key: dict[str, _QueuedCommand] = {}
+        self._size = 0
+        self._order = itertools.count()
+        self._cond = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._running = False
+        self._stopped = False
+
+    def start(self) -> None:
+        """Start the writer thread if it is not running."""
+        with self._cond:
+            if self._running:
+                return
+            self._running = True
+            self._stopped = False
+        self._thread = threading.Thread(target=self._run, name="bt-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer; queued commands are dropped."""
+        with self._cond:
+            self._running = False
+            self._stopped = True
+            dropped = [item for item in self._heap if not item.cancelled]
+            self._heap.clear()
+            self._by_key.clear()
+            self._size = 0
+            self._cond.notify_all()
+        for item in dropped:
+            self._complete(item, False, "Writer stopped.")
+
+    def submit(
+        self,
+        action: SendAction,
+        priority: int = PRIORITY_RAW,
+        key: Optional[str] = None,
+        on_done: Optional[CompletionCallback] = None
+    ) -> bool:
+        """Queue a send action.
+
+        Args:
+            action: Callable performing the send, returning (success, message)
+            priority: Lower values are sent first
+            key: Optional supersede key; a queued command with the same key
+                is dropped in favour of this one
+            on_done: Called with (success, message) once the action ran
+
+        Returns:
+            True if queued, False if the queue was full or the writer stopped
+        """
+        item = _QueuedCommand(priority, next(self._order), action, key, on_done)
+        superseded: Optional[_QueuedCommand] = None
+
+        with self._cond:
+            stopped = self._stopped
+            if key is not None and not stopped:
+                superseded = self._by_key.pop(key, None)
+                if superseded:
+                    superseded.cancelled = True
+                    self._size -= 1
+
+            if stopped or self._size >= self._max_size:
+                full = True
+            else:
+                full = False
+                heapq.heappush(self._heap, item)
+                self._size += 1
+                if key is not None:
+                    self._by_key[key] = item
+                self._cond.notify()
+
+        if superseded:
+            self._complete(superseded, False, "Superseded by a newer command.")
+        if stopped:
+            self._complete(item, False, "Writer stopped.")
+            return False
+        if full:
+            self._complete(item, False, "Send queue is full.")
+            return False
+        return True
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while self._running and not self._size:
+                    self._cond.wait()
+                if not self._running:
+                    return
+
+                item = heapq.heappop(self._heap)
+                if item.cancelled:
+                    continue
+                self._size -= 1
+                if item.key is not None and self._by_key.get(item.key) is item:
+                    del self._by_key[item.key]
+
+            try:
+                success, message = item.action()
+            except Exception as e:
+                success, message = False, f"Send error: {e}"
+            self._complete(item, success, message)
+
+    @staticmethod
+    def _complete(item: _QueuedCommand, success: bool, message: str) -> None:
+        if item.on_done:
+            try:
+                item.on_done(success, message)
+            except Exception:
+                logger.exception("Send completion callback failed")
@@ -1,6 +1,7 @@
 """Mi Buds Client - Main Application Entry Point."""
 
 import flet as ft
+import logging
 import os
 import shutil
 import subprocess
@@ -8,13 +9,21 @@ import sys
 import threading
 import time
 import webbrowser
+from typing import Optional
 
 try:
     import winsound
 except ImportError:
     winsound = None
 
-from bluetooth import BTController
+from bluetooth import (
+    BTController,
+    BluetoothConnection,
+    BluetoothDevice,
+    BluetoothDiscovery,
+    BlueZMonitor,
+    CaptureRing,
+)
 from utils import (
     set_startup, 
     is_startup_enabled, 
@@ -29,24 +38,30 @@ from utils import (
     set_low_latency_mode,
     get_low_latency_hold_until_app_close,
     set_low_latency_hold_until_app_close,
+    get_last_known_device,
+    set_last_known_device,
     check_for_existing_instance,
     start_instance_listener
 )
 from ui import (
     APP_TITLE, APP_VERSION, GITHUB_URL, WINDOW_WIDTH, WINDOW_HEIGHT, COLOR_BG, COLOR_CARD_BG,
-    BATTERY_UNKNOWN, BATTERY_CHARGING_OFFSET, WindowManager, SystemTray
+    BATTERY_UNKNOWN, WindowManager, SystemTray
 )
 from ui.components import (
     AppTitle, DeviceImage, BatteryPanel, SettingsCard, StatusBar, Spacer, Footer
 )
 from utils.debug_console import DebugConsoleManager
 from utils.game_monitor import FullscreenGameMonitor
+from utils.process_table import ProcessTable
+from utils.process_watcher import ProcessExitWatcher
 
 
 def main(page: ft.Page):
     """Main application entry point."""
     debug_console = DebugConsoleManager()
     debug_console.install()
+    # After install(), so log records reach the debug console too.
+    logging.basicConfig(level=logging.INFO, format="%(levelname)s %(name)s: %(message)s")
     
     # ─────────────────────────────────────────────────────────────────────────
     # Page Configuration
@@ -79,13 +94,11 @@ def main(page: ft.Page):
     controller_ref = {
         "instance": None,
         "selected_mode": get_low_latency_mode(),
-        "effective_low_latency": False,
-        "reconnect_in_progress": False,
         "game_monitor": None,
-        "latency_hold_app_id": "",
-        "hold_watcher_running": False,
+        "hold_watcher": None,
+        "bluez_monitor": None,
         "hold_until_app_close_enabled": get_low_latency_hold_until_app_close(),
-        "last_monitor_state": {"is_fullscreen": False, "app_id": ""},
+        "last_monitor_state": {"is_fullscreen": False, "app_id": "", "pid": None},
     }
     platform_key = "windows" if sys.platform.startswith("win") else "linux"
     low_latency_exceptions_by_platform = get_all_low_latency_exceptions()
@@ -109,10 +122,13 @@ def main(page: ft.Page):
         "last_toggle_at": 0.0
     }
 
-    def is_process_running(app_id: str) -> bool:
+    # Exact executable-name index over /proc; rescans only read new PIDs.
+    process_table = ProcessTable()
+
+    def find_process_ids(app_id: str) -> set[int]:
         app_name = (app_id or "").strip().lower()
         if not app_name:
-            return False
+            return set()
 
         try:
             if sys.platform.startswith("win"):
@@ -126,85 +142,56 @@ def main(page: ft.Page):
                     creationflags |= subprocess.CREATE_NO_WINDOW
 
                 result = subprocess.run(
-                    ["tasklist", "/FI", f"IMAGENAME eq {app_name}"],
+                    ["tasklist", "/FI", f"IMAGENAME eq {app_name}", "/FO", "CSV", "/NH"],
                     capture_output=True,
                     text=True,
                     startupinfo=startupinfo,
                     creationflags=creationflags,
                     check=False,
                 )
-                output = (result.stdout or "").lower()
-                return app_name in output and "no tasks are running" not in output
+                pids = set()
+                for line in (result.stdout or "").splitlines():
+                    fields = [field.strip('"') for field in line.split('","')]
+                    if len(fields) > 1 and fields[0].lower() == app_name and fields[1].isdigit():
+                        pids.add(int(fields[1]))
+                return pids
 
             if sys.platform.startswith("linux"):
-                result = subprocess.run(
-                    ["pgrep", "-f", app_name],
-                    capture_output=True,
-                    text=True,
-                    check=False,
-                )
-                return result.returncode == 0 and bool((result.stdout or "").strip())
+                process_table.refresh()
+                return process_table.find(app_name)
         except Exception:
-            return False
-
-        return False
-
-    def clear_latency_hold() -> None:
-        controller_ref["latency_hold_app_id"] = ""
-
-    def start_hold_watcher_if_needed() -> None:
-        if controller_ref["hold_watcher_running"]:
-            return
-
-        hold_app_id = controller_ref["latency_hold_app_id"]
-        if not hold_app_id:
-            return
-
-        if controller_ref["selected_mode"] != "auto":
-            return
-
-        if not controller_ref["hold_until_app_close_enabled"]:
-            return
+            return set()
 
-        controller_ref["hold_watcher_running"] = True
+        return set()
 
-        def _watcher() -> None:
-            try:
-                while True:
-                    if controller_ref["selected_mode"] != "auto":
-                        return
+    def on_hold_released(app_id: str) -> None:
+        page.pubsub.send_all({"type": "auto_hold_released", "app_id": app_id})
 
-                    if not controller_ref["hold_until_app_close_enabled"]:
-                        return
+    # Keeps Low Latency while any held app is still running; reports each
+    # app as soon as its last process exits.
+    hold_watcher = ProcessExitWatcher(find_pids=find_process_ids, on_release=on_hold_released)
+    controller_ref["hold_watcher"] = hold_watcher
 
-                    current_hold = controller_ref["latency_hold_app_id"]
-                    if not current_hold:
-                        return
-
-                    if not is_process_running(current_hold):
-                        page.pubsub.send_all({"type": "auto_hold_released", "app_id": current_hold})
-                        return
-
-                    time.sleep(2)
-            finally:
-                controller_ref["hold_watcher_running"] = False
-
-        threading.Thread(target=_watcher, daemon=True).start()
-
-    def apply_monitor_latency_policy(is_fullscreen: bool, app_id: str, source: str = "monitor") -> None:
+    def clear_latency_hold() -> None:
+        hold_watcher.clear()
+
+    def apply_monitor_latency_policy(
+        is_fullscreen: bool,
+        app_id: str,
+        source: str = "monitor",
+        pid: Optional[int] = None,
+    ) -> None:
         normalized_app = (app_id or "").strip().lower()
         selected_mode = controller_ref["selected_mode"]
         hold_enabled = bool(controller_ref["hold_until_app_close_enabled"])
-        current_hold = controller_ref["latency_hold_app_id"]
+        held_apps = hold_watcher.held
 
         def enable_low_latency(message: str, color: str = "blue") -> None:
-            if not controller_ref["effective_low_latency"]:
-                set_effective_latency_state(True, source=source)
+            set_effective_latency_state(True, source=source)
             update_status(message, color)
 
         def disable_low_latency(message: str = "Standard mode restored") -> None:
-            if controller_ref["effective_low_latency"]:
-                set_effective_latency_state(False, source=source)
+            set_effective_latency_state(False, source=source)
             update_status(message, "white")
 
         if selected_mode == "on":
@@ -239,14 +226,14 @@ def main(page: ft.Page):
 
             if matches:
                 if hold_enabled:
-                    set_latency_hold(normalized_app)
+                    set_latency_hold(normalized_app, pid)
                 else:
                     clear_latency_hold()
                 enable_low_latency(enable_message, "blue")
                 return
 
-            if hold_enabled and current_hold and is_process_running(current_hold):
-                enable_low_latency(f"Keeping Low Latency until {current_hold} closes", "blue")
+            if hold_enabled and held_apps:
+                enable_low_latency(f"Keeping Low Latency until {', '.join(sorted(held_apps))} closes", "blue")
                 return
 
             clear_latency_hold()
@@ -257,13 +244,18 @@ def main(page: ft.Page):
         disable_low_latency()
 
     def set_effective_latency_state(new_state: bool, source: str = "manual") -> None:
-        controller_ref["effective_low_latency"] = bool(new_state)
+        controller = controller_ref["instance"]
+        if controller:
+            # Only a change of the intended mode is sent. The controller
+            # reapplies the intended mode itself after every reconnect.
+            if bool(controller.intended_low_latency) == new_state:
+                return
+
+            def on_send_done(success: bool, message: str) -> None:
+                if not success:
+                    page.pubsub.send_all({"type": "status", "text": message, "color": "red"})
 
-        if controller_ref["instance"]:
-            mode = "low" if new_state else "std"
-            success, message = controller_ref["instance"].send_command(mode)
-            if not success:
-                page.pubsub.send_all({"type": "status", "text": message, "color": "red"})
+            controller.set_low_latency(new_state, on_done=on_send_done)
 
         tray_inst = tray_ref["instance"]
         if tray_inst:
@@ -291,6 +283,7 @@ def main(page: ft.Page):
             bool(last_state.get("is_fullscreen", False)),
             str(last_state.get("app_id", "")),
             source=source,
+            pid=last_state.get("pid"),
         )
 
         tray_inst = tray_ref["instance"]
@@ -305,16 +298,25 @@ def main(page: ft.Page):
             bool(last_state.get("is_fullscreen", False)),
             str(last_state.get("app_id", "")),
             source="manual",
+            pid=last_state.get("pid"),
         )
 
-    def set_latency_hold(app_id: str) -> None:
+    def set_latency_hold(app_id: str, pid: Optional[int] = None) -> None:
         normalized = (app_id or "").strip().lower()
         if not normalized:
             return
+        if controller_ref["selected_mode"] != "auto":
+            return
         if not controller_ref["hold_until_app_close_enabled"]:
             return
-        controller_ref["latency_hold_app_id"] = normalized
-        start_hold_watcher_if_needed()
+        if normalized in hold_watcher.held:
+            return
+        if not hold_watcher.hold(normalized, pid):
+            page.pubsub.send_all({
+                "type": "status",
+                "text": f"Could not find the process for {normalized}; Low Latency ends with fullscreen",
+                "color": "orange",
+            })
 
     def select_latency_mode_from_tray(mode: str) -> None:
         set_selected_latency_mode(mode, source="tray")
@@ -380,9 +382,10 @@ def main(page: ft.Page):
             left = message.get("left", BATTERY_UNKNOWN)
             right = message.get("right", BATTERY_UNKNOWN)
             case = message.get("case", BATTERY_UNKNOWN)
+            charging = tuple(message.get("charging", (False, False, False)))
             transient = message.get("transient", False)
 
-            battery_panel.update_all(left, right, case)
+            battery_panel.update_all(left, right, case, charging)
 
             if transient:
                 status_bar.update_status("Refreshing battery data...", "white")
@@ -402,7 +405,6 @@ def main(page: ft.Page):
         elif msg_type == "latency":
             enabled = bool(message.get("enabled"))
             mode = str(message.get("mode", controller_ref["selected_mode"]))
-            controller_ref["effective_low_latency"] = enabled
             controller_ref["selected_mode"] = mode
 
             settings_card.set_latency_mode(mode)
@@ -420,17 +422,14 @@ def main(page: ft.Page):
             page.update()
 
         elif msg_type == "auto_hold_released":
-            released_app = str(message.get("app_id", "")).strip().lower()
-            active_hold = controller_ref["latency_hold_app_id"]
-            if controller_ref["selected_mode"] != "auto" or not active_hold:
+            if controller_ref["selected_mode"] != "auto":
                 return
-            if released_app and active_hold != released_app:
+            # Another held app is still running.
+            if hold_watcher.held:
                 return
 
-            clear_latency_hold()
-            if controller_ref["effective_low_latency"]:
-                set_effective_latency_state(False, source="auto_hold_release")
-                update_status("Tracked app closed. Standard mode restored", "white")
+            set_effective_latency_state(False, source="auto_hold_release")
+            update_status("Tracked app closed. Standard mode restored", "white")
 
         elif msg_type == "update_notification":
             latest_ver = message.get("latest_ver")
@@ -504,7 +503,16 @@ def main(page: ft.Page):
             game_monitor = controller_ref.get("game_monitor")
             if game_monitor:
                 game_monitor.stop()
+            hold_watcher.stop()
+            bluez_monitor = controller_ref.get("bluez_monitor")
+            if bluez_monitor:
+                BluetoothDiscovery.set_name_lookup(None)
+                bluez_monitor.stop()
             debug_console.stop_f12_hotkey_listener()
+            capture = controller_ref.get("capture")
+            if capture:
+                capture_ring, capture_path = capture
+                capture_ring.dump(capture_path)
             window_mgr.close()
 
         elif msg_type == "debug_console":
@@ -541,11 +549,13 @@ def main(page: ft.Page):
         elif msg_type == "fullscreen_state":
             is_fullscreen = bool(message.get("is_fullscreen", False))
             app_id = str(message.get("app_id", "")).strip().lower()
+            pid = message.get("pid")
             controller_ref["last_monitor_state"] = {
                 "is_fullscreen": is_fullscreen,
                 "app_id": app_id,
+                "pid": pid,
             }
-            apply_monitor_latency_policy(is_fullscreen, app_id, source="monitor")
+            apply_monitor_latency_policy(is_fullscreen, app_id, source="monitor", pid=pid)
 
     page.pubsub.subscribe(on_pubsub_message)
 
@@ -557,11 +567,11 @@ def main(page: ft.Page):
         "right": None,
     }
 
-    def get_charging_state(raw_value):
-        """Return charging state for a raw battery value, or None if unknown."""
-        if raw_value == BATTERY_UNKNOWN:
+    def get_charging_state(level, is_charging):
+        """Return charging state for a battery level, or None if unknown."""
+        if level == BATTERY_UNKNOWN:
             return None
-        return raw_value >= BATTERY_CHARGING_OFFSET
+        return is_charging
 
     def play_charge_transition_sound(started):
         """Play distinct tone patterns for charge transitions on Windows/Linux."""
@@ -621,10 +631,10 @@ def main(page: ft.Page):
 
         threading.Thread(target=_play_tones, daemon=True).start()
 
-    def update_battery_ui(left, right, case):
+    def update_battery_ui(status):
         current_charging_state = {
-            "left": get_charging_state(left),
-            "right": get_charging_state(right),
+            "left": get_charging_state(status.left, status.left_charging),
+            "right": get_charging_state(status.right, status.right_charging),
         }
 
         for side in ("left", "right"):
@@ -654,9 +664,10 @@ def main(page: ft.Page):
         time.sleep(0.2)
         page.pubsub.send_all({
             "type": "battery", 
-            "left": left, 
-            "right": right, 
-            "case": case,
+            "left": status.left, 
+            "right": status.right, 
+            "case": status.case,
+            "charging": (status.left_charging, status.right_charging, status.case_charging),
             "transient": False
         })
 
@@ -667,23 +678,14 @@ def main(page: ft.Page):
             "color": color
         })
 
-    def request_battery_delayed():
-        time.sleep(1)
-        controller.resume_reconnect_attempts()
-        controller.request_battery()
-
     def reconnect_if_disconnected_on_show():
         """When window is shown from tray, trigger an immediate reconnect attempt if disconnected."""
-        if not controller.connected and not controller_ref["reconnect_in_progress"]:
-            controller_ref["reconnect_in_progress"] = True
-
+        if not controller.connected:
+            # Joins the listener's attempt if one is already running.
             def _reconnect_worker():
-                try:
-                    controller.resume_reconnect_attempts()
-                    update_status("Connection lost. Reconnecting...", "orange")
-                    controller.reconnect(force_rediscovery=True)
-                finally:
-                    controller_ref["reconnect_in_progress"] = False
+                controller.resume_reconnect_attempts()
+                update_status("Connection lost. Reconnecting...", "orange")
+                controller.reconnect(force_rediscovery=True)
 
             threading.Thread(target=_reconnect_worker, daemon=True).start()
 
@@ -706,21 +708,50 @@ def main(page: ft.Page):
     # ─────────────────────────────────────────────────────────────────────────
     # Initialize Bluetooth Controller
     # ─────────────────────────────────────────────────────────────────────────
+    def remember_device(device: BluetoothDevice) -> None:
+        set_last_known_device(device.address, device.name, device.channel)
+        BluetoothDiscovery.remember_name(device.address, device.name)
+
+    last_device = get_last_known_device()
+    known_device = None
+    if last_device:
+        known_device = BluetoothDevice(name=last_device["name"], address=last_device["address"])
+        BluetoothDiscovery.remember_name(known_device.address, known_device.name)
+        if last_device["channel"]:
+            known_device.channel = last_device["channel"]
+
+    # Optional RFCOMM traffic capture: MIBUDS_CAPTURE=<dump path>
+    capture_path = os.environ.get("MIBUDS_CAPTURE")
+    capture_ring = None
+    if capture_path:
+        capture_ring = CaptureRing(path=f"{capture_path}.ring")
+        capture_ring.dump_on_crash(capture_path)
+        controller_ref["capture"] = (capture_ring, capture_path)
+
     controller = BTController(
         status_callback=update_status,
         battery_callback=update_battery_ui,
-        check_battery_callback=lambda: threading.Thread(
-            target=request_battery_delayed, 
-            daemon=True
-        ).start(),
         connection_event_callback=lambda event: page.pubsub.send_all(
             {"type": "connection_event", "event": event}
-        )
+        ),
+        known_device=known_device,
+        device_callback=remember_device,
+        connection_factory=lambda: BluetoothConnection(capture=capture_ring),
     )
     
     # Set controller reference for tray callbacks
     controller_ref["instance"] = controller
 
+    # Optional push-based device events from BlueZ (needs jeepney)
+    if sys.platform.startswith("linux") and BlueZMonitor.is_available():
+        bluez_monitor = BlueZMonitor(
+            on_connected=controller.notify_device_connected,
+            on_disconnected=controller.notify_device_disconnected,
+        )
+        if bluez_monitor.start():
+            BluetoothDiscovery.set_name_lookup(bluez_monitor.device_name)
+        controller_ref["bluez_monitor"] = bluez_monitor
+
     # ─────────────────────────────────────────────────────────────────────────
     # Build Settings Card with Controller Actions
     # ─────────────────────────────────────────────────────────────────────────
@@ -810,6 +841,7 @@ def main(page: ft.Page):
             bool(last_state.get("is_fullscreen", False)),
             str(last_state.get("app_id", "")),
             source="manual",
+            pid=last_state.get("pid"),
         )
 
     def on_add_low_latency_include_item(platform: str, value: str):
@@ -832,7 +864,7 @@ def main(page: ft.Page):
         on_set_low_latency_item_mode=on_set_low_latency_item_mode,
         on_add_low_latency_include_item=on_add_low_latency_include_item,
         on_wait_until_app_close_change=on_wait_until_app_close_change,
-        on_check_battery=lambda _: controller.request_battery(),
+        on_check_battery=lambda _: controller.submit_battery_request(),
         on_startup_toggle=on_startup_change,
         startup_enabled=is_startup_enabled(),
         low_latency_mode=controller_ref["selected_mode"],
@@ -875,9 +907,9 @@ def main(page: ft.Page):
 
     threading.Thread(target=perform_update_check, daemon=True).start()
 
-    def on_fullscreen_change(is_fullscreen: bool, app_id: str):
+    def on_fullscreen_change(is_fullscreen: bool, app_id: str, pid: Optional[int] = None):
         page.pubsub.send_all(
-            {"type": "fullscreen_state", "is_fullscreen": is_fullscreen, "app_id": app_id}
+            {"type": "fullscreen_state", "is_fullscreen": is_fullscreen, "app_id": app_id, "pid": pid}
         )
 
     game_monitor = FullscreenGameMonitor(
@@ -0,0 +1,94 @@
+"""Overhead of traffic capture on the connection's send/receive path.
+
+Usage: python scripts/bench_capture.py [--rounds N] [--repeat N]
+
+Each round sends a battery request on a BluetoothConnection over a
+socketpair and receives the reply, like the listener does. Rounds run with
+capture off, with an in-memory ring and with an mmap-backed ring; the
+overhead is reported against capture off. Ring.record is also timed alone.
+"""
+
+import argparse
+import os
+import socket
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bluetooth.capture import DIRECTION_RX, CaptureRing  # noqa: E402
+from bluetooth.connection import BluetoothConnection  # noqa: E402
+from bluetooth.constants import BATTERY_PATTERN, OPCODE_DEVICE_INFO  # noqa: E402
+from bluetooth.framing import FrameDecoder  # noqa: E402
+from bluetooth.protocol import BudsProtocol  # noqa: E402
+from tests.test_framing import frame  # noqa: E402
+
+BATTERY_REPLY = frame(OPCODE_DEVICE_INFO, BATTERY_PATTERN + bytes((80, 75, 50)))
+
+
+class PairConnection(BluetoothConnection):
+    """``BluetoothConnection`` over one end of a socketpair."""
+
+    def __init__(self, sock: socket.socket, capture=None):
+        super().__init__(capture)
+        self._sock = sock
+        self._connected = True
+
+
+def round_trips(capture, rounds: int, repeat: int) -> float:
+    """Return the best seconds per round trip over ``repeat`` runs."""
+    client, device = socket.socketpair()
+    connection = PairConnection(client, capture)
+    decoder = FrameDecoder()
+    request = BudsProtocol.build_battery_request()
+    best = float("inf")
+    try:
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for _ in range(rounds):
+                connection.send(request)
+                device.recv(64)
+                device.sendall(BATTERY_REPLY)
+                decoder.commit(connection.receive_into(decoder.recv_buffer()))
+                for _ in decoder.frames():
+                    pass
+            best = min(best, (time.perf_counter() - started) / rounds)
+    finally:
+        connection.disconnect()
+        device.close()
+    return best
+
+
+def record_cost(ring: CaptureRing, size: int, count: int) -> float:
+    data = bytes(size)
+    started = time.perf_counter()
+    for _ in range(count):
+        ring.record(DIRECTION_RX, data)
+    return (time.perf_counter() - started) / count
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        mmap_ring = CaptureRing(path=os.path.join(tmp, "bench.ring"))
+        baseline = round_trips(None, args.rounds, args.repeat)
+        print(f"{'capture off':<18} {baseline * 1e6:8.2f} us/round trip")
+        for name, ring in (("memory ring", CaptureRing()), ("mmap ring", mmap_ring)):
+            seconds = round_trips(ring, args.rounds, args.repeat)
+            overhead = (seconds - baseline) / baseline * 100
+            print(f"{name:<18} {seconds * 1e6:8.2f} us/round trip  {overhead:+6.1f}%")
+
+        print()
+        for size in (16, 256, 4096):
+            seconds = record_cost(CaptureRing(), size, args.rounds)
+            print(f"record {size:>5} bytes   {seconds * 1e9:8.0f} ns/record")
+        mmap_ring.close()
+
+
+if __name__ == "__main__":
+    main()
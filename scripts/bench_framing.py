@@ -0,0 +1,93 @@
+"""Throughput of FrameDecoder on synthetic split and coalesced streams.
+
+Usage: python scripts/bench_framing.py [--frames N] [--repeat N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bluetooth.constants import BATTERY_PATTERN  # noqa: E402
+from bluetooth.framing import FrameDecoder  # noqa: E402
+from bluetooth.protocol import BudsProtocol  # noqa: E402
+from tests.test_framing import frame  # noqa: E402
+
+
+def build_stream(frame_count: int, seed: int = 1) -> bytes:
+    rng = random.Random(seed)
+    frames = []
+    for _ in range(frame_count):
+        if rng.random() < 0.5:
+            frames.append(frame(0x02, BATTERY_PATTERN + bytes(rng.randrange(101) for _ in range(3))))
+        else:
+            frames.append(frame(0xF2, bytes((rng.randrange(256), 0))))
+    return b"".join(frames)
+
+
+def chunk(stream: bytes, sizes: list[int]) -> list[bytes]:
+    chunks = []
+    offset = 0
+    i = 0
+    while offset < len(stream):
+        size = sizes[i % len(sizes)]
+        chunks.append(stream[offset:offset + size])
+        offset += size
+        i += 1
+    return chunks
+
+
+def run(name: str, chunks: list[bytes], expected: int, repeat: int, decode: bool) -> None:
+    total_bytes = sum(len(c) for c in chunks)
+    best = float("inf")
+    for _ in range(repeat):
+        decoder = FrameDecoder()
+        count = 0
+        started = time.perf_counter()
+        for data in chunks:
+            # Like recv_into: a read only fills what the buffer has room for.
+            offset = 0
+            while offset < len(data):
+                target = decoder.recv_buffer()
+                size = min(len(target), len(data) - offset)
+                target[:size] = data[offset:offset + size]
+                decoder.commit(size)
+                offset += size
+                for frame_view in decoder.frames():
+                    if decode:
+                        BudsProtocol.decode(frame_view)
+                    count += 1
+        best = min(best, time.perf_counter() - started)
+        if count != expected:
+            raise SystemExit(f"{name}: decoded {count} frames, expected {expected}")
+    print(
+        f"{name:<24} {total_bytes / best / 1e6:8.1f} MB/s "
+        f"{expected / best / 1e3:9.0f} kframes/s ({len(chunks)} reads)"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frames", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    stream = build_stream(args.frames)
+    rng = random.Random(2)
+    cases = {
+        "split (1-7 bytes)": chunk(stream, [rng.randint(1, 7) for _ in range(997)]),
+        "frame-sized reads": chunk(stream, [len(frame(0xF2, b"\0\0"))]),
+        "coalesced (1 KiB)": chunk(stream, [1024]),
+        "coalesced (4 KiB)": chunk(stream, [4096]),
+    }
+    for decode in (False, True):
+        print("framing + decode" if decode else "framing only")
+        for name, chunks in cases.items():
+            run(name, chunks, args.frames, args.repeat, decode)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,124 @@
+"""Scale DeviceManager to many socketpair devices on one event loop.
+
+Usage: python scripts/bench_manager.py [--devices N ...] [--rounds N]
+
+Every round requests battery from all devices at once and waits for every
+reply. The device ends of the socketpairs are answered by one responder
+thread, which is left out of the thread count reported for the manager.
+"""
+
+import argparse
+import os
+import selectors
+import socket
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bluetooth.async_connection import AsyncBluetoothConnection  # noqa: E402
+from bluetooth.constants import BATTERY_PATTERN, OPCODE_DEVICE_INFO  # noqa: E402
+from bluetooth.framing import FrameDecoder  # noqa: E402
+from bluetooth.manager import DeviceManager  # noqa: E402
+from tests.test_framing import frame  # noqa: E402
+
+BATTERY_REPLY = frame(OPCODE_DEVICE_INFO, BATTERY_PATTERN + bytes((80, 75, 50)))
+
+
+class Responder:
+    """Answers every frame received on the device sockets with a battery reply."""
+
+    def __init__(self):
+        self._selector = selectors.DefaultSelector()
+        self._wake_r, self._wake_w = socket.socketpair()
+        self._selector.register(self._wake_r, selectors.EVENT_READ)
+        self._thread = threading.Thread(target=self._run, name="bench-responder", daemon=True)
+        self._thread.start()
+
+    def add(self, sock: socket.socket) -> None:
+        self._selector.register(sock, selectors.EVENT_READ, FrameDecoder())
+        self._wake_w.send(b"\0")
+
+    def stop(self) -> None:
+        self._wake_w.send(b"x")
+        self._thread.join()
+
+    def _run(self) -> None:
+        while True:
+            for key, _ in self._selector.select():
+                if key.fileobj is self._wake_r:
+                    if b"x" in self._wake_r.recv(64):
+                        return
+                    continue
+                decoder = key.data
+                received = key.fileobj.recv_into(decoder.recv_buffer())
+                if not received:
+                    self._selector.unregister(key.fileobj)
+                    continue
+                decoder.commit(received)
+                replies = sum(1 for _ in decoder.frames())
+                key.fileobj.sendall(BATTERY_REPLY * replies)
+
+
+def manager_threads() -> int:
+    return sum(1 for t in threading.enumerate() if t.name != "bench-responder")
+
+
+def run(device_count: int, rounds: int) -> None:
+    responder = Responder()
+    manager = DeviceManager()
+    replies = 0
+    cond = threading.Condition()
+
+    def on_battery(address, status) -> None:
+        nonlocal replies
+        with cond:
+            replies += 1
+            cond.notify_all()
+
+    def wait_replies(count: int) -> None:
+        with cond:
+            if not cond.wait_for(lambda: replies >= count, timeout=30):
+                raise SystemExit(f"{device_count} devices: only {replies}/{count} replies")
+
+    threads_before = manager_threads()
+    manager.start()
+    try:
+        addresses = [f"00:00:00:00:{i >> 8:02X}:{i & 0xFF:02X}" for i in range(device_count)]
+        for address in addresses:
+            client, device = socket.socketpair()
+            responder.add(device)
+            connection = AsyncBluetoothConnection()
+            connection.attach(client)
+            manager.add_device(address, on_battery=on_battery, connection=connection, auto_reconnect=False)
+
+        started = time.perf_counter()
+        for round_index in range(rounds):
+            for address in addresses:
+                manager.request_battery(address)
+            wait_replies((round_index + 1) * device_count)
+        elapsed = time.perf_counter() - started
+        threads_added = manager_threads() - threads_before
+    finally:
+        manager.stop()
+        responder.stop()
+
+    total = device_count * rounds
+    print(
+        f"{device_count:>5} devices {threads_added:>3} manager threads "
+        f"{total / elapsed:10.0f} replies/s {elapsed / rounds * 1000:8.2f} ms/round"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--devices", type=int, nargs="+", default=[1, 10, 50, 100])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    for device_count in args.devices:
+        run(device_count, args.rounds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Compare ProcessTable lookups with spawning pgrep.
+
+Usage: python scripts/bench_process_table.py [NAME] [--repeat N]
+"""
+
+import argparse
+import os
+import shutil
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from tests import load_utils_module  # noqa: E402
+
+ProcessTable = load_utils_module("process_table").ProcessTable
+
+
+def best_of(func, repeat: int) -> tuple[float, object]:
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        started = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - started)
+    return best, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("name", nargs="?", default="python")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    def full_scan():
+        table = ProcessTable()
+        table.refresh()
+        return table
+
+    seconds, table = best_of(full_scan, args.repeat)
+    print(f"{'full scan':<26} {seconds * 1000:9.3f} ms  {len(table)} processes")
+
+    def refresh_and_find():
+        table.refresh()
+        return table.find(args.name)
+
+    seconds, pids = best_of(refresh_and_find, args.repeat)
+    print(f"{'incremental refresh+find':<26} {seconds * 1000:9.3f} ms  {sorted(pids)}")
+
+    if not shutil.which("pgrep"):
+        print(f"{'pgrep -f':<26} unavailable (pgrep not found)")
+        return
+
+    def pgrep(*flags):
+        output = subprocess.run(["pgrep", *flags, args.name], capture_output=True, text=True).stdout
+        return {int(pid) for pid in output.split()}
+
+    for label, flags in (("pgrep -f", ("-f",)), ("pgrep -x", ("-x",))):
+        seconds, pids = best_of(lambda: pgrep(*flags), args.repeat)
+        print(f"{label:<26} {seconds * 1000:9.3f} ms  {sorted(pids)}")
+
+
+if __name__ == "__main__":
+    main()
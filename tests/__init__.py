@@ -0,0 +1,20 @@
+import importlib.util
+import os
+import sys
+
+UTILS_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "utils")
+
+
+def load_utils_module(name: str):
+    """Import a self-contained ``utils`` module without ``utils/__init__``.
+
+    The package initializer pulls in the UI dependencies (flet); modules
+    with no package-relative imports can be tested without them.
+    """
+    qualified = f"utils_{name}"
+    if qualified not in sys.modules:
+        spec = importlib.util.spec_from_file_location(qualified, os.path.join(UTILS_DIR, f"{name}.py"))
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[qualified] = module
+        spec.loader.exec_module(module)
+    return sys.modules[qualified]
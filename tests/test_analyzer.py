@@ -0,0 +1,140 @@
+"""Tests for the offline capture analyzer."""
+
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+
+from bluetooth import analyzer
+from bluetooth.capture import DIRECTION_RX, DIRECTION_TX, CaptureRecord, CaptureWriter, read_capture, read_index
+from bluetooth.constants import BATTERY_PATTERN, OPCODE_DEVICE_INFO, OPCODE_MODE
+from bluetooth.protocol import BudsProtocol
+from tests.test_framing import frame
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "session.cap")
+CLOCK_OFFSET = 1_700_000_000 * 10**9
+START_NS = 5 * 10**9
+SECOND = 10**9
+
+
+def battery(left: int, right: int, case: int) -> bytes:
+    return frame(OPCODE_DEVICE_INFO, BATTERY_PATTERN + bytes((left, right, case)))
+
+
+def session_records() -> list[CaptureRecord]:
+    """Two minutes of traffic: handshake, two mode commands, a push and a poll."""
+    reply = battery(80, 75, 0x80 | 50)
+    events = [
+        (0.000, DIRECTION_TX, frame(0x51, bytes((0x00, 0x03, 0x01)))),
+        (0.010, DIRECTION_TX, BudsProtocol.build_battery_request()),
+        # The reply arrives split over two reads.
+        (0.030, DIRECTION_RX, reply[:6]),
+        (0.031, DIRECTION_RX, reply[6:]),
+        (1.000, DIRECTION_TX, BudsProtocol.build_mode_command("low", 0x90)),
+        (1.020, DIRECTION_RX, frame(OPCODE_MODE, bytes((0x90, 0x00, 0, 0, 0, 0)))),
+        (2.000, DIRECTION_TX, BudsProtocol.build_mode_command("std", 0x91)),
+        (61.000, DIRECTION_RX, battery(79, 75, 0x80 | 50)),
+        (120.000, DIRECTION_TX, BudsProtocol.build_battery_request()),
+        # Battery reply coalesced with a frame of an opcode without a codec.
+        (120.050, DIRECTION_RX, battery(78, 75, 0x80 | 51) + frame(0x0B, b"\x01")),
+    ]
+    return [
+        CaptureRecord(START_NS + round(offset * SECOND), direction, data)
+        for offset, direction, data in events
+    ]
+
+
+def write_session(f) -> None:
+    writer = CaptureWriter(f, index_interval=2, clock_offset=CLOCK_OFFSET)
+    for record in session_records():
+        writer.write(record)
+    writer.close()
+
+
+class AnalyzerTest(unittest.TestCase):
+    def test_fixture_matches_writer(self):
+        # Guards the on-disk format: the checked-in file must still be what
+        # the writer produces for the same records.
+        buffer = io.BytesIO()
+        write_session(buffer)
+        with open(FIXTURE, "rb") as f:
+            self.assertEqual(f.read(), buffer.getvalue())
+
+    def test_summary(self):
+        summary = analyzer.analyze(FIXTURE)
+        self.assertEqual(summary.records, 10)
+        self.assertEqual(summary.frame_counts, {
+            "tx:opcode_0x51": 1,
+            "tx:battery_request": 2,
+            "tx:mode_command": 2,
+            "rx:battery": 3,
+            "rx:mode_ack": 1,
+            "rx:opcode_0x0b": 1,
+        })
+        self.assertEqual([round(v, 3) for v in summary.mode_latencies], [0.02])
+        self.assertEqual([round(v, 3) for v in summary.battery_latencies], [0.021, 0.05])
+        self.assertEqual(summary.battery_pushes, 1)
+        self.assertEqual(summary.unanswered_commands, 1)
+        self.assertEqual(summary.unknown_opcodes, {("tx", 0x51): 1, ("rx", 0x0B): 1})
+        # The real battery request ends with a stray byte after its trailer.
+        self.assertEqual(summary.dropped_bytes, 1)
+        self.assertEqual([status.case for _, status in summary.battery_timeline], [50, 50, 51])
+
+    def test_index_seek_skips_earlier_records(self):
+        records = session_records()
+        with open(FIXTURE, "rb") as f:
+            index = read_index(f)
+            self.assertEqual([ts for ts, _ in index], [r.timestamp_ns for r in records[::2]])
+            f.seek(0)
+            # Index entries sit on every second record: reading starts at the
+            # entry at or before the requested time.
+            seeked = list(read_capture(f, start_ns=records[7].timestamp_ns))
+        self.assertEqual(seeked, records[6:])
+
+    def test_window(self):
+        summary = analyzer.analyze(FIXTURE, start=60, end=121)
+        self.assertEqual(summary.records, 3)
+        self.assertEqual(summary.first_ns, START_NS + 61 * SECOND)
+        self.assertEqual(summary.battery_pushes, 1)
+        self.assertEqual([round(v, 3) for v in summary.battery_latencies], [0.05])
+        self.assertEqual(summary.unanswered_commands, 0)
+
+    def test_window_past_the_end(self):
+        summary = analyzer.analyze(FIXTURE, start=500)
+        self.assertEqual(summary.records, 0)
+        self.assertEqual(analyzer.format_report(summary), "Capture is empty.")
+
+    def test_report(self):
+        summary = analyzer.analyze(FIXTURE)
+        report = analyzer.format_report(summary, CLOCK_OFFSET, timeline=True, bucket_seconds=60)
+        lines = report.splitlines()
+        self.assertTrue(lines[0].startswith("Records: 10 over 120.0s ("))
+        self.assertIn("  rx:battery               3", lines)
+        self.assertIn("Battery request -> reply: n=2 min 21.0, p50 50.0, p90 50.0, p99 50.0, max 50.0 ms", lines)
+        self.assertIn("Mode command -> ack:     n=1 min 20.0, p50 20.0, p90 20.0, p99 20.0, max 20.0 ms", lines)
+        self.assertIn("Unanswered commands: 1, unsolicited battery pushes: 1", lines)
+        self.assertIn("  rx 0x0b  1", lines)
+        timeline = [line for line in lines if line.endswith(("50*", "51*"))]
+        self.assertEqual([line.split("  ")[-1] for line in timeline], [
+            "80 / 75 / 50*", "79 / 75 / 50*", "78 / 75 / 51*",
+        ])
+        self.assertIn("  +      60s  rx:battery               1", lines)
+
+    def test_main_prints_report(self):
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            analyzer.main([FIXTURE, "--start", "100", "--timeline"])
+        self.assertIn("Records: 2 over 0.1s", output.getvalue())
+        self.assertIn("Battery timeline", output.getvalue())
+
+    def test_empty_capture(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "empty.cap")
+            with open(path, "wb") as f:
+                CaptureWriter(f).close()
+            self.assertEqual(analyzer.format_report(analyzer.analyze(path)), "Capture is empty.")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+"""AsyncBTController against the device end of a socketpair."""
+
+import asyncio
+import socket
+import unittest
+from unittest import mock
+
+from bluetooth.async_connection import AsyncBluetoothConnection
+from bluetooth.async_controller import AsyncBTController
+from bluetooth.constants import COUNTER_VALUE, OPCODE_MODE
+from bluetooth.discovery import BluetoothDiscovery
+from bluetooth.framing import FRAME_OPCODE_OFFSET, FrameDecoder, frame_payload
+from bluetooth.pending import AckTimeoutError
+from bluetooth.protocol import BatteryStatus, ModeAck
+from tests.test_framing import BATTERY_FRAME, frame
+
+
+class AsyncControllerTest(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        client, self.device = socket.socketpair()
+        self.device.setblocking(False)
+        connection = AsyncBluetoothConnection()
+        connection.attach(client)
+        self.controller = AsyncBTController(
+            bd_addr="AA:BB:CC:DD:EE:01", connection=connection, ack_timeout=0.05, ack_max_retries=1
+        )
+        self.decoder = FrameDecoder()
+
+    async def asyncTearDown(self):
+        self.controller.stop()
+        self.device.close()
+
+    async def device_frames(self, count: int) -> list[bytes]:
+        """Read ``count`` frames the controller sent."""
+        loop = asyncio.get_running_loop()
+        frames = []
+        while len(frames) < count:
+            received = await loop.sock_recv_into(self.device, self.decoder.recv_buffer())
+            self.decoder.commit(received)
+            frames += [bytes(f) for f in self.decoder.frames()]
+        return frames
+
+    async def reply(self, data: bytes) -> None:
+        await asyncio.get_running_loop().sock_sendall(self.device, data)
+
+    async def collect(self, count: int) -> list:
+        messages = []
+        async for message in self.controller:
+            messages.append(message)
+            if len(messages) == count:
+                break
+        return messages
+
+    async def test_connect_uses_attached_link(self):
+        self.assertTrue(await self.controller.connect())
+
+    async def test_connect_without_device(self):
+        controller = AsyncBTController(connection=AsyncBluetoothConnection())
+        with mock.patch.object(BluetoothDiscovery, "get_connected_device", return_value=None):
+            self.assertFalse(await controller.connect())
+
+    async def test_commands_are_sequenced_and_acked(self):
+        reader = asyncio.ensure_future(self.collect(2))
+        first = await self.controller.send_command_tracked("low")
+        second = await self.controller.send_command_tracked("std")
+        sent = await self.device_frames(2)
+        self.assertEqual([f[FRAME_OPCODE_OFFSET] for f in sent], [OPCODE_MODE, OPCODE_MODE])
+        self.assertEqual([frame_payload(memoryview(f))[0] for f in sent], [COUNTER_VALUE, COUNTER_VALUE + 1])
+
+        await self.reply(frame(OPCODE_MODE, bytes((COUNTER_VALUE + 1, 0))) + frame(OPCODE_MODE, bytes(6)))
+        self.assertEqual((await second).seq, COUNTER_VALUE + 1)
+        # The zeroed ack matches nothing, so it completes the oldest command.
+        self.assertEqual((await first).seq, COUNTER_VALUE)
+        self.assertEqual(await reader, [
+            ModeAck(seq=COUNTER_VALUE + 1, status=0),
+            ModeAck(seq=COUNTER_VALUE, status=0),
+        ])
+
+    async def test_send_command_reports_the_ack(self):
+        reader = asyncio.ensure_future(self.collect(1))
+        sending = asyncio.ensure_future(self.controller.send_command("low"))
+        (sent,) = await self.device_frames(1)
+        await self.reply(frame(OPCODE_MODE, bytes((frame_payload(memoryview(sent))[0], 0))))
+        success, message = await sending
+        self.assertTrue(success, message)
+        await reader
+
+    async def test_unacked_command_is_retransmitted_then_fails(self):
+        ack = await self.controller.send_command_tracked("low")
+        with self.assertRaises(AckTimeoutError):
+            await ack
+        sent = await self.device_frames(2)
+        self.assertEqual(sent[0], sent[1])
+
+    async def test_iterates_split_and_coalesced_frames(self):
+        reader = asyncio.ensure_future(self.collect(2))
+        data = BATTERY_FRAME * 2
+        await self.reply(data[:5])
+        await asyncio.sleep(0.01)
+        await self.reply(data[5:])
+        messages = await reader
+        self.assertEqual(len(messages), 2)
+        self.assertTrue(all(isinstance(m, BatteryStatus) for m in messages))
+
+    async def test_iteration_ends_when_peer_closes(self):
+        reader = asyncio.ensure_future(self.collect(1))
+        ack = await self.controller.send_command_tracked("low")
+        self.device.close()
+        self.assertEqual(await reader, [])
+        self.assertFalse(self.controller.connected)
+        with self.assertRaises(ConnectionError):
+            await ack
+
+    async def test_stop_ends_iteration_immediately(self):
+        reader = asyncio.ensure_future(self.collect(1))
+        await asyncio.sleep(0)
+        self.controller.stop()
+        self.assertEqual(await asyncio.wait_for(reader, 1), [])
+        self.assertFalse(self.controller.connected)
+
+
+if __name__ == "__main__":
+    unittest.main()
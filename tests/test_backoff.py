@@ -0,0 +1,37 @@
+"""Tests for the reconnect backoff schedule."""
+
+import unittest
+
+from bluetooth.backoff import Backoff
+
+
+class BackoffTest(unittest.TestCase):
+    def test_doubles_up_to_cap(self):
+        backoff = Backoff(base=1.0, cap=10.0, jitter=0.0)
+        self.assertEqual([backoff.next_delay() for _ in range(6)], [1.0, 2.0, 4.0, 8.0, 10.0, 10.0])
+        self.assertEqual(backoff.failures, 6)
+
+    def test_jitter_stays_within_range(self):
+        backoff = Backoff(base=4.0, cap=4.0, jitter=0.5, rng=lambda: 1.0)
+        self.assertEqual(backoff.next_delay(), 2.0)
+        backoff = Backoff(base=4.0, cap=4.0, jitter=0.5, rng=lambda: 0.0)
+        self.assertEqual(backoff.next_delay(), 4.0)
+
+    def test_many_failures_stay_at_cap(self):
+        backoff = Backoff(base=1.0, cap=60.0, jitter=0.0)
+        for _ in range(5000):
+            delay = backoff.next_delay()
+        self.assertEqual(delay, 60.0)
+        self.assertEqual(backoff.failures, 5000)
+
+    def test_reset(self):
+        backoff = Backoff(base=1.0, cap=60.0, jitter=0.0)
+        for _ in range(2000):
+            backoff.next_delay()
+        backoff.reset()
+        self.assertEqual(backoff.failures, 0)
+        self.assertEqual(backoff.next_delay(), 1.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
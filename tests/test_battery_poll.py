@@ -0,0 +1,48 @@
+"""Tests for the coalescing battery poll scheduler."""
+
+import threading
+import unittest
+
+from bluetooth.battery_poll import BatteryPollScheduler
+
+
+class BatteryPollSchedulerTest(unittest.TestCase):
+    def setUp(self):
+        self.sends = threading.Semaphore(0)
+        self.scheduler = BatteryPollScheduler(self.send, window=0.02, response_timeout=5.0)
+        self.addCleanup(self.scheduler.stop)
+
+    def send(self) -> bool:
+        self.sends.release()
+        return True
+
+    def test_triggers_in_window_send_once(self):
+        for _ in range(5):
+            self.scheduler.trigger()
+        self.assertTrue(self.sends.acquire(timeout=2))
+        self.assertFalse(self.sends.acquire(timeout=0.1))
+        self.assertEqual((self.scheduler.triggers, self.scheduler.sent, self.scheduler.suppressed), (5, 1, 4))
+
+        # Outstanding until the response arrives.
+        self.scheduler.trigger()
+        self.assertEqual(self.scheduler.suppressed, 5)
+        self.scheduler.on_response()
+        self.scheduler.trigger(immediate=True)
+        self.assertTrue(self.sends.acquire(timeout=2))
+
+    def test_trigger_after_stop_is_ignored(self):
+        self.scheduler.trigger(immediate=True)
+        self.assertTrue(self.sends.acquire(timeout=2))
+        thread = self.scheduler._thread
+        self.scheduler.stop()
+        thread.join(2)
+
+        self.scheduler.trigger(immediate=True)
+        self.assertIs(self.scheduler._thread, thread)
+        self.assertFalse(thread.is_alive())
+        self.assertEqual(self.scheduler.triggers, 1)
+        self.assertFalse(self.sends.acquire(timeout=0.05))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+"""BlueZMonitor against a fake BlueZ object tree on a private dbus-daemon."""
+
+import shutil
+import subprocess
+import threading
+import unittest
+
+from bluetooth.bluez import (
+    DEVICE_INTERFACE,
+    OBJECT_MANAGER_INTERFACE,
+    PROPERTIES_INTERFACE,
+    BlueZMonitor,
+)
+
+try:
+    from jeepney import DBusAddress, HeaderFields, MessageType, new_error, new_method_return, new_signal
+    from jeepney.bus_messages import message_bus
+    from jeepney.io.blocking import open_dbus_connection
+except ImportError:
+    open_dbus_connection = None
+
+BUS_NAME = "org.bluez.Test"
+DEVICE_PATH = "/org/bluez/hci0/dev_AA_BB_CC_DD_EE_01"
+OTHER_PATH = "/org/bluez/hci0/dev_AA_BB_CC_DD_EE_02"
+
+
+def device_props(address: str, alias: str, connected: bool) -> dict:
+    return {
+        "Address": ("s", address),
+        "Alias": ("s", alias),
+        "Connected": ("b", connected),
+    }
+
+
+class FakeBlueZ:
+    """Serves GetManagedObjects and emits Device1 signals on demand."""
+
+    def __init__(self, address: str, objects: dict):
+        self._objects = objects
+        self._conn = open_dbus_connection(bus=address)
+        self._conn.send_and_get_reply(message_bus.RequestName(BUS_NAME))
+        self._running = True
+        self._thread = threading.Thread(target=self._serve, daemon=True)
+        self._thread.start()
+
+    def _serve(self) -> None:
+        while self._running:
+            try:
+                msg = self._conn.receive(timeout=0.1)
+            except TimeoutError:
+                continue
+            except Exception:
+                return
+            if msg.header.message_type != MessageType.method_call:
+                continue
+            if msg.header.fields.get(HeaderFields.member) == "GetManagedObjects":
+                self._conn.send(new_method_return(msg, "a{oa{sa{sv}}}", (self._objects,)))
+            else:
+                self._conn.send(new_error(msg, "org.freedesktop.DBus.Error.UnknownMethod"))
+
+    def interfaces_added(self, path: str, props: dict) -> None:
+        emitter = DBusAddress("/", interface=OBJECT_MANAGER_INTERFACE)
+        self._conn.send(new_signal(
+            emitter, "InterfacesAdded", "oa{sa{sv}}", (path, {DEVICE_INTERFACE: props})
+        ))
+
+    def interfaces_removed(self, path: str) -> None:
+        emitter = DBusAddress("/", interface=OBJECT_MANAGER_INTERFACE)
+        self._conn.send(new_signal(emitter, "InterfacesRemoved", "oas", (path, [DEVICE_INTERFACE])))
+
+    def properties_changed(self, path: str, changed: dict, interface: str = DEVICE_INTERFACE) -> None:
+        emitter = DBusAddress(path, interface=PROPERTIES_INTERFACE)
+        self._conn.send(new_signal(
+            emitter, "PropertiesChanged", "sa{sv}as", (interface, changed, [])
+        ))
+
+    def close(self) -> None:
+        self._running = False
+        self._thread.join(1)
+        self._conn.close()
+
+
+@unittest.skipUnless(
+    open_dbus_connection is not None and shutil.which("dbus-daemon"),
+    "needs jeepney and dbus-daemon",
+)
+class BlueZMonitorTest(unittest.TestCase):
+    def setUp(self):
+        self._daemon = subprocess.Popen(
+            ["dbus-daemon", "--session", "--nofork", "--print-address=1"],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        self.address = self._daemon.stdout.readline().strip()
+        self.events = []
+        self._event = threading.Condition()
+        self.bluez = FakeBlueZ(self.address, {
+            "/org/bluez/hci0": {"org.bluez.Adapter1": {"Powered": ("b", True)}},
+            DEVICE_PATH: {DEVICE_INTERFACE: device_props("AA:BB:CC:DD:EE:01", "Buds", True)},
+        })
+        self.monitor = BlueZMonitor(
+            on_connected=lambda d: self._record("connected", d),
+            on_disconnected=lambda d: self._record("disconnected", d),
+            bus=self.address,
+            bus_name=BUS_NAME,
+        )
+
+    def tearDown(self):
+        self.monitor.stop()
+        self.bluez.close()
+        self._daemon.terminate()
+        self._daemon.wait(5)
+        self._daemon.stdout.close()
+
+    def _record(self, kind, device):
+        with self._event:
+            self.events.append((kind, device.address, device.name))
+            self._event.notify_all()
+
+    def wait_events(self, count: int) -> list:
+        with self._event:
+            self._event.wait_for(lambda: len(self.events) >= count, timeout=5)
+            return list(self.events)
+
+    def test_snapshot_reports_connected_device(self):
+        self.assertTrue(self.monitor.start())
+        self.assertTrue(self.monitor.wait_ready(5))
+        self.assertEqual(self.wait_events(1), [("connected", "AA:BB:CC:DD:EE:01", "Buds")])
+        self.assertEqual([d.address for d in self.monitor.connected_devices()], ["AA:BB:CC:DD:EE:01"])
+        self.assertEqual(self.monitor.device_name("aa:bb:cc:dd:ee:01"), "Buds")
+        self.assertEqual(self.monitor.device_name("AA:BB:CC:DD:EE:09"), "")
+
+    def test_replays_signals(self):
+        self.assertTrue(self.monitor.start())
+        self.assertTrue(self.monitor.wait_ready(5))
+
+        self.bluez.properties_changed(DEVICE_PATH, {"Connected": ("b", False)})
+        # Not a Device1 change: must be ignored.
+        self.bluez.properties_changed(DEVICE_PATH, {"Connected": ("b", True)}, "org.bluez.MediaControl1")
+        self.bluez.interfaces_added(OTHER_PATH, device_props("AA:BB:CC:DD:EE:02", "Other", True))
+        self.bluez.properties_changed(DEVICE_PATH, {"RSSI": ("n", -40)})
+        self.bluez.properties_changed(DEVICE_PATH, {"Connected": ("b", True)})
+        self.bluez.interfaces_removed(OTHER_PATH)
+
+        self.assertEqual(self.wait_events(5), [
+            ("connected", "AA:BB:CC:DD:EE:01", "Buds"),
+            ("disconnected", "AA:BB:CC:DD:EE:01", "Buds"),
+            ("connected", "AA:BB:CC:DD:EE:02", "Other"),
+            ("connected", "AA:BB:CC:DD:EE:01", "Buds"),
+            ("disconnected", "AA:BB:CC:DD:EE:02", "Other"),
+        ])
+
+
+if __name__ == "__main__":
+    unittest.main()
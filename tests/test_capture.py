@@ -0,0 +1,143 @@
+"""Tests for the capture ring and capture files."""
+
+import io
+import os
+import tempfile
+import unittest
+
+from bluetooth.capture import (
+    DIRECTION_RX,
+    DIRECTION_TX,
+    CaptureRecord,
+    CaptureRing,
+    CaptureWriter,
+    capture_clock_offset,
+    read_capture,
+    read_index,
+)
+
+
+def fill(ring: CaptureRing, count: int, size: int = 10) -> list[bytes]:
+    payloads = [bytes([i % 256]) * size for i in range(count)]
+    for i, payload in enumerate(payloads):
+        ring.record(DIRECTION_TX if i % 2 else DIRECTION_RX, payload)
+    return payloads
+
+
+class CaptureRingTest(unittest.TestCase):
+    def test_records_in_order(self):
+        ring = CaptureRing(size=1024)
+        ring.record(DIRECTION_TX, b"request")
+        ring.record(DIRECTION_RX, memoryview(b"reply"))
+        records = list(ring.records())
+        self.assertEqual([(r.direction, r.data) for r in records], [(DIRECTION_TX, b"request"), (DIRECTION_RX, b"reply")])
+        self.assertLessEqual(records[0].timestamp_ns, records[1].timestamp_ns)
+
+    def test_wraparound_keeps_newest_records(self):
+        ring = CaptureRing(size=256)
+        payloads = fill(ring, 100, size=13)
+        records = list(ring.records())
+        self.assertEqual(ring.total_records, 100)
+        self.assertEqual(len(ring), len(records))
+        self.assertLess(len(records), 100)
+        self.assertEqual([r.data for r in records], payloads[-len(records):])
+
+    def test_wraparound_with_mixed_sizes(self):
+        ring = CaptureRing(size=300)
+        payloads = []
+        for i in range(500):
+            payload = bytes([i % 256]) * (1 + i * 7 % 60)
+            ring.record(DIRECTION_RX, payload)
+            payloads.append(payload)
+            self.assertEqual([r.data for r in ring.records()], payloads[-len(ring):])
+
+    def test_long_buffer_is_truncated(self):
+        ring = CaptureRing(size=256)
+        ring.record(DIRECTION_RX, bytes(1000))
+        (record,) = ring.records()
+        self.assertLess(len(record.data), 256)
+
+    def test_clear(self):
+        ring = CaptureRing(size=256)
+        fill(ring, 5)
+        ring.clear()
+        self.assertEqual(list(ring.records()), [])
+        ring.record(DIRECTION_TX, b"after")
+        self.assertEqual([r.data for r in ring.records()], [b"after"])
+
+
+class CaptureFileTest(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self._dir.name, "capture.bin")
+
+    def tearDown(self):
+        self._dir.cleanup()
+
+    def test_dump_read_round_trip(self):
+        ring = CaptureRing(size=4096)
+        fill(ring, 20)
+        self.assertEqual(ring.dump(self.path), 20)
+
+        with open(self.path, "rb") as f:
+            records = list(read_capture(f))
+            index = read_index(f)
+        self.assertEqual(records, list(ring.records()))
+        self.assertEqual(index[0], (records[0].timestamp_ns, 20))
+        self.assertEqual(capture_clock_offset(self.path), ring.clock_offset)
+
+    def test_file_without_index_reads_linearly(self):
+        buffer = io.BytesIO()
+        writer = CaptureWriter(buffer, clock_offset=123)
+        writer.write(CaptureRecord(1, DIRECTION_TX, b"a"))
+        writer.write(CaptureRecord(2, DIRECTION_RX, b"bc"))
+        # No close(): no end marker and no footer index.
+        buffer.seek(0)
+        self.assertIsNone(read_index(buffer))
+        buffer.seek(0)
+        self.assertEqual([r.data for r in read_capture(buffer, start_ns=2)], [b"a", b"bc"])
+
+    def test_rejects_other_files(self):
+        with self.assertRaises(ValueError):
+            list(read_capture(io.BytesIO(b"not a capture file at all")))
+
+    def test_load_recovers_mmap_ring(self):
+        ring_path = self.path + ".ring"
+        ring = CaptureRing(size=512, path=ring_path)
+        payloads = fill(ring, 60)
+        offset = ring.clock_offset
+        expected = list(ring.records())
+        ring.close()
+
+        recovered = CaptureRing.load(ring_path)
+        self.assertEqual(list(recovered.records()), expected)
+        self.assertEqual([r.data for r in expected], payloads[-len(expected):])
+        self.assertEqual(recovered.total_records, 60)
+        self.assertEqual(recovered.clock_offset, offset)
+
+        # A ring from an earlier boot dumps with the offset it recorded.
+        recovered.clock_offset = offset - 10**12
+        recovered.dump(self.path)
+        self.assertEqual(capture_clock_offset(self.path), offset - 10**12)
+
+    def test_new_ring_keeps_previous_run(self):
+        ring_path = self.path + ".ring"
+        ring = CaptureRing(size=512, path=ring_path)
+        ring.record(DIRECTION_TX, b"previous run")
+        ring.close()
+
+        current = CaptureRing(size=512, path=ring_path)
+        self.assertEqual(list(current.records()), [])
+        current.close()
+        previous = CaptureRing.load(ring_path + ".prev")
+        self.assertEqual([r.data for r in previous.records()], [b"previous run"])
+
+    def test_load_rejects_other_files(self):
+        with open(self.path, "wb") as f:
+            f.write(bytes(128))
+        with self.assertRaises(ValueError):
+            CaptureRing.load(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
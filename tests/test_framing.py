@@ -0,0 +1,71 @@
+"""Tests for the streaming RFCOMM frame decoder."""
+
+import unittest
+
+from bluetooth.constants import BATTERY_PATTERN, FRAME_HEADER, FRAME_TRAILER
+from bluetooth.framing import FrameDecoder
+
+
+def frame(opcode: int, payload: bytes, flags: int = 0x04) -> bytes:
+    return FRAME_HEADER + bytes((flags, opcode)) + len(payload).to_bytes(2, "big") + payload + bytes((FRAME_TRAILER,))
+
+
+BATTERY_FRAME = frame(0x02, BATTERY_PATTERN + bytes((80, 0x80 | 75, 0xFF)))
+ACK_FRAME = frame(0xF2, bytes((0x01, 0x00)))
+
+
+def decode_all(decoder: FrameDecoder) -> list[bytes]:
+    return [bytes(frame) for frame in decoder.frames()]
+
+
+class FrameDecoderTest(unittest.TestCase):
+    def test_coalesced_frames(self):
+        decoder = FrameDecoder()
+        decoder.feed(BATTERY_FRAME + ACK_FRAME + BATTERY_FRAME)
+        self.assertEqual(decode_all(decoder), [BATTERY_FRAME, ACK_FRAME, BATTERY_FRAME])
+        self.assertEqual(decoder.buffered, 0)
+
+    def test_frame_split_byte_by_byte(self):
+        decoder = FrameDecoder()
+        frames = []
+        for byte in BATTERY_FRAME + ACK_FRAME:
+            decoder.feed(bytes((byte,)))
+            frames += decode_all(decoder)
+        self.assertEqual(frames, [BATTERY_FRAME, ACK_FRAME])
+
+    def test_recv_into_path(self):
+        decoder = FrameDecoder()
+        target = decoder.recv_buffer()
+        target[:len(ACK_FRAME)] = ACK_FRAME
+        decoder.commit(len(ACK_FRAME))
+        self.assertEqual(decode_all(decoder), [ACK_FRAME])
+
+    def test_resyncs_after_garbage(self):
+        decoder = FrameDecoder()
+        decoder.feed(b"\x00\xfe\xdc" + ACK_FRAME)
+        self.assertEqual(decode_all(decoder), [ACK_FRAME])
+        self.assertEqual(decoder.dropped_bytes, 3)
+
+    def test_bad_trailer_is_skipped(self):
+        broken = ACK_FRAME[:-1] + b"\x00"
+        decoder = FrameDecoder()
+        decoder.feed(broken + BATTERY_FRAME)
+        self.assertEqual(decode_all(decoder), [BATTERY_FRAME])
+
+    def test_wraps_around_small_buffer(self):
+        decoder = FrameDecoder(size=32)
+        frames = []
+        for _ in range(20):
+            decoder.feed(BATTERY_FRAME)
+            frames += decode_all(decoder)
+        self.assertEqual(frames, [BATTERY_FRAME] * 20)
+
+    def test_pending_keeps_unconsumed_bytes(self):
+        decoder = FrameDecoder()
+        decoder.feed(BATTERY_FRAME + ACK_FRAME[:4])
+        self.assertEqual(decode_all(decoder), [BATTERY_FRAME])
+        self.assertEqual(decoder.pending(), ACK_FRAME[:4])
+
+
+if __name__ == "__main__":
+    unittest.main()
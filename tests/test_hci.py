@@ -0,0 +1,109 @@
+"""Tests for HCI ioctl buffer decoding and device name lookup."""
+
+import os
+import struct
+import tempfile
+import unittest
+from unittest import mock
+
+from bluetooth import hci
+from bluetooth.discovery import BluetoothDiscovery
+
+
+def dev_list_buffer(dev_ids: list[int], capacity: int = hci.HCI_MAX_DEV) -> bytes:
+    buf = bytearray(struct.pack("=H2x", len(dev_ids)))
+    for i in range(capacity):
+        dev_id = dev_ids[i] if i < len(dev_ids) else 0
+        buf += struct.pack("=H2xI", dev_id, 0x1234)
+    return bytes(buf)
+
+
+def conn_list_buffer(dev_id: int, conns: list[tuple], capacity: int = hci.HCI_MAX_CONN) -> bytes:
+    buf = bytearray(struct.pack("=HH", dev_id, len(conns)))
+    for i in range(capacity):
+        if i < len(conns):
+            handle, address, link_type, out, state, link_mode = conns[i]
+            bdaddr = bytes.fromhex(address.replace(":", ""))[::-1]
+        else:
+            handle, bdaddr, link_type, out, state, link_mode = 0, bytes(6), 0, 0, 0, 0
+        buf += struct.pack("=H6sBBHI", handle, bdaddr, link_type, out, state, link_mode)
+    return bytes(buf)
+
+
+class HciDecodeTest(unittest.TestCase):
+    def test_struct_sizes_match_kernel_layout(self):
+        self.assertEqual(len(hci.build_dev_list_request()), 4 + 8 * hci.HCI_MAX_DEV)
+        self.assertEqual(len(hci.build_conn_list_request(0)), 4 + 16 * hci.HCI_MAX_CONN)
+
+    def test_request_headers(self):
+        self.assertEqual(struct.unpack_from("=H", hci.build_dev_list_request(4)), (4,))
+        self.assertEqual(struct.unpack_from("=HH", hci.build_conn_list_request(1, 8)), (1, 8))
+
+    def test_format_bdaddr_is_little_endian(self):
+        self.assertEqual(hci.format_bdaddr(bytes((0x66, 0x55, 0x44, 0x33, 0x22, 0x11))), "11:22:33:44:55:66")
+
+    def test_parse_dev_list(self):
+        self.assertEqual(hci.parse_dev_list(dev_list_buffer([0, 1])), [0, 1])
+        self.assertEqual(hci.parse_dev_list(dev_list_buffer([])), [])
+
+    def test_parse_dev_list_ignores_count_beyond_buffer(self):
+        buf = bytearray(dev_list_buffer([0, 1], capacity=2))
+        struct.pack_into("=H", buf, 0, 9)
+        self.assertEqual(hci.parse_dev_list(bytes(buf)), [0, 1])
+
+    def test_parse_conn_list(self):
+        buf = conn_list_buffer(1, [
+            (0x0B, "AA:BB:CC:DD:EE:01", hci.ACL_LINK, 1, 1, 0x0004),
+            (0x0C, "AA:BB:CC:DD:EE:02", hci.SCO_LINK, 0, 1, 0),
+        ])
+        first, second = hci.parse_conn_list(buf)
+        self.assertEqual(first, hci.HciConnection(
+            dev_id=1, address="AA:BB:CC:DD:EE:01", handle=0x0B, link_type=hci.ACL_LINK,
+            outgoing=True, state=1, link_mode=0x0004,
+        ))
+        self.assertEqual(second.address, "AA:BB:CC:DD:EE:02")
+        self.assertEqual(second.link_type, hci.SCO_LINK)
+        self.assertFalse(second.outgoing)
+
+    def test_parse_empty_conn_list(self):
+        self.assertEqual(hci.parse_conn_list(conn_list_buffer(0, [])), [])
+
+
+class NameLookupTest(unittest.TestCase):
+    def setUp(self):
+        self._known = dict(BluetoothDiscovery._known_names)
+
+    def tearDown(self):
+        BluetoothDiscovery.set_name_lookup(None)
+        BluetoothDiscovery._known_names.clear()
+        BluetoothDiscovery._known_names.update(self._known)
+
+    def test_reads_name_from_bluez_storage(self):
+        with tempfile.TemporaryDirectory() as storage:
+            device_dir = os.path.join(storage, "00:1A:7D:DA:71:13", "AA:BB:CC:DD:EE:01")
+            os.makedirs(device_dir)
+            with open(os.path.join(device_dir, "info"), "w") as f:
+                f.write("[General]\nName=Xiaomi Buds 6 Play\nTrusted=true\n")
+
+            name = BluetoothDiscovery._read_stored_name("aa:bb:cc:dd:ee:01", storage)
+            self.assertEqual(name, "Xiaomi Buds 6 Play")
+            self.assertEqual(BluetoothDiscovery._read_stored_name("AA:BB:CC:DD:EE:02", storage), "")
+
+    def test_lookup_prefers_live_then_remembered_names(self):
+        BluetoothDiscovery.remember_name("aa:bb:cc:dd:ee:01", "Remembered Buds")
+        BluetoothDiscovery.set_name_lookup({"AA:BB:CC:DD:EE:02": "Live Buds"}.get)
+        with tempfile.TemporaryDirectory() as storage:
+            lookup = BluetoothDiscovery._lookup_name_linux
+            self.assertEqual(lookup("AA:BB:CC:DD:EE:01", storage), "Remembered Buds")
+            self.assertEqual(lookup("AA:BB:CC:DD:EE:02", storage), "Live Buds")
+
+    def test_lookup_never_spawns_a_process(self):
+        conn = hci.parse_conn_list(conn_list_buffer(0, [(1, "AA:BB:CC:DD:EE:03", hci.ACL_LINK, 1, 1, 0)]))
+        with mock.patch.object(hci, "get_connections", return_value=conn), \
+                mock.patch("subprocess.check_output", side_effect=AssertionError("spawned")):
+            devices = BluetoothDiscovery._get_connected_devices_linux()
+        self.assertEqual([(d.name, d.address) for d in devices], [("", "AA:BB:CC:DD:EE:03")])
+
+
+if __name__ == "__main__":
+    unittest.main()
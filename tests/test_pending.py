@@ -0,0 +1,42 @@
+"""Tests for PendingRequests ack correlation."""
+
+import unittest
+
+from bluetooth.pending import PendingRequests
+
+
+class PendingRequestsTest(unittest.TestCase):
+    def setUp(self):
+        self.sent = []
+        self.pending = PendingRequests(self.sent.append, ack_timeout=60)
+
+    def tearDown(self):
+        self.pending.fail_all(ConnectionError("test finished"))
+
+    def test_resolves_matching_seq(self):
+        first = self.pending.submit(0x90, b"a")
+        second = self.pending.submit(0x91, b"b")
+        self.assertEqual(self.pending.resolve(0x91), 0x91)
+        self.assertTrue(second.done())
+        self.assertFalse(first.done())
+        self.assertEqual(self.sent, [b"a", b"b"])
+
+    def test_unmatched_seq_resolves_oldest(self):
+        first = self.pending.submit(0x90, b"a")
+        second = self.pending.submit(0x91, b"b")
+        self.assertEqual(self.pending.resolve(0x00), 0x90)
+        self.assertEqual(first.result().seq, 0x90)
+        self.assertEqual(self.pending.resolve(None), 0x91)
+        self.assertTrue(second.done())
+        self.assertIsNone(self.pending.resolve(0x00))
+
+    def test_repeated_ack_does_not_take_the_next_request(self):
+        self.pending.submit(0x90, b"a")
+        following = self.pending.submit(0x91, b"b")
+        self.assertEqual(self.pending.resolve(0x90), 0x90)
+        self.assertIsNone(self.pending.resolve(0x90))
+        self.assertFalse(following.done())
+
+
+if __name__ == "__main__":
+    unittest.main()
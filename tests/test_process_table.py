@@ -0,0 +1,108 @@
+"""Tests for the /proc process index, against a fixture proc root."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from tests import load_utils_module
+
+ProcessTable = load_utils_module("process_table").ProcessTable
+
+
+class FakeProc:
+    """Directory laid out like procfs with stat, comm, exe and cmdline per PID."""
+
+    def __init__(self):
+        self.root = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.root, "self"))
+
+    def add(self, pid: int, comm: str, argv: list[str], exe: str = None, starttime: int = 1000) -> None:
+        base = os.path.join(self.root, str(pid))
+        os.mkdir(base)
+        with open(os.path.join(base, "stat"), "w") as f:
+            # Fields 3-21 are not read; starttime is field 22.
+            f.write(f"{pid} ({comm[:15]}) S {' '.join(['0'] * 18)} {starttime} 0 0\n")
+        with open(os.path.join(base, "comm"), "w") as f:
+            f.write(comm[:15] + "\n")
+        with open(os.path.join(base, "cmdline"), "wb") as f:
+            f.write(b"".join(arg.encode() + b"\0" for arg in argv))
+        if exe:
+            os.symlink(exe, os.path.join(base, "exe"))
+
+    def remove(self, pid: int) -> None:
+        shutil.rmtree(os.path.join(self.root, str(pid)))
+
+    def cleanup(self) -> None:
+        shutil.rmtree(self.root)
+
+
+class ProcessTableTest(unittest.TestCase):
+    def setUp(self):
+        self.proc = FakeProc()
+        self.addCleanup(self.proc.cleanup)
+        self.proc.add(100, "firefox", ["/usr/lib/firefox/firefox", "-P"], exe="/usr/lib/firefox/firefox")
+        self.proc.add(101, "firefox-helper", ["/usr/bin/firefox-helper"])
+        self.proc.add(102, "vim", ["vim", "firefox.txt"])
+        self.proc.add(103, "cs2.exe", ["C:\\Games\\cs2\\cs2.exe"])
+        self.proc.add(104, "GameThread", ["/opt/game/bin/LinuxGame-Shipping"], exe="/opt/game/bin/LinuxGame-Shipping (deleted)")
+        self.table = ProcessTable(proc_root=self.proc.root)
+        self.table.refresh()
+
+    def test_exact_name_only(self):
+        self.assertEqual(self.table.find("firefox"), {100})
+        self.assertEqual(self.table.find("Firefox "), {100})
+        self.assertEqual(self.table.find("firefox-helper"), {101})
+        self.assertEqual(self.table.find("fire"), set())
+
+    def test_windows_image_names(self):
+        self.assertEqual(self.table.find("cs2.exe"), {103})
+        self.assertEqual(self.table.find("cs2"), {103})
+
+    def test_thread_named_comm_matches_exe_and_argv0(self):
+        self.assertEqual(self.table.find("linuxgame-shipping"), {104})
+        self.assertEqual(self.table.find("gamethread"), {104})
+        self.assertEqual(self.table.names(104), frozenset({"gamethread", "linuxgame-shipping"}))
+
+    def test_incremental_refresh(self):
+        self.assertEqual(len(self.table), 5)
+        self.proc.remove(100)
+        self.proc.add(200, "firefox", ["firefox"])
+        self.table.refresh()
+        self.assertEqual(self.table.find("firefox"), {200})
+        self.assertEqual(self.table.names(100), frozenset())
+        self.assertEqual(len(self.table), 5)
+
+    def test_known_pids_are_not_reread(self):
+        with open(os.path.join(self.proc.root, "102", "comm"), "w") as f:
+            f.write("nvim\n")
+        self.table.refresh()
+        self.assertEqual(self.table.find("nvim"), set())
+        self.assertEqual(self.table.find("vim"), {102})
+
+    def test_reused_pid_is_reread(self):
+        self.proc.remove(100)
+        self.proc.add(100, "cs2.exe", ["C:\\Games\\cs2\\cs2.exe"], starttime=2000)
+        self.table.refresh()
+        self.assertEqual(self.table.find("firefox"), set())
+        self.assertEqual(self.table.find("cs2"), {100, 103})
+        self.assertEqual(len(self.table), 5)
+
+    def test_comm_with_parentheses_and_spaces(self):
+        self.proc.add(105, "Web Content) x", ["/usr/lib/firefox/firefox", "-contentproc"], starttime=3000)
+        self.table.refresh()
+        self.assertEqual(self.table.find("web content) x"), {105})
+        self.proc.remove(105)
+        self.proc.add(105, "Web Content) x", ["/usr/bin/other"], starttime=3001)
+        self.table.refresh()
+        self.assertEqual(self.table.find("other"), {105})
+
+    def test_missing_proc_root(self):
+        table = ProcessTable(proc_root=os.path.join(self.proc.root, "missing"))
+        table.refresh()
+        self.assertEqual(len(table), 0)
+        self.assertEqual(table.find("firefox"), set())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,75 @@
+"""Tests for the process exit watcher, against real child processes."""
+
+import subprocess
+import sys
+import threading
+import unittest
+
+from tests import load_utils_module
+
+ProcessExitWatcher = load_utils_module("process_watcher").ProcessExitWatcher
+
+
+class ProcessExitWatcherTest(unittest.TestCase):
+    def setUp(self):
+        self.released: list[str] = []
+        self.release_event = threading.Event()
+        self.children: dict[str, subprocess.Popen] = {}
+        self.watcher = ProcessExitWatcher(self.find_pids, self.on_release, poll_interval=0.05)
+        self.addCleanup(self.watcher.stop)
+
+    def tearDown(self):
+        for child in self.children.values():
+            child.kill()
+            child.wait()
+
+    def spawn(self, app_id: str) -> subprocess.Popen:
+        child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+        self.children[app_id] = child
+        return child
+
+    def find_pids(self, app_id: str) -> set[int]:
+        child = self.children.get(app_id)
+        return {child.pid} if child and child.poll() is None else set()
+
+    def on_release(self, app_id: str) -> None:
+        self.released.append(app_id)
+        self.release_event.set()
+
+    def join(self) -> None:
+        thread = self.watcher._thread
+        self.watcher.stop()
+        if thread:
+            thread.join(2)
+            self.assertFalse(thread.is_alive())
+
+    def test_reports_release_when_process_exits(self):
+        child = self.spawn("game")
+        self.assertTrue(self.watcher.hold("game"))
+        self.assertEqual(self.watcher.held, {"game"})
+        child.kill()
+        child.wait()
+        self.assertTrue(self.release_event.wait(5))
+        self.assertEqual(self.released, ["game"])
+        self.assertEqual(self.watcher.held, set())
+
+    def test_hold_fails_without_process(self):
+        self.assertFalse(self.watcher.hold("missing"))
+        self.assertIsNone(self.watcher._thread)
+
+    def test_stop_closes_wake_pipe(self):
+        self.spawn("game")
+        self.assertTrue(self.watcher.hold("game"))
+        self.join()
+        self.assertEqual((self.watcher._wake_r, self.watcher._wake_w), (-1, -1))
+
+        # Holding again after stop() starts a new thread with a new pipe.
+        self.assertTrue(self.watcher.hold("game"))
+        self.assertTrue(self.watcher._thread.is_alive())
+        self.join()
+        self.assertEqual((self.watcher._wake_r, self.watcher._wake_w), (-1, -1))
+        self.assertEqual(self.released, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,45 @@
+"""Tests for decoding frames into protocol messages."""
+
+import unittest
+
+from bluetooth.constants import BATTERY_PATTERN, OPCODE_DEVICE_INFO, OPCODE_MODE
+from bluetooth.protocol import BatteryStatus, BudsProtocol, ModeAck, UnknownMessage
+from tests.test_framing import frame
+
+
+class ProtocolDecodeTest(unittest.TestCase):
+    def test_battery(self):
+        status = BudsProtocol.decode(frame(OPCODE_DEVICE_INFO, BATTERY_PATTERN + bytes((80, 0x80 | 75, 0xFF))))
+        self.assertIsInstance(status, BatteryStatus)
+        self.assertEqual((status.left, status.right, status.case), (80, 75, 0xFF))
+        self.assertTrue(status.right_charging)
+        self.assertFalse(status.case_charging)
+
+    def test_battery_record_after_other_records(self):
+        payload = bytes.fromhex("0101ff") + BATTERY_PATTERN + bytes((10, 20, 30))
+        status = BudsProtocol.decode(frame(OPCODE_DEVICE_INFO, payload))
+        self.assertEqual((status.left, status.right, status.case), (10, 20, 30))
+
+    def test_device_info_without_battery_record(self):
+        self.assertIsNone(BudsProtocol.decode(frame(OPCODE_DEVICE_INFO, bytes.fromhex("0101ff"))))
+
+    def test_truncated_battery_record(self):
+        self.assertIsNone(BudsProtocol.decode(frame(OPCODE_DEVICE_INFO, BATTERY_PATTERN + b"\x10")))
+        payload = bytes.fromhex("0101ff") + BATTERY_PATTERN + b"\x10\x20"
+        self.assertIsNone(BudsProtocol.decode(frame(OPCODE_DEVICE_INFO, payload)))
+
+    def test_mode_ack(self):
+        self.assertEqual(BudsProtocol.decode(frame(OPCODE_MODE, bytes((0x01, 0x00)))), ModeAck(seq=1, status=0))
+
+    def test_mode_ack_too_short_for_seq(self):
+        self.assertEqual(BudsProtocol.decode(frame(OPCODE_MODE, b"")), ModeAck(seq=None, status=0))
+
+    def test_unknown_opcode(self):
+        self.assertEqual(
+            BudsProtocol.decode(frame(0x51, b"\x01\x02", flags=0xC4)),
+            UnknownMessage(flags=0xC4, opcode=0x51, payload=b"\x01\x02"),
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,73 @@
+"""Tests for suspend/resume detection from clock drift."""
+
+import time
+import unittest
+
+from bluetooth.resume import ResumeDetector
+
+
+class FakeClocks:
+    """BOOTTIME - MONOTONIC drift that only grows when told to."""
+
+    def __init__(self):
+        self.drift = 100.0
+
+    def sleep(self, seconds: float) -> None:
+        self.drift += seconds
+
+    def read(self) -> float:
+        return self.drift
+
+
+def detector(clocks: FakeClocks, resumes: list, **kwargs) -> ResumeDetector:
+    resume = ResumeDetector(resumes.append, use_logind=False, **kwargs)
+    resume._read_drift = clocks.read
+    return resume
+
+
+@unittest.skipUnless(ResumeDetector.is_supported(), "needs CLOCK_BOOTTIME")
+class ResumeDetectorTest(unittest.TestCase):
+    def test_reports_sleep_once(self):
+        clocks, resumes = FakeClocks(), []
+        resume = detector(clocks, resumes, drift_threshold=2.0)
+        resume._drift = clocks.read()
+
+        resume._check()
+        clocks.sleep(30)
+        resume._check()
+        resume._check()
+        self.assertEqual(resumes, [30.0])
+
+    def test_ignores_drift_below_threshold(self):
+        clocks, resumes = FakeClocks(), []
+        resume = detector(clocks, resumes, drift_threshold=2.0)
+        resume._drift = clocks.read()
+
+        clocks.sleep(0.5)
+        resume._check()
+        self.assertEqual(resumes, [])
+
+    def test_clock_loop_fires_callback(self):
+        clocks, resumes = FakeClocks(), []
+        resume = detector(clocks, resumes, check_interval=0.01, drift_threshold=2.0)
+        resume.start()
+        try:
+            clocks.sleep(5)
+            deadline = time.monotonic() + 2
+            while not resumes and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            resume.stop()
+        self.assertEqual(resumes, [5.0])
+
+    def test_real_clocks_do_not_drift_while_awake(self):
+        resumes = []
+        resume = ResumeDetector(resumes.append, use_logind=False)
+        resume._drift = resume._read_drift()
+        time.sleep(0.05)
+        resume._check()
+        self.assertEqual(resumes, [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,134 @@
+"""BTController end to end against the earbuds simulator."""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from bluetooth.controller import BTController
+from bluetooth.handshake import HandshakeState
+from bluetooth.pending import AckTimeoutError
+from bluetooth.protocol import BatteryStatus
+from bluetooth.simulator import EarbudsSimulator, SimulatedConnection, SimulatorConfig
+
+ADDRESS = "00:00:00:00:00:01"
+EXPECTED_BATTERY = BatteryStatus(left=80, right=75, case=50, case_charging=True)
+
+
+class SimulatedControllerTest(unittest.TestCase):
+    def setUp(self):
+        # A fake sysfs tree with one adapter, so the listener does not wait
+        # for Bluetooth hardware.
+        self._sysfs = tempfile.TemporaryDirectory()
+        os.makedirs(os.path.join(self._sysfs.name, "class", "bluetooth", "hci0"))
+        self._changed = threading.Condition()
+        self.events: list[str] = []
+        self.batteries: list[BatteryStatus] = []
+        self.states = []
+        self.simulator = None
+        self.controller = None
+
+    def tearDown(self):
+        if self.controller:
+            self.controller.stop()
+            self._listener.join(5)
+        if self.simulator:
+            self.simulator.stop()
+        self._sysfs.cleanup()
+
+    def start(self, config: SimulatorConfig, ack_max_retries: int = 2) -> None:
+        self.simulator = EarbudsSimulator(config)
+        self.controller = BTController(
+            bd_addr=ADDRESS,
+            battery_callback=lambda status: self._record(self.batteries, status),
+            connection_event_callback=lambda event: self._record(self.events, event),
+            state_callback=lambda state: self._record(self.states, state),
+            ack_timeout=0.1,
+            ack_max_retries=ack_max_retries,
+            sysfs_root=self._sysfs.name,
+            connection_factory=lambda: SimulatedConnection(self.simulator),
+        )
+        self._listener = threading.Thread(target=self.controller.listen, daemon=True)
+        self._listener.start()
+        self.wait_for(lambda: self.controller.device_state.battery is not None)
+
+    def _record(self, target: list, item) -> None:
+        with self._changed:
+            target.append(item)
+            self._changed.notify_all()
+
+    def wait_for(self, predicate, timeout: float = 5.0) -> None:
+        with self._changed:
+            self.assertTrue(self._changed.wait_for(predicate, timeout), "condition not reached")
+
+    def poll(self, predicate, timeout: float = 1.0) -> None:
+        """Wait for state that changes without a callback."""
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            self.assertLess(time.monotonic(), deadline, "condition not reached")
+            time.sleep(0.001)
+
+    def set_low_latency(self, enabled: bool) -> None:
+        self.controller.set_low_latency(enabled)
+        self.wait_for(lambda: self.controller.device_state.low_latency == enabled)
+
+    def test_handshake_reaches_first_battery(self):
+        self.start(SimulatorConfig())
+        self.assertEqual(self.controller._handshake.state, HandshakeState.DONE)
+        self.assertIsNotNone(self.controller.metrics.connect_to_first_battery)
+        self.assertEqual(self.batteries[0], EXPECTED_BATTERY)
+        self.assertEqual(self.events, ["reconnecting", "connected"])
+
+    def test_mode_ack_confirms_state(self):
+        self.start(SimulatorConfig())
+        result = self.controller.send_command_tracked("low").result(2)
+        self.assertEqual(result.attempts, 1)
+        self.assertTrue(self.controller.device_state.low_latency)
+        self.assertTrue(self.simulator.low_latency)
+        self.set_low_latency(False)
+        self.assertFalse(self.simulator.low_latency)
+
+    def test_mode_ack_without_sequence_echo(self):
+        self.start(SimulatorConfig(ack_echoes_seq=False))
+        self.controller.send_command_tracked("low").result(2)
+        self.assertTrue(self.controller.device_state.low_latency)
+
+    def test_split_and_coalesced_replies_are_reassembled(self):
+        self.start(SimulatorConfig(split_size=3, split_gap=0.0005, coalesce_window=0.02))
+        self.assertEqual(self.batteries[0], EXPECTED_BATTERY)
+        first = self.controller.send_command_tracked("low")
+        second = self.controller.send_command_tracked("std")
+        self.assertEqual([first.result(2).attempts, second.result(2).attempts], [1, 1])
+        self.assertFalse(self.controller.device_state.low_latency)
+        self.assertTrue(self.controller.connected)
+
+    def test_dropped_commands_are_retransmitted(self):
+        self.start(SimulatorConfig())
+        self.simulator.config.drop_rate = 1.0
+        with self.assertRaises(AckTimeoutError):
+            self.controller.send_command_tracked("low").result(2)
+        self.assertEqual(self.simulator.dropped, 3)
+
+        # Lose only the first transmission: the retransmission gets acked.
+        ack = self.controller.send_command_tracked("low")
+        self.poll(lambda: self.simulator.dropped == 4)
+        self.simulator.config.drop_rate = 0.0
+        self.assertEqual(ack.result(2).attempts, 2)
+        self.assertTrue(self.controller.device_state.low_latency)
+
+    def test_reconnects_and_reapplies_mode_after_disconnect(self):
+        # The device drops the link on its third request: init packet,
+        # battery request, then the first mode command.
+        self.start(SimulatorConfig(disconnect_after=3))
+        self.controller.set_low_latency(True)
+        self.wait_for(lambda: "disconnected" in self.events)
+        self.simulator.config.disconnect_after = None
+        self.wait_for(lambda: self.events[-1] == "connected", timeout=10)
+        self.wait_for(lambda: self.controller.device_state.low_latency is True)
+        self.assertTrue(self.simulator.low_latency)
+        self.assertEqual(self.events, ["reconnecting", "connected", "disconnected", "reconnecting", "connected"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,214 @@
+"""Compositor IPC backends against fake servers replaying recorded streams."""
+
+import json
+import os
+import socket
+import tempfile
+import threading
+import time
+import unittest
+
+from tests import load_utils_module
+
+wayland = load_utils_module("wayland_fullscreen")
+
+# Recorded sway IPC traffic (trimmed to the fields the backend reads).
+SWAY_TREE = {
+    "type": "root",
+    "nodes": [{
+        "type": "workspace",
+        "nodes": [{"type": "con", "id": 5, "focused": True, "app_id": "foot", "pid": 1001, "fullscreen_mode": 0}],
+        "floating_nodes": [],
+    }],
+    "floating_nodes": [],
+}
+STEAM_GAME = {
+    "type": "con", "id": 7, "focused": True, "app_id": None, "pid": 2002,
+    "window_properties": {"class": "steam_app_730"}, "fullscreen_mode": 0,
+}
+SWAY_EVENTS = [
+    (wayland.I3_IPC_EVENT_WINDOW, {"change": "new", "container": dict(STEAM_GAME, focused=False)}),
+    (wayland.I3_IPC_EVENT_WINDOW, {"change": "focus", "container": STEAM_GAME}),
+    (wayland.I3_IPC_EVENT_WINDOW, {"change": "fullscreen_mode", "container": dict(STEAM_GAME, fullscreen_mode=1)}),
+    (wayland.I3_IPC_EVENT_WINDOW, {"change": "title", "container": dict(STEAM_GAME, fullscreen_mode=1)}),
+    (wayland.I3_IPC_EVENT_WINDOW, {"change": "close", "container": {"id": 7}}),
+    (wayland.I3_IPC_EVENT_WORKSPACE, {"change": "focus", "current": {"nodes": [], "floating_nodes": []}}),
+]
+
+# Recorded Hyprland socket2 lines and the matching j/activewindow replies.
+HYPRLAND_EVENTS = [
+    (b"activewindow>>cs2,Counter-Strike 2\nactivewindowv2>>55d0\n", {"class": "cs2", "fullscreen": 0, "pid": 3003}),
+    (b"fullscreen>>1\n", None),
+    (b"fullscreen>>0\nactivewin", None),
+    (b"dow>>,\n", {}),
+]
+
+
+def i3_message(message_type: int, payload: dict) -> bytes:
+    data = json.dumps(payload).encode()
+    return wayland.I3_IPC_HEADER.pack(wayland.I3_IPC_MAGIC, len(data), message_type) + data
+
+
+class FakeServer:
+    """Unix socket server running ``handler(conn)`` for each client."""
+
+    def __init__(self, path: str, handler):
+        self.path = path
+        self._handler = handler
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(path)
+        self._listener.listen()
+        threading.Thread(target=self._accept, daemon=True).start()
+
+    def _accept(self) -> None:
+        while True:
+            try:
+                conn, _ = self._listener.accept()
+            except OSError:
+                return
+            with conn:
+                try:
+                    self._handler(conn)
+                except OSError:
+                    pass
+
+    def close(self) -> None:
+        self._listener.close()
+
+
+class BackendTestCase(unittest.TestCase):
+    def setUp(self):
+        self._dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self._dir.cleanup)
+        self.states = []
+        self.exits = threading.Event()
+        self._changed = threading.Condition()
+
+    def socket_path(self, name: str) -> str:
+        return os.path.join(self._dir.name, name)
+
+    def on_state(self, is_fullscreen, app_id, pid=None):
+        with self._changed:
+            self.states.append((is_fullscreen, app_id, pid))
+            self._changed.notify_all()
+
+    def wait_states(self, count: int) -> list:
+        with self._changed:
+            self._changed.wait_for(lambda: len(self.states) >= count, timeout=5)
+            return list(self.states)
+
+
+class SwayIPCBackendTest(BackendTestCase):
+    def serve(self, conn: socket.socket, close_after: bool) -> None:
+        def read_request() -> int:
+            header = conn.recv(wayland.I3_IPC_HEADER.size, socket.MSG_WAITALL)
+            _, length, message_type = wayland.I3_IPC_HEADER.unpack(header)
+            if length:
+                conn.recv(length, socket.MSG_WAITALL)
+            return message_type
+
+        self.assertEqual(read_request(), wayland.I3_IPC_GET_TREE)
+        conn.sendall(i3_message(wayland.I3_IPC_GET_TREE, SWAY_TREE))
+        self.assertEqual(read_request(), wayland.I3_IPC_SUBSCRIBE)
+
+        # The subscribe reply and the first event share a write; the last
+        # event is split across two writes.
+        stream = i3_message(wayland.I3_IPC_SUBSCRIBE, {"success": True})
+        stream += b"".join(i3_message(t, event) for t, event in SWAY_EVENTS)
+        conn.sendall(stream[:-10])
+        time.sleep(0.05)
+        conn.sendall(stream[-10:])
+        if not close_after:
+            self.stopped.wait(5)
+
+    def start_backend(self, close_after: bool):
+        self.stopped = threading.Event()
+        path = self.socket_path("sway.sock")
+        server = FakeServer(path, lambda conn: self.serve(conn, close_after))
+        self.addCleanup(server.close)
+        backend = wayland.SwayIPCBackend(self.on_state, socket_path=path, on_exit=self.exits.set)
+        self.assertTrue(backend.start())
+        return backend
+
+    def test_replays_focus_and_fullscreen(self):
+        backend = self.start_backend(close_after=False)
+        try:
+            states = self.wait_states(5)
+        finally:
+            backend.stop()
+            self.stopped.set()
+        self.assertEqual(states, [
+            (False, "foot", 1001),
+            (False, "steam_app_730", 2002),
+            (True, "steam_app_730", 2002),
+            (False, "", None),
+            (False, "", None),
+        ])
+        backend._thread.join(2)
+        self.assertFalse(self.exits.is_set())
+        self.assertEqual((backend._wake_r, backend._wake_w), (-1, -1))
+
+    def test_reports_exit_when_stream_closes(self):
+        backend = self.start_backend(close_after=True)
+        self.assertTrue(self.exits.wait(5))
+        backend._thread.join(2)
+        self.assertEqual((backend._wake_r, backend._wake_w), (-1, -1))
+
+    def test_start_fails_without_socket(self):
+        backend = wayland.SwayIPCBackend(self.on_state, socket_path=self.socket_path("missing.sock"))
+        self.assertFalse(backend.start())
+
+
+class HyprlandIPCBackendTest(BackendTestCase):
+    def test_replays_event_stream(self):
+        active = [{"class": "kitty", "fullscreen": 0, "pid": 1001}]
+        step = threading.Semaphore(0)
+
+        def serve_requests(conn):
+            conn.recv(64)
+            conn.sendall(json.dumps(active[0]).encode())
+
+        def serve_events(conn):
+            for data, reply in HYPRLAND_EVENTS:
+                step.acquire(timeout=5)
+                if reply is not None:
+                    active[0] = reply
+                conn.sendall(data)
+            self.stopped.wait(5)
+
+        self.stopped = threading.Event()
+        requests = FakeServer(self.socket_path(".socket.sock"), serve_requests)
+        events = FakeServer(self.socket_path(".socket2.sock"), serve_events)
+        self.addCleanup(requests.close)
+        self.addCleanup(events.close)
+
+        backend = wayland.HyprlandIPCBackend(
+            self.on_state,
+            socket_path=events.path,
+            request_socket_path=requests.path,
+            on_exit=self.exits.set,
+        )
+        self.assertTrue(backend.start())
+        try:
+            # Each recorded chunk yields one state; send the next only after it.
+            for count in range(1, len(HYPRLAND_EVENTS) + 1):
+                self.wait_states(count)
+                step.release()
+            states = self.wait_states(len(HYPRLAND_EVENTS) + 1)
+        finally:
+            backend.stop()
+            self.stopped.set()
+
+        self.assertEqual(states, [
+            (False, "kitty", 1001),
+            (False, "cs2", 3003),
+            (True, "cs2", 3003),
+            (False, "cs2", 3003),
+            (False, "", None),
+        ])
+        backend._thread.join(2)
+        self.assertFalse(self.exits.is_set())
+
+
+if __name__ == "__main__":
+    unittest.main()
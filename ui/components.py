@@ -7,7 +7,7 @@ from utils.resource_manager import get_resource_path
 
 from .constants import (
     COLOR_DISABLED, COLOR_CHARGING, COLOR_BATTERY, COLOR_BATTERY_LOW, COLOR_BG, COLOR_CARD_BG,
-    COLOR_TEXT_PRIMARY, COLOR_DIVIDER, BATTERY_UNKNOWN, BATTERY_CHARGING_OFFSET,
+    COLOR_TEXT_PRIMARY, COLOR_DIVIDER, BATTERY_UNKNOWN,
     BATTERY_LOW_THRESHOLD,
     ICON_BUTTON_SIZE, DEVICE_IMAGE_SIZE, CARD_BORDER_RADIUS, ICON_BORDER_RADIUS, DEVICE_IMAGE_PATH,
     TRAY_ICON_PATH
@@ -31,21 +31,18 @@ class BatteryIndicator(ft.Column):
             tight=True,
         )
     
-    def update_value(self, raw_value: int) -> None:
-        """Update the battery display with a raw value."""
-        text, color = self._format_battery(raw_value)
+    def update_value(self, level: int, is_charging: bool = False) -> None:
+        """Update the battery display with a level and charging flag."""
+        text, color = self._format_battery(level, is_charging)
         self._value_text.value = text
         self._value_text.color = color
     
     @staticmethod
-    def _format_battery(val: int) -> tuple[str, str]:
+    def _format_battery(actual_val: int, is_charging: bool) -> tuple[str, str]:
         """Format battery value for display. Returns (text, color)."""
-        if val == BATTERY_UNKNOWN:
+        if actual_val == BATTERY_UNKNOWN:
             return "---", COLOR_DISABLED
         
-        is_charging = val >= BATTERY_CHARGING_OFFSET
-        actual_val = val - BATTERY_CHARGING_OFFSET if is_charging else val
-        
         if actual_val > 100:
             return "---", COLOR_DISABLED
         
@@ -90,11 +87,18 @@ class BatteryPanel(ft.Container):
             expand=True,
         )
     
-    def update_all(self, left: int, right: int, case: int) -> None:
+    def update_all(
+        self,
+        left: int,
+        right: int,
+        case: int,
+        charging: tuple[bool, bool, bool] = (False, False, False),
+    ) -> None:
         """Update all battery indicators."""
-        self._left.update_value(left)
-        self._right.update_value(right)
-        self._case.update_value(case)
+        left_charging, right_charging, case_charging = charging
+        self._left.update_value(left, left_charging)
+        self._right.update_value(right, right_charging)
+        self._case.update_value(case, case_charging)
 
 
 # ─────────────────────────────────────────────────────────────────────────────
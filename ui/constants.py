@@ -28,7 +28,6 @@ COLOR_DIVIDER = "white10"
 # Battery
 # ─────────────────────────────────────────────────────────────────────────────
 BATTERY_UNKNOWN = 0xFF
-BATTERY_CHARGING_OFFSET = 128
 BATTERY_LOW_THRESHOLD = 20
 
 # ─────────────────────────────────────────────────────────────────────────────
@@ -15,4 +15,6 @@ from .user_preferences import (
 	set_low_latency_mode,
 	get_low_latency_hold_until_app_close,
 	set_low_latency_hold_until_app_close,
+	get_last_known_device,
+	set_last_known_device,
 )
@@ -7,45 +7,131 @@ import re
 import subprocess
 import threading
 import time
-from typing import Callable, Optional
+from typing import Callable, Optional, Sequence
+
+from .wayland_fullscreen import HyprlandIPCBackend, SwayIPCBackend
+from .x11_fullscreen import MonitorLayout, X11FullscreenBackend, parse_xrandr_monitors
+
+_XRANDR_REFRESH_INTERVAL = 30.0
 
 
 class FullscreenGameMonitor:
-    """Poll foreground state and notify on stable transitions or app changes."""
+    """Notify on stable fullscreen transitions or foreground app changes.
+
+    Event-driven backends (compositor IPC, then X11 property events) are tried first and
+    report changes as they happen; when none is available the monitor falls
+    back to polling with external tools. If a running backend's stream ends,
+    the monitor polls and tries the backends again every
+    ``backend_retry_interval`` seconds.
+
+    ``on_fullscreen_change`` receives ``(is_fullscreen, app_id, pid)``; ``pid``
+    is the foreground window's process when the window system reports it,
+    else None.
+    """
 
     def __init__(
         self,
-        on_fullscreen_change: Callable[[bool, str], None],
+        on_fullscreen_change: Callable[[bool, str, Optional[int]], None],
         on_log: Optional[Callable[[str], None]] = None,
         poll_interval: float = 1.5,
         stable_polls: int = 2,
+        backends: Optional[Sequence[type]] = None,
+        backend_retry_interval: float = 30.0,
     ):
         self._on_fullscreen_change = on_fullscreen_change
         self._on_log = on_log
         self._poll_interval = poll_interval
         self._stable_polls = max(1, stable_polls)
+        if backends is None:
+            backends = _default_backends()
+        self._backend_types = list(backends)
+        self._backend_retry_interval = backend_retry_interval
+        self._retry_backends_at: Optional[float] = None
 
         self._running = False
         self._thread: Optional[threading.Thread] = None
+        self._backend = None
+        self._backend_lock = threading.Lock()
         self._current_state = False
         self._last_raw_state: Optional[bool] = None
         self._stable_count = 0
         self._unsupported_logged = False
         self._last_app_id = ""
+        self._poll_pid: Optional[int] = None
+        self._xrandr_layout = MonitorLayout()
+        self._xrandr_layout_at = 0.0
 
     def start(self) -> None:
         if self._running:
             return
 
         self._running = True
-        self._thread = threading.Thread(target=self._run_loop, daemon=True)
-        self._thread.start()
+        if not self._start_backend():
+            self._start_polling()
 
     def stop(self) -> None:
-        self._running = False
+        with self._backend_lock:
+            self._running = False
+            backend, self._backend = self._backend, None
+        if backend is not None:
+            backend.stop()
+
+    def _start_backend(self) -> bool:
+        for backend_type in self._backend_types:
+            if not backend_type.is_available():
+                continue
+            backend = backend_type(self._on_backend_state, self._on_log, on_exit=self._on_backend_exit)
+            with self._backend_lock:
+                if not self._running:
+                    return True
+                self._backend = backend
+            if backend.start():
+                self._log(f"Fullscreen detection using {backend_type.__name__}.")
+                return True
+            with self._backend_lock:
+                self._backend = None
+        return False
+
+    def _start_polling(self) -> None:
+        with self._backend_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._thread = threading.Thread(target=self._run_loop, daemon=True)
+            self._thread.start()
+
+    def _on_backend_exit(self) -> None:
+        with self._backend_lock:
+            if not self._running:
+                return
+            self._backend = None
+            self._retry_backends_at = time.monotonic() + self._backend_retry_interval
+        self._log("Fullscreen event stream ended; polling until it comes back.")
+        self._start_polling()
+
+    def _on_backend_state(self, is_fullscreen: bool, app_id: str, pid: Optional[int] = None) -> None:
+        # Backends only report when the window system says something changed,
+        # so there is nothing to debounce; just drop repeats.
+        with self._backend_lock:
+            if not self._running:
+                return
+            if is_fullscreen == self._current_state and app_id == self._last_app_id:
+                return
+            self._current_state = is_fullscreen
+            self._last_app_id = app_id
+        self._on_fullscreen_change(is_fullscreen, app_id, pid)
 
     def _run_loop(self) -> None:
         while self._running:
+            if self._retry_backends_at is not None and time.monotonic() >= self._retry_backends_at:
+                self._retry_backends_at = time.monotonic() + self._backend_retry_interval
+                if self._start_backend():
+                    with self._backend_lock:
+                        # Keep polling if the new stream already ended again.
+                        if self._backend is not None or not self._running:
+                            self._retry_backends_at = None
+                            self._thread = None
+                            return
+
             raw_state, app_id = self._detect_fullscreen_state()
             if raw_state is None:
                 if not self._unsupported_logged:
@@ -67,7 +153,7 @@ class FullscreenGameMonitor:
                 if state_changed or app_changed:
                     self._current_state = raw_state
                     self._last_app_id = app_id
-                    self._on_fullscreen_change(raw_state, app_id)
+                    self._on_fullscreen_change(raw_state, app_id, self._poll_pid)
 
             time.sleep(self._poll_interval)
 
@@ -171,6 +257,7 @@ class FullscreenGameMonitor:
             return None, ""
 
     def _detect_linux_fullscreen(self) -> tuple[Optional[bool], str]:
+        self._poll_pid = None
         # Wayland sessions commonly hide this info from xprop/xwininfo.
         if os.getenv("WAYLAND_DISPLAY"):
             return None, ""
@@ -191,13 +278,17 @@ class FullscreenGameMonitor:
             if win_id == "0x0":
                 return False, ""
 
-            wm_class = subprocess.run(
-                ["xprop", "-id", win_id, "WM_CLASS"],
+            props = subprocess.run(
+                ["xprop", "-id", win_id, "WM_CLASS", "_NET_WM_STATE", "_NET_WM_PID"],
                 capture_output=True,
                 text=True,
                 check=False,
             )
-            app_id = _extract_wm_class(wm_class.stdout)
+            wm_class = next((line for line in props.stdout.splitlines() if line.startswith("WM_CLASS")), "")
+            app_id = _extract_wm_class(wm_class)
+            self._poll_pid = _extract_int(props.stdout, r"_NET_WM_PID\(CARDINAL\) = (\d+)")
+            if "_NET_WM_STATE_FULLSCREEN" in props.stdout:
+                return True, app_id
 
             wininfo = subprocess.run(
                 ["xwininfo", "-id", win_id],
@@ -215,31 +306,24 @@ class FullscreenGameMonitor:
             if None in (x, y, width, height):
                 return None, app_id
 
-            screen = subprocess.run(
-                ["xrandr", "--current"],
-                capture_output=True,
-                text=True,
-                check=False,
-            )
-            if screen.returncode != 0:
-                return None, app_id
-
-            sm = re.search(r"(\d+)x(\d+)\s+\d+\.\d+\*", screen.stdout)
-            if not sm:
-                sm = re.search(r"current\s+(\d+)\s+x\s+(\d+)", screen.stdout)
-            if not sm:
-                return None, app_id
-
-            screen_w = int(sm.group(1))
-            screen_h = int(sm.group(2))
-            tolerance = 4
-            is_fullscreen = (
-                abs(x) <= tolerance
-                and abs(y) <= tolerance
-                and abs(width - screen_w) <= tolerance
-                and abs(height - screen_h) <= tolerance
-            )
-            return is_fullscreen, app_id
+            # Without RandR events the layout is re-read on a slow timer
+            # instead of on every poll.
+            now = time.monotonic()
+            if not self._xrandr_layout.monitors or now - self._xrandr_layout_at >= _XRANDR_REFRESH_INTERVAL:
+                screen = subprocess.run(
+                    ["xrandr", "--current"],
+                    capture_output=True,
+                    text=True,
+                    check=False,
+                )
+                if screen.returncode != 0:
+                    return None, app_id
+                self._xrandr_layout.update(parse_xrandr_monitors(screen.stdout))
+                self._xrandr_layout_at = now
+                if not self._xrandr_layout.monitors:
+                    return None, app_id
+
+            return self._xrandr_layout.is_fullscreen((x, y, width, height)), app_id
         except FileNotFoundError:
             return None, ""
         except Exception as e:
@@ -270,5 +354,11 @@ def _extract_wm_class(output: str) -> str:
     return parts[-1]
 
 
+def _default_backends() -> list[type]:
+    if sys_platform_startswith("linux"):
+        return [SwayIPCBackend, HyprlandIPCBackend, X11FullscreenBackend]
+    return []
+
+
 def sys_platform_startswith(prefix: str) -> bool:
     return os.sys.platform.startswith(prefix)
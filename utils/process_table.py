@@ -0,0 +1,131 @@
+"""In-process index of running processes read from procfs."""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from typing import Optional
+
+
+class ProcessTable:
+    """Map executable names to PIDs without spawning ``pgrep``.
+
+    Each process is indexed under the lowercased basename of its
+    ``/proc/<pid>/comm``, ``exe`` link and ``argv[0]``, with and without a
+    trailing ``.exe`` so Wine/Proton games match their Windows image name.
+    ``refresh()`` lists ``proc_root`` and reads each PID's start time from
+    ``/proc/<pid>/stat``; names are only read for PIDs that appeared since
+    the last scan or whose start time changed (the PID was reused).
+    Vanished PIDs are dropped from the index.
+    ``find()`` is then a dictionary lookup.
+
+    Args:
+        proc_root: procfs mount to read, e.g. a fixture directory in tests
+    """
+
+    def __init__(self, proc_root: str = "/proc"):
+        self._proc_root = proc_root
+        self._lock = threading.Lock()
+        self._names_by_pid: dict[int, frozenset[str]] = {}
+        # Entries are keyed on (pid, start time); a new start time is a new process.
+        self._starttimes: dict[int, int] = {}
+        self._pids_by_name: dict[str, set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._names_by_pid)
+
+    def refresh(self) -> None:
+        """Bring the index up to date with the PIDs present now."""
+        try:
+            current = {int(entry.name) for entry in os.scandir(self._proc_root) if entry.name.isdigit()}
+        except OSError:
+            current = set()
+
+        with self._lock:
+            for pid in self._names_by_pid.keys() - current:
+                self._remove_locked(pid)
+            for pid in current:
+                starttime = self._read_starttime(pid)
+                if starttime is not None and self._starttimes.get(pid) == starttime:
+                    continue
+                # New, reused or just exited: drop what was indexed under the PID.
+                self._remove_locked(pid)
+                names = None if starttime is None else self._read_names(pid)
+                if names is None:
+                    continue
+                self._names_by_pid[pid] = names
+                self._starttimes[pid] = starttime
+                for name in names:
+                    self._pids_by_name.setdefault(name, set()).add(pid)
+
+    def find(self, name: str) -> set[int]:
+        """PIDs whose executable name is exactly ``name`` (case-insensitive)."""
+        with self._lock:
+            return set(self._pids_by_name.get((name or "").strip().lower(), ()))
+
+    def names(self, pid: int) -> frozenset[str]:
+        """Names ``pid`` is indexed under."""
+        with self._lock:
+            return self._names_by_pid.get(pid, frozenset())
+
+    def _remove_locked(self, pid: int) -> None:
+        self._starttimes.pop(pid, None)
+        for name in self._names_by_pid.pop(pid, ()):
+            pids = self._pids_by_name.get(name)
+            if pids is not None:
+                pids.discard(pid)
+                if not pids:
+                    del self._pids_by_name[name]
+
+    def _read_starttime(self, pid: int) -> Optional[int]:
+        try:
+            with open(os.path.join(self._proc_root, str(pid), "stat"), "rb") as f:
+                stat = f.read()
+        except OSError:
+            # The process exited between the listing and the read.
+            return None
+        # comm (field 2) may contain spaces and ")"; starttime is field 22.
+        fields = stat.rpartition(b")")[2].split()
+        try:
+            return int(fields[19])
+        except (IndexError, ValueError):
+            return None
+
+    def _read_names(self, pid: int) -> Optional[frozenset[str]]:
+        base = os.path.join(self._proc_root, str(pid))
+        candidates = []
+        try:
+            with open(os.path.join(base, "comm"), "rb") as f:
+                candidates.append(f.read().rstrip(b"\n").decode("utf-8", "replace"))
+        except OSError:
+            # The process exited between the listing and the read.
+            return None
+
+        try:
+            # Deleted binaries (e.g. after an update) read as "path (deleted)".
+            candidates.append(os.readlink(os.path.join(base, "exe")).removesuffix(" (deleted)"))
+        except OSError:
+            # Other users' processes hide their exe link.
+            pass
+
+        try:
+            with open(os.path.join(base, "cmdline"), "rb") as f:
+                argv0 = f.read(4096).split(b"\0", 1)[0]
+            candidates.append(argv0.decode("utf-8", "replace"))
+        except OSError:
+            pass
+
+        names = set()
+        for candidate in candidates:
+            name = _basename(candidate)
+            if name:
+                names.add(name)
+                if name.endswith(".exe") and len(name) > 4:
+                    names.add(name[:-4])
+        return frozenset(names)
+
+
+def _basename(path: str) -> str:
+    # argv[0] of Wine processes may be a Windows path.
+    return re.split(r"[\\/]", path.strip())[-1].lower()
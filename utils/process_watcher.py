@@ -0,0 +1,233 @@
+"""Wait for tracked apps to exit without polling where the kernel allows it."""
+
+from __future__ import annotations
+
+import logging
+import os
+import select
+import threading
+from typing import Callable, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class ProcessExitWatcher:
+    """Hold any number of apps and report each one once its last process exits.
+
+    On Linux 5.3+ every matching process gets a pidfd and the watcher thread
+    sleeps in ``poll()`` until one of them becomes readable, i.e. the process
+    exited. When an app's last known process goes away the app is looked up
+    once more, so a relaunch or a second instance keeps the hold. Without
+    pidfd support, processes are checked under ``proc_root`` every
+    ``poll_interval`` seconds; where there is no procfs the app lookup itself
+    is repeated instead.
+
+    Args:
+        find_pids: Returns the PIDs currently matching an app id
+        on_release: Called from the watcher thread with an app id whose
+            processes have all exited
+        poll_interval: Seconds between checks when pidfds are unavailable
+        proc_root: procfs mount used by the fallback
+    """
+
+    def __init__(
+        self,
+        find_pids: Callable[[str], set[int]],
+        on_release: Callable[[str], None],
+        poll_interval: float = 2.0,
+        proc_root: str = "/proc",
+    ):
+        self._find_pids = find_pids
+        self._on_release = on_release
+        self._poll_interval = poll_interval
+        self._proc_root = proc_root
+        self._use_pidfd = hasattr(os, "pidfd_open") and hasattr(select, "poll")
+
+        self._lock = threading.Lock()
+        # app id -> pid -> pidfd (None when the pid is checked by polling)
+        self._apps: dict[str, dict[int, Optional[int]]] = {}
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._wake = threading.Event()
+        # Open while the watcher thread runs; it closes the pipe on exit.
+        self._wake_r = self._wake_w = -1
+
+    @property
+    def held(self) -> set[str]:
+        """App ids currently held."""
+        with self._lock:
+            return set(self._apps)
+
+    def hold(self, app_id: str, pid: Optional[int] = None) -> bool:
+        """Start holding ``app_id``.
+
+        Args:
+            app_id: App id as reported by the fullscreen monitor
+            pid: Process of the app's window, used when no process matches
+                ``app_id`` by name (e.g. a WM_CLASS like ``steam_app_730``)
+
+        Returns:
+            False if neither the name nor ``pid`` matches a running process
+        """
+        pids = self._find_pids(app_id)
+        if not pids and pid:
+            pids = {pid}
+        if not pids:
+            return False
+
+        with self._lock:
+            tracked = self._apps.setdefault(app_id, {})
+            self._track_locked(tracked, pids)
+            if not tracked:
+                del self._apps[app_id]
+                return False
+            if not self._running:
+                self._running = True
+                if self._use_pidfd and self._wake_r < 0:
+                    self._wake_r, self._wake_w = os.pipe()
+                    # _wakeup writes under the lock; a full pipe must not block.
+                    os.set_blocking(self._wake_w, False)
+                self._thread = threading.Thread(target=self._run, name="process-watcher", daemon=True)
+                self._thread.start()
+        self._wakeup()
+        return True
+
+    def release(self, app_id: str) -> None:
+        """Stop holding ``app_id`` without reporting it."""
+        with self._lock:
+            self._close_locked(self._apps.pop(app_id, {}))
+        self._wakeup()
+
+    def clear(self) -> None:
+        """Stop holding every app."""
+        with self._lock:
+            for tracked in self._apps.values():
+                self._close_locked(tracked)
+            self._apps.clear()
+        self._wakeup()
+
+    def stop(self) -> None:
+        """Drop all holds and end the watcher thread."""
+        with self._lock:
+            self._running = False
+        self.clear()
+
+    def _track_locked(self, tracked: dict[int, Optional[int]], pids: set[int]) -> None:
+        for pid in pids - tracked.keys():
+            pidfd = None
+            if self._use_pidfd:
+                try:
+                    pidfd = os.pidfd_open(pid)
+                except ProcessLookupError:
+                    continue
+                except OSError:
+                    # ENOSYS/EPERM: keep the pid, but check it by polling.
+                    pidfd = None
+            tracked[pid] = pidfd
+
+    @staticmethod
+    def _close_locked(tracked: dict[int, Optional[int]]) -> None:
+        for pidfd in tracked.values():
+            if pidfd is not None:
+                os.close(pidfd)
+
+    def _wakeup(self) -> None:
+        self._wake.set()
+        with self._lock:
+            if self._wake_w >= 0:
+                try:
+                    os.write(self._wake_w, b"\0")
+                except OSError:
+                    pass
+
+    def _run(self) -> None:
+        current = threading.current_thread()
+        while True:
+            with self._lock:
+                if self._thread is not current:
+                    # hold() after stop() started a new thread before this
+                    # one noticed; the new thread owns the pipe.
+                    return
+                if not self._running:
+                    self._thread = None
+                    if self._wake_r >= 0:
+                        os.close(self._wake_r)
+                        os.close(self._wake_w)
+                        self._wake_r = self._wake_w = -1
+                    return
+                wake_r = self._wake_r
+                pidfds = {
+                    pidfd: (app_id, pid)
+                    for app_id, tracked in self._apps.items()
+                    for pid, pidfd in tracked.items()
+                    if pidfd is not None
+                }
+                polled = [
+                    (app_id, pid)
+                    for app_id, tracked in self._apps.items()
+                    for pid, pidfd in tracked.items()
+                    if pidfd is None
+                ]
+
+            exited = self._wait(wake_r, pidfds, self._poll_interval if polled else None)
+            exited += [(app_id, pid) for app_id, pid in polled if not self._pid_alive(pid)]
+            if exited:
+                self._forget(exited)
+
+    def _wait(
+        self, wake_r: int, pidfds: dict[int, tuple[str, int]], timeout: Optional[float]
+    ) -> list[tuple[str, int]]:
+        if not self._use_pidfd:
+            self._wake.wait(timeout)
+            self._wake.clear()
+            return []
+
+        poller = select.poll()
+        poller.register(wake_r, select.POLLIN)
+        for pidfd in pidfds:
+            poller.register(pidfd, select.POLLIN)
+
+        exited = []
+        for fd, _ in poller.poll(None if timeout is None else int(timeout * 1000)):
+            if fd == wake_r:
+                os.read(wake_r, 4096)
+            elif fd in pidfds:
+                exited.append(pidfds[fd])
+        return exited
+
+    def _pid_alive(self, pid: int) -> bool:
+        if os.path.isdir(self._proc_root):
+            return os.path.exists(os.path.join(self._proc_root, str(pid)))
+        # No procfs (e.g. Windows): let the app lookup decide.
+        return False
+
+    def _forget(self, exited: list[tuple[str, int]]) -> None:
+        emptied = set()
+        with self._lock:
+            for app_id, pid in exited:
+                tracked = self._apps.get(app_id)
+                if tracked is None or pid not in tracked:
+                    continue
+                pidfd = tracked.pop(pid)
+                if pidfd is not None:
+                    os.close(pidfd)
+                if not tracked:
+                    emptied.add(app_id)
+
+        for app_id in emptied:
+            pids = self._find_pids(app_id)
+            with self._lock:
+                tracked = self._apps.get(app_id)
+                if tracked is None:
+                    continue
+                if pids:
+                    self._track_locked(tracked, pids)
+                if tracked:
+                    continue
+                del self._apps[app_id]
+
+            try:
+                self._on_release(app_id)
+            except Exception:
+                logger.exception("Process release callback failed")
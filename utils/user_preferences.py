@@ -264,3 +264,40 @@ def set_low_latency_hold_until_app_close(enabled: bool) -> None:
     settings = _load_settings()
     settings["low_latency_hold_until_app_close"] = bool(enabled)
     _save_settings(settings)
+
+
+def get_last_known_device() -> Dict[str, Any] | None:
+    """Return the last successfully connected device, if any.
+
+    The result has ``address``, ``name`` and ``channel`` keys.
+    """
+    settings = _load_settings()
+    device = settings.get("last_known_device")
+    if not isinstance(device, dict):
+        return None
+
+    address = device.get("address")
+    if not isinstance(address, str) or not address.strip():
+        return None
+
+    name = device.get("name")
+    channel = device.get("channel")
+    return {
+        "address": address.strip().upper(),
+        "name": name if isinstance(name, str) else "",
+        "channel": channel if isinstance(channel, int) else None,
+    }
+
+
+def set_last_known_device(address: str, name: str = "", channel: int | None = None) -> None:
+    """Persist the last successfully connected device."""
+    normalized = (address or "").strip().upper()
+    if not normalized:
+        return
+
+    device = {"address": normalized, "name": name or "", "channel": channel}
+    settings = _load_settings()
+    if settings.get("last_known_device") == device:
+        return
+    settings["last_known_device"] = device
+    _save_settings(settings)
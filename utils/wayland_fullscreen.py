@@ -0,0 +1,328 @@
+"""Fullscreen detection through Wayland compositor IPC event streams."""
+
+from __future__ import annotations
+
+import json
+import os
+import select
+import socket
+import struct
+import threading
+from abc import ABC, abstractmethod
+from typing import Callable, Optional
+
+I3_IPC_MAGIC = b"i3-ipc"
+I3_IPC_HEADER = struct.Struct("=6sII")
+I3_IPC_SUBSCRIBE = 2
+I3_IPC_GET_TREE = 4
+I3_IPC_EVENT_WORKSPACE = 0x80000000
+I3_IPC_EVENT_WINDOW = 0x80000003
+
+
+class _StreamBackend(ABC):
+    """Shared thread and socket handling for compositor event streams.
+
+    ``on_exit`` is called from the reader thread if the stream ends without
+    ``stop()``, e.g. when the compositor restarts.
+    """
+
+    name = "ipc"
+
+    def __init__(
+        self,
+        on_state: Callable[[bool, str, Optional[int]], None],
+        on_log: Optional[Callable[[str], None]] = None,
+        socket_path: Optional[str] = None,
+        on_exit: Optional[Callable[[], None]] = None,
+    ):
+        self._on_state = on_state
+        self._on_log = on_log
+        self._on_exit = on_exit
+        self._socket_path = socket_path
+        self._sock: Optional[socket.socket] = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._wake_lock = threading.Lock()
+        self._wake_r = self._wake_w = -1
+
+    def start(self) -> bool:
+        if self._running:
+            return True
+        if not self._socket_path:
+            return False
+
+        try:
+            self._sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self._sock.connect(self._socket_path)
+            self._subscribe()
+        except (OSError, ValueError) as e:
+            self._log(f"{self.name} IPC unavailable: {e}")
+            self._close()
+            return False
+
+        self._wake_r, self._wake_w = os.pipe()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=f"{self.name}-ipc", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._running = False
+        with self._wake_lock:
+            if self._wake_w >= 0:
+                os.write(self._wake_w, b"\0")
+
+    def _run(self) -> None:
+        try:
+            # Handle anything that arrived together with the subscription reply.
+            self._feed(b"")
+            while self._running:
+                readable, _, _ = select.select([self._sock, self._wake_r], [], [])
+                if self._wake_r in readable or not self._running:
+                    return
+                data = self._sock.recv(65536)
+                if not data:
+                    self._log(f"{self.name} IPC connection closed.")
+                    return
+                self._feed(data)
+        except (OSError, ValueError) as e:
+            if self._running:
+                self._log(f"{self.name} IPC stopped: {e}")
+        finally:
+            unexpected = self._running
+            self._running = False
+            self._close()
+            with self._wake_lock:
+                os.close(self._wake_r)
+                os.close(self._wake_w)
+                self._wake_r = self._wake_w = -1
+            if unexpected and self._on_exit:
+                self._on_exit()
+
+    def _close(self) -> None:
+        if self._sock is not None:
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+            self._sock = None
+
+    @abstractmethod
+    def _subscribe(self) -> None:
+        """Send the initial queries and subscriptions on the new connection."""
+
+    @abstractmethod
+    def _feed(self, data: bytes) -> None:
+        """Handle bytes read from the event stream."""
+
+    def _log(self, message: str) -> None:
+        if self._on_log:
+            self._on_log(message)
+
+
+class SwayIPCBackend(_StreamBackend):
+    """Follow focus and fullscreen changes over the sway/i3 IPC socket.
+
+    Reads the focused window from ``GET_TREE`` once, then subscribes to
+    window and workspace events and reports from those alone.
+    """
+
+    name = "sway"
+
+    def __init__(
+        self,
+        on_state: Callable[[bool, str, Optional[int]], None],
+        on_log: Optional[Callable[[str], None]] = None,
+        socket_path: Optional[str] = None,
+        on_exit: Optional[Callable[[], None]] = None,
+    ):
+        super().__init__(on_state, on_log, socket_path or _sway_socket_path(), on_exit)
+        self._buffer = bytearray()
+        self._focused_id: Optional[int] = None
+
+    @staticmethod
+    def is_available() -> bool:
+        path = _sway_socket_path()
+        return bool(path) and os.path.exists(path)
+
+    def _subscribe(self) -> None:
+        _, tree = self._request(I3_IPC_GET_TREE, b"")
+        focused = _find_focused(json.loads(tree))
+        self._report(focused)
+
+        _, reply = self._request(I3_IPC_SUBSCRIBE, json.dumps(["window", "workspace"]).encode())
+        if not json.loads(reply).get("success"):
+            raise ValueError("subscription refused")
+
+    def _request(self, message_type: int, payload: bytes) -> tuple[int, bytes]:
+        self._sock.sendall(I3_IPC_HEADER.pack(I3_IPC_MAGIC, len(payload), message_type) + payload)
+        while True:
+            message = self._next_message()
+            if message is not None:
+                return message
+            data = self._sock.recv(65536)
+            if not data:
+                raise ValueError("connection closed")
+            self._buffer += data
+
+    def _next_message(self) -> Optional[tuple[int, bytes]]:
+        if len(self._buffer) < I3_IPC_HEADER.size:
+            return None
+        magic, length, message_type = I3_IPC_HEADER.unpack_from(self._buffer)
+        if magic != I3_IPC_MAGIC:
+            raise ValueError("bad IPC magic")
+        end = I3_IPC_HEADER.size + length
+        if len(self._buffer) < end:
+            return None
+        payload = bytes(self._buffer[I3_IPC_HEADER.size:end])
+        del self._buffer[:end]
+        return message_type, payload
+
+    def _feed(self, data: bytes) -> None:
+        self._buffer += data
+        while (message := self._next_message()) is not None:
+            message_type, payload = message
+            if message_type == I3_IPC_EVENT_WINDOW:
+                self._on_window_event(json.loads(payload))
+            elif message_type == I3_IPC_EVENT_WORKSPACE:
+                self._on_workspace_event(json.loads(payload))
+
+    def _on_window_event(self, event: dict) -> None:
+        change = event.get("change")
+        container = event.get("container") or {}
+        if change == "focus" or (change == "fullscreen_mode" and container.get("focused")):
+            self._report(container)
+        elif change == "close" and container.get("id") == self._focused_id:
+            self._report(None)
+
+    def _on_workspace_event(self, event: dict) -> None:
+        # Focusing an empty workspace produces no window event.
+        current = event.get("current") or {}
+        if event.get("change") == "focus" and not current.get("nodes") and not current.get("floating_nodes"):
+            self._report(None)
+
+    def _report(self, container: Optional[dict]) -> None:
+        if not container:
+            self._focused_id = None
+            self._on_state(False, "")
+            return
+        self._focused_id = container.get("id")
+        self._on_state(bool(container.get("fullscreen_mode")), _sway_app_id(container), container.get("pid"))
+
+
+class HyprlandIPCBackend(_StreamBackend):
+    """Follow focus and fullscreen changes over Hyprland's ``.socket2.sock``.
+
+    The event stream names the active window's class and announces
+    fullscreen changes. When the request socket is known, the fullscreen
+    flag of a newly focused window is read from ``j/activewindow``, since
+    the stream only reports fullscreen transitions.
+    """
+
+    name = "hyprland"
+
+    def __init__(
+        self,
+        on_state: Callable[[bool, str, Optional[int]], None],
+        on_log: Optional[Callable[[str], None]] = None,
+        socket_path: Optional[str] = None,
+        request_socket_path: Optional[str] = None,
+        on_exit: Optional[Callable[[], None]] = None,
+    ):
+        directory = _hyprland_socket_dir()
+        if socket_path is None and directory:
+            socket_path = os.path.join(directory, ".socket2.sock")
+        if request_socket_path is None and directory:
+            request_socket_path = os.path.join(directory, ".socket.sock")
+        super().__init__(on_state, on_log, socket_path, on_exit)
+        self._request_socket_path = request_socket_path
+        self._buffer = b""
+        self._app_id = ""
+        self._fullscreen = False
+        self._pid: Optional[int] = None
+
+    @staticmethod
+    def is_available() -> bool:
+        directory = _hyprland_socket_dir()
+        return bool(directory) and os.path.exists(os.path.join(directory, ".socket2.sock"))
+
+    def _subscribe(self) -> None:
+        # socket2 streams events to every client; only the initial state is needed.
+        active = self._query_active_window()
+        if active is not None:
+            self._app_id, self._fullscreen, self._pid = active
+        self._on_state(self._fullscreen, self._app_id, self._pid)
+
+    def _query_active_window(self) -> Optional[tuple[str, bool, Optional[int]]]:
+        if not self._request_socket_path or not os.path.exists(self._request_socket_path):
+            return None
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+                sock.settimeout(1.0)
+                sock.connect(self._request_socket_path)
+                sock.sendall(b"j/activewindow")
+                chunks = []
+                while chunk := sock.recv(65536):
+                    chunks.append(chunk)
+            window = json.loads(b"".join(chunks) or b"{}")
+        except (OSError, ValueError) as e:
+            self._log(f"hyprland active window query failed: {e}")
+            return None
+        pid = window.get("pid")
+        return (
+            str(window.get("class") or "").lower(),
+            bool(window.get("fullscreen")),
+            pid if isinstance(pid, int) and pid > 0 else None,
+        )
+
+    def _feed(self, data: bytes) -> None:
+        self._buffer += data
+        *lines, self._buffer = self._buffer.split(b"\n")
+        for line in lines:
+            event, _, payload = line.decode("utf-8", "replace").partition(">>")
+            if event == "activewindow":
+                self._on_active_window(payload.split(",", 1)[0].strip().lower())
+            elif event == "fullscreen":
+                self._fullscreen = payload.strip() not in ("", "0")
+                self._on_state(self._fullscreen, self._app_id, self._pid)
+
+    def _on_active_window(self, app_id: str) -> None:
+        active = self._query_active_window() if app_id else None
+        if active is not None:
+            app_id, self._fullscreen, self._pid = active[0] or app_id, active[1], active[2]
+        else:
+            self._pid = None
+            if not app_id:
+                self._fullscreen = False
+        self._app_id = app_id
+        self._on_state(self._fullscreen, app_id, self._pid)
+
+
+def _sway_socket_path() -> str:
+    return os.getenv("SWAYSOCK") or os.getenv("I3SOCK") or ""
+
+
+def _hyprland_socket_dir() -> str:
+    signature = os.getenv("HYPRLAND_INSTANCE_SIGNATURE")
+    if not signature:
+        return ""
+    runtime_dir = os.getenv("XDG_RUNTIME_DIR")
+    if runtime_dir and os.path.isdir(os.path.join(runtime_dir, "hypr", signature)):
+        return os.path.join(runtime_dir, "hypr", signature)
+    return os.path.join("/tmp", "hypr", signature)
+
+
+def _find_focused(node: dict) -> Optional[dict]:
+    if node.get("focused") and node.get("type") in ("con", "floating_con"):
+        return node
+    for child in node.get("nodes", []) + node.get("floating_nodes", []):
+        found = _find_focused(child)
+        if found is not None:
+            return found
+    return None
+
+
+def _sway_app_id(container: dict) -> str:
+    # Native Wayland clients carry app_id; Xwayland/i3 windows carry WM_CLASS.
+    app_id = container.get("app_id") or (container.get("window_properties") or {}).get("class") or ""
+    return str(app_id).lower()
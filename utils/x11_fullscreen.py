@@ -0,0 +1,276 @@
+"""Event-driven X11 fullscreen detection (optional, needs python-xlib)."""
+
+from __future__ import annotations
+
+import os
+import re
+import select
+import threading
+from typing import Callable, Optional, Sequence
+
+try:
+    from Xlib import X, Xatom
+    from Xlib import display as xdisplay
+    from Xlib import error as xerror
+    from Xlib.ext import randr
+except ImportError:
+    X = None
+
+FULLSCREEN_TOLERANCE = 4
+
+Rect = tuple[int, int, int, int]
+
+
+class MonitorLayout:
+    """Geometry of every active monitor, as ``(x, y, width, height)`` rects.
+
+    Callers refresh it when the layout changes (RandR notifications, or a
+    fresh ``xrandr`` listing); lookups in between cost no X round trips.
+    """
+
+    def __init__(self, monitors: Sequence[Rect] = ()):
+        self._lock = threading.Lock()
+        self._monitors: list[Rect] = list(monitors)
+
+    @property
+    def monitors(self) -> list[Rect]:
+        with self._lock:
+            return list(self._monitors)
+
+    def update(self, monitors: Sequence[Rect]) -> None:
+        with self._lock:
+            self._monitors = [m for m in monitors if m[2] > 0 and m[3] > 0]
+
+    def monitor_for(self, window: Rect) -> Optional[Rect]:
+        """Return the monitor holding the window's centre, else the one it overlaps most."""
+        x, y, width, height = window
+        cx, cy = x + width // 2, y + height // 2
+        best, best_area = None, 0
+        for monitor in self.monitors:
+            mx, my, mw, mh = monitor
+            if mx <= cx < mx + mw and my <= cy < my + mh:
+                return monitor
+            overlap_w = min(x + width, mx + mw) - max(x, mx)
+            overlap_h = min(y + height, my + mh) - max(y, my)
+            if overlap_w > 0 and overlap_h > 0 and overlap_w * overlap_h > best_area:
+                best, best_area = monitor, overlap_w * overlap_h
+        return best
+
+    def is_fullscreen(self, window: Rect, tolerance: int = FULLSCREEN_TOLERANCE) -> bool:
+        """Whether the window covers the monitor it sits on."""
+        monitor = self.monitor_for(window)
+        if monitor is None:
+            return False
+        return all(abs(a - b) <= tolerance for a, b in zip(window, monitor))
+
+
+def parse_xrandr_monitors(output: str) -> list[Rect]:
+    """Extract active monitor rects from ``xrandr --current`` output.
+
+    Falls back to the whole screen when no output lists a position.
+    """
+    monitors = [
+        (int(m.group(3)), int(m.group(4)), int(m.group(1)), int(m.group(2)))
+        for m in re.finditer(r"\sconnected\s+(?:primary\s+)?(\d+)x(\d+)\+(-?\d+)\+(-?\d+)", output)
+    ]
+    if not monitors:
+        screen = re.search(r"current\s+(\d+)\s+x\s+(\d+)", output)
+        if screen:
+            monitors.append((0, 0, int(screen.group(1)), int(screen.group(2))))
+    return monitors
+
+
+class X11FullscreenBackend:
+    """Keep one X connection open and re-check only when X says something changed.
+
+    Listens for PropertyNotify on the root window's ``_NET_ACTIVE_WINDOW``
+    and on the active window's ``_NET_WM_STATE``/``WM_CLASS``, plus
+    ConfigureNotify on the active window. Between events the thread sleeps
+    in ``select()`` and does no work.
+
+    Monitor geometry comes from a ``MonitorLayout`` filled from the RandR
+    CRTCs and refreshed only on RandR screen-change notifications; without
+    RandR the root window is treated as a single monitor.
+
+    ``on_exit`` is called from the event thread if the X connection drops
+    without ``stop()``.
+    """
+
+    def __init__(
+        self,
+        on_state: Callable[[bool, str, Optional[int]], None],
+        on_log: Optional[Callable[[str], None]] = None,
+        display_name: Optional[str] = None,
+        on_exit: Optional[Callable[[], None]] = None,
+    ):
+        self._on_state = on_state
+        self._on_log = on_log
+        self._on_exit = on_exit
+        self._display_name = display_name
+        self._display = None
+        self._root = None
+        self._active = None
+        self._layout = MonitorLayout()
+        self._randr_event: Optional[int] = None
+        self._running = False
+        self._thread: Optional[threading.Thread] = None
+        self._wake_lock = threading.Lock()
+        self._wake_r = self._wake_w = -1
+
+    @staticmethod
+    def is_available() -> bool:
+        return X is not None and bool(os.getenv("DISPLAY")) and not os.getenv("WAYLAND_DISPLAY")
+
+    def start(self) -> bool:
+        if self._running:
+            return True
+
+        try:
+            self._display = xdisplay.Display(self._display_name)
+        except Exception as e:
+            self._log(f"X11 fullscreen backend unavailable: {e}")
+            return False
+
+        # Windows can vanish between an event and our query; ignore async errors.
+        self._display.set_error_handler(lambda *args: None)
+        self._root = self._display.screen().root
+        self._atom_active = self._display.intern_atom("_NET_ACTIVE_WINDOW")
+        self._atom_state = self._display.intern_atom("_NET_WM_STATE")
+        self._atom_fullscreen = self._display.intern_atom("_NET_WM_STATE_FULLSCREEN")
+        self._atom_pid = self._display.intern_atom("_NET_WM_PID")
+        self._root.change_attributes(event_mask=X.PropertyChangeMask)
+        self._watch_layout()
+        self._display.flush()
+
+        self._wake_r, self._wake_w = os.pipe()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="x11-fullscreen", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> None:
+        self._running = False
+        with self._wake_lock:
+            if self._wake_w >= 0:
+                os.write(self._wake_w, b"\0")
+
+    def _run(self) -> None:
+        display = self._display
+        try:
+            self._evaluate()
+            fd = display.fileno()
+            while self._running:
+                # Drain what Xlib already buffered before blocking in select().
+                if not display.pending_events():
+                    readable, _, _ = select.select([fd, self._wake_r], [], [])
+                    if self._wake_r in readable or not self._running:
+                        return
+
+                changed = False
+                while display.pending_events():
+                    changed |= self._is_relevant(display.next_event())
+                if changed:
+                    self._evaluate()
+        except Exception as e:
+            if self._running:
+                self._log(f"X11 fullscreen backend stopped: {e}")
+        finally:
+            unexpected = self._running
+            self._running = False
+            try:
+                display.close()
+            except Exception:
+                pass
+            with self._wake_lock:
+                os.close(self._wake_r)
+                os.close(self._wake_w)
+                self._wake_r = self._wake_w = -1
+            if unexpected and self._on_exit:
+                self._on_exit()
+
+    def _watch_layout(self) -> None:
+        extension = self._display.query_extension(randr.extname)
+        if extension is None:
+            self._log("RandR unavailable; treating the root window as one monitor.")
+        else:
+            self._root.xrandr_select_input(randr.RRScreenChangeNotifyMask)
+            self._randr_event = extension.first_event + randr.RRScreenChangeNotify
+        self._refresh_layout()
+
+    def _refresh_layout(self) -> None:
+        monitors: list[Rect] = []
+        if self._randr_event is not None:
+            resources = self._root.xrandr_get_screen_resources_current()
+            for crtc in resources.crtcs:
+                info = self._display.xrandr_get_crtc_info(crtc, resources.config_timestamp)
+                if info.mode and info.width and info.height:
+                    monitors.append((info.x, info.y, info.width, info.height))
+        if not monitors:
+            screen = self._root.get_geometry()
+            monitors.append((0, 0, screen.width, screen.height))
+        self._layout.update(monitors)
+
+    def _is_relevant(self, event) -> bool:
+        if event.type == self._randr_event:
+            self._refresh_layout()
+            return True
+        if event.type == X.PropertyNotify:
+            if event.window == self._root:
+                return event.atom == self._atom_active
+            return event.atom in (self._atom_state, Xatom.WM_CLASS)
+        return event.type == X.ConfigureNotify
+
+    def _evaluate(self) -> None:
+        window = self._active_window()
+        if window is None:
+            self._on_state(False, "")
+            return
+
+        try:
+            app_id = _wm_class_app_id(window)
+            pid_prop = window.get_full_property(self._atom_pid, Xatom.CARDINAL)
+            pid = int(pid_prop.value[0]) if pid_prop and len(pid_prop.value) else None
+            self._on_state(self._is_fullscreen(window), app_id, pid)
+        except xerror.XError:
+            # The window went away; the next active-window change will follow.
+            self._on_state(False, "")
+
+    def _active_window(self):
+        prop = self._root.get_full_property(self._atom_active, X.AnyPropertyType)
+        window_id = int(prop.value[0]) if prop and len(prop.value) else 0
+        if self._active is not None and self._active.id == window_id:
+            return self._active
+
+        if self._active is not None:
+            self._active.change_attributes(event_mask=X.NoEventMask)
+        self._active = None
+        if not window_id:
+            self._display.flush()
+            return None
+
+        window = self._display.create_resource_object("window", window_id)
+        window.change_attributes(event_mask=X.PropertyChangeMask | X.StructureNotifyMask)
+        self._display.flush()
+        self._active = window
+        return window
+
+    def _is_fullscreen(self, window) -> bool:
+        prop = window.get_full_property(self._atom_state, Xatom.ATOM)
+        if prop and self._atom_fullscreen in prop.value:
+            return True
+
+        geometry = window.get_geometry()
+        origin = self._root.translate_coords(window, 0, 0)
+        return self._layout.is_fullscreen((origin.x, origin.y, geometry.width, geometry.height))
+
+    def _log(self, message: str) -> None:
+        if self._on_log:
+            self._on_log(message)
+
+
+def _wm_class_app_id(window) -> str:
+    wm_class = window.get_wm_class()
+    if not wm_class:
+        return ""
+    parts = [part.strip().lower() for part in wm_class if part and part.strip()]
+    return parts[-1] if parts else ""